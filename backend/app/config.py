@@ -19,15 +19,100 @@ class Settings:
         "https://clovaspeech-gw.ncloud.com/recog/v1/stt"
     )
 
+    # CLOVA 공유 커넥션 풀 설정
+    CLOVA_TIMEOUT: float = float(os.getenv("CLOVA_TIMEOUT", 60))
+    CLOVA_HTTP2: bool = os.getenv("CLOVA_HTTP2", "true").lower() == "true"  # h2 패키지 설치 시 사용
+    CLOVA_MAX_CONNECTIONS: int = int(os.getenv("CLOVA_MAX_CONNECTIONS", 100))
+    CLOVA_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("CLOVA_MAX_KEEPALIVE_CONNECTIONS", 20))
+    CLOVA_KEEPALIVE_EXPIRY: float = float(os.getenv("CLOVA_KEEPALIVE_EXPIRY", 60))
+    CLOVA_WARMUP: bool = os.getenv("CLOVA_WARMUP", "true").lower() == "true"  # 시작 시 미리 연결
+
+    # 단문 인식 API 길이 제한(60초) - 더 긴 녹음은 pause 지점에서 나눠 동시에 인식
+    CLOVA_MAX_CHUNK_SECONDS: float = float(os.getenv("CLOVA_MAX_CHUNK_SECONDS", 55))
+    CLOVA_CHUNK_SEARCH_SECONDS: float = float(os.getenv("CLOVA_CHUNK_SEARCH_SECONDS", 15))  # 조각 끝에서 pause를 찾는 구간
+
+    # CLOVA 일시적 오류(연결 실패, 429, 5xx) 재시도 - 지수 백오프 + jitter
+    CLOVA_MAX_RETRIES: int = int(os.getenv("CLOVA_MAX_RETRIES", 3))
+    CLOVA_BACKOFF_BASE: float = float(os.getenv("CLOVA_BACKOFF_BASE", 0.5))  # 첫 재시도 최대 대기 (초)
+    CLOVA_BACKOFF_MAX: float = float(os.getenv("CLOVA_BACKOFF_MAX", 8))  # 재시도 간 최대 대기 (초)
+
+    # 업스트림별 동시 호출 제한 (대기열이 가득 차면 503 + Retry-After)
+    CLOVA_MAX_CONCURRENCY: int = int(os.getenv("CLOVA_MAX_CONCURRENCY", 16))
+    CLOVA_MAX_QUEUE: int = int(os.getenv("CLOVA_MAX_QUEUE", 64))
+    OPENAI_MAX_CONCURRENCY: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", 16))
+    OPENAI_MAX_QUEUE: int = int(os.getenv("OPENAI_MAX_QUEUE", 64))
+    UPSTREAM_QUEUE_TIMEOUT: float = float(os.getenv("UPSTREAM_QUEUE_TIMEOUT", 30))  # 최대 대기 시간 (초)
+    UPSTREAM_RETRY_AFTER: int = int(os.getenv("UPSTREAM_RETRY_AFTER", 5))  # Retry-After 헤더 값 (초)
+
     # OpenAI
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL_NAME: str = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
+    # OpenAI 호환 API 주소 (비우면 기본 api.openai.com) - 부하 테스트 시 mock 서버 지정
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")
+    # 평가 응답 최대 출력 토큰 (피드백 150-250자 + 팁 3개 JSON 기준)
+    OPENAI_MAX_OUTPUT_TOKENS: int = int(os.getenv("OPENAI_MAX_OUTPUT_TOKENS", 800))
+
+    # 빠른 채점 (/speech/quick-score) - 로컬 모델로 채점하고 불확실하면 OpenAI 평가로 넘김
+    # 모델 파일은 dataset_preparation/train_quick_score_model.py로 생성
+    QUICK_SCORE_MODEL_PATH: Path = Path(os.getenv(
+        "QUICK_SCORE_MODEL_PATH",
+        str(Path(__file__).parent.parent / "models" / "quick_score.json")
+    ))
+    # 앙상블 예측 표준편차(0-4점 척도)가 이 값보다 크면 OpenAI 평가 사용
+    QUICK_SCORE_MAX_UNCERTAINTY: float = float(os.getenv("QUICK_SCORE_MAX_UNCERTAINTY", 0.35))
+
+    # 결과 캐시 (오디오 해시 → STT 결과, 평가 입력 → OpenAI 평가 결과)
+    STT_CACHE_SIZE: int = int(os.getenv("STT_CACHE_SIZE", 1024))  # 0이면 캐시 비활성화
+    EVAL_CACHE_SIZE: int = int(os.getenv("EVAL_CACHE_SIZE", 1024))
+    RESULT_CACHE_TTL: float = float(os.getenv("RESULT_CACHE_TTL", 3600))  # 초
+
+    # 비동기 작업(job) 큐
+    JOB_BACKEND: str = os.getenv("JOB_BACKEND", "memory")  # memory | redis
+    JOB_REDIS_URL: str = os.getenv("JOB_REDIS_URL", "redis://localhost:6379/0")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", 4))  # replica당 동시 실행 작업 수
+    JOB_QUEUE_MAX_SIZE: int = int(os.getenv("JOB_QUEUE_MAX_SIZE", 100))
+    JOB_RESULT_TTL: float = float(os.getenv("JOB_RESULT_TTL", 3600))  # 완료된 작업 결과 보관 시간 (초)
+    JOB_RETRY_AFTER: int = int(os.getenv("JOB_RETRY_AFTER", 10))  # 큐가 가득 찼을 때 Retry-After (초)
+    JOB_BUSY_RETRIES: int = int(os.getenv("JOB_BUSY_RETRIES", 5))  # 업스트림 포화 시 재시도 횟수
+    JOB_EVENTS_POLL_INTERVAL: float = float(os.getenv("JOB_EVENTS_POLL_INTERVAL", 0.5))
+
+    # 요청 처리 기한 (초) - 업스트림 재시도는 남은 시간 안에서만 수행
+    # 프론트엔드 타임아웃(120초)보다 짧게 설정
+    REQUEST_DEADLINE: float = float(os.getenv("REQUEST_DEADLINE", 110))
+
+    # 일괄 평가 (/speech/batch)
+    BATCH_MAX_FILES: int = int(os.getenv("BATCH_MAX_FILES", 100))
+    BATCH_MAX_SIZE: int = int(os.getenv("BATCH_MAX_SIZE", 500 * 1024 * 1024))  # 요청 전체 / 압축 해제 후 크기 (500MB)
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", 4))  # 요청당 동시 분석 파일 수
+
+    # 문제 API 캐시 헤더 - ETag로 재검증하므로 짧게 유지
+    QUESTIONS_CACHE_CONTROL: str = os.getenv(
+        "QUESTIONS_CACHE_CONTROL",
+        "public, max-age=60, stale-while-revalidate=600"
+    )
 
     # Application settings
     TEMP_DIR: Path = Path(__file__).parent.parent / "tmp"
     MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
+    # 이 크기 이하의 업로드는 디스크를 거치지 않고 메모리에서 ffmpeg 파이프로 변환
+    IN_MEMORY_AUDIO_MAX_SIZE: int = int(os.getenv("IN_MEMORY_AUDIO_MAX_SIZE", 10 * 1024 * 1024))  # 10MB
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024  # 64KB - 업로드를 이 단위로 나눠서 저장
+    # multipart 경계/헤더 여유분 (Content-Length 사전 검사용)
+    MULTIPART_OVERHEAD: int = 64 * 1024
+    # ffmpeg 변환 작업 풀 (이벤트 루프를 막지 않도록 비동기 subprocess로 실행)
+    FFMPEG_MAX_CONCURRENCY: int = int(os.getenv("FFMPEG_MAX_CONCURRENCY", os.cpu_count() or 2))
+    FFMPEG_TIMEOUT: float = float(os.getenv("FFMPEG_TIMEOUT", 60))  # 작업당 최대 실행 시간 (초)
     ALLOWED_EXTENSIONS: set = {".mp3", ".wav", ".m4a", ".ogg", ".webm"}
 
+    # Listening 오디오 자산 (/assets/listening)
+    # 내용 해시 URL이므로 영구 캐시 가능
+    LISTENING_ASSET_CACHE_CONTROL: str = "public, max-age=31536000, immutable"
+    # 미리 만들어 둘 Opus 변형 비트레이트 (kbps, 쉼표 구분) - 빈 값이면 만들지 않음
+    LISTENING_OPUS_BITRATES: list = [
+        int(b) for b in os.getenv("LISTENING_OPUS_BITRATES", "32").split(",") if b.strip()
+    ]
+    LISTENING_VARIANT_DIR: Path = TEMP_DIR / "listening"
+
     def __init__(self):
         # Create temp directory if it doesn't exist
         self.TEMP_DIR.mkdir(exist_ok=True)
@@ -1,16 +1,90 @@
 # backend/app/main.py
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from app.routers import speech, questions
+from app.config import settings
+from app.routers import speech, questions, jobs, assets
+from app.services import clova_stt, openai_eval
+from app.services.jobs import job_manager
+from app.services.listening_assets import listening_assets
+from app.services.limits import UpstreamBusyError, clova_limiter, openai_limiter
+from app.services.metrics import HTTP_REQUESTS_IN_FLIGHT, stats_collector
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.utils.audio import transcode_pool
+from app.utils.deadline import reset_deadline, start_deadline
 from pathlib import Path
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 공유 HTTP 커넥션 풀 생성 (+ warm-up)
+    await clova_stt.start_client()
+    # 비동기 평가 작업 워커 풀 시작
+    await job_manager.start()
+    # Listening 오디오 해시 계산 후 Opus 변형은 백그라운드에서 생성
+    await listening_assets.load()
+    variants_task = asyncio.create_task(listening_assets.build_variants())
+    yield
+    variants_task.cancel()
+    await asyncio.gather(variants_task, return_exceptions=True)
+    await job_manager.stop()
+    await clova_stt.close_client()
+
 app = FastAPI(
     title="TOEFL Speaking AI Consultant",
     description="AI-powered TOEFL Speaking evaluation service",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+def _upload_limit(path: str) -> int:
+    # 일괄 평가는 여러 파일을 한 번에 받으므로 별도 한도 적용
+    return settings.BATCH_MAX_SIZE if path == "/speech/batch" else settings.MAX_FILE_SIZE
+
+class StreamedUploadLimit:
+    """
+    Enforce the upload limit on POST bodies sent without a Content-Length.
+
+    Starlette's multipart parser spools the whole body before the route
+    handler runs, so the limit has to be applied to the ASGI receive
+    channel: once the received bytes pass the limit, the 413 is raised from
+    inside form parsing and the rest of the body is never read.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or any(name == b"content-length" for name, _ in scope["headers"])
+        ):
+            return await self.app(scope, receive, send)
+
+        max_size = _upload_limit(scope["path"])
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_size + settings.MULTIPART_OVERHEAD:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File size exceeds maximum allowed size of {max_size} bytes"
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+# 가장 안쪽 미들웨어로 등록 - BaseHTTPMiddleware(@app.middleware) 바깥에서 receive가 예외를 던지면
+# ExceptionGroup으로 감싸져 413 대신 500이 됨
+app.add_middleware(StreamedUploadLimit)
+
 # CORS middleware configuration - MUST be added BEFORE mounting static files
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +101,57 @@ app.add_middleware(
     expose_headers=["*"],  # Important for audio files
 )
 
+@app.exception_handler(UpstreamBusyError)
+async def upstream_busy_handler(request: Request, exc: UpstreamBusyError):
+    """업스트림 대기열 포화 - 기본 점수로 대체하지 않고 즉시 503 반환"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Service busy ({exc.upstream}). Please retry later."},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """
+    Reject uploads whose declared Content-Length already exceeds the limit,
+    before the multipart body is read. Chunked uploads without a
+    Content-Length are counted as they arrive by StreamedUploadLimit.
+    """
+    content_length = request.headers.get("content-length")
+    max_size = _upload_limit(request.url.path)
+    if (
+        request.method == "POST"
+        and content_length is not None
+        and content_length.isdigit()
+        and int(content_length) > max_size + settings.MULTIPART_OVERHEAD
+    ):
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"File size exceeds maximum allowed size of {max_size} bytes"}
+        )
+    return await call_next(request)
+
+@app.middleware("http")
+async def track_in_flight(request: Request, call_next):
+    """Count in-flight requests (excluding metrics scrapes) for autoscaling."""
+    if request.url.path == "/metrics":
+        return await call_next(request)
+
+    HTTP_REQUESTS_IN_FLIGHT.inc()
+    try:
+        return await call_next(request)
+    finally:
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+
+@app.middleware("http")
+async def request_deadline(request: Request, call_next):
+    """Start the per-request deadline that bounds upstream retries."""
+    token = start_deadline(settings.REQUEST_DEADLINE)
+    try:
+        return await call_next(request)
+    finally:
+        reset_deadline(token)
+
 # Static files for audio
 static_path = Path(__file__).parent / "static"
 static_path.mkdir(exist_ok=True)
@@ -39,7 +164,9 @@ if data_path.exists():
 
 # Include routers
 app.include_router(speech.router)
+app.include_router(jobs.router)
 app.include_router(questions.router)
+app.include_router(assets.router)
 
 @app.get("/")
 async def root():
@@ -51,7 +178,41 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "transcode": transcode_pool.stats()
+    }
+
+# 기존 stats() 값을 Prometheus 게이지로 내보냄
+stats_collector.add("speech_cache", {"cache": "stt"}, clova_stt.stt_cache.stats)
+stats_collector.add("speech_cache", {"cache": "evaluation"}, openai_eval.eval_cache.stats)
+stats_collector.add("speech_upstream", {"upstream": "clova"}, clova_limiter.stats)
+stats_collector.add("speech_upstream", {"upstream": "openai"}, openai_limiter.stats)
+stats_collector.add("speech_clova_retry", {}, clova_stt.retry_stats.stats)
+stats_collector.add("speech_transcode", {}, transcode_pool.stats)
+stats_collector.add("speech_jobs", {}, lambda: {"running": job_manager.running})
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/debug/cache")
+async def debug_cache():
+    """Result cache counters (hit/miss/eviction) for sizing the caches"""
+    return {
+        "stt": clova_stt.stt_cache.stats(),
+        "evaluation": openai_eval.eval_cache.stats()
+    }
+
+@app.get("/debug/upstreams")
+async def debug_upstreams():
+    """Per-upstream concurrency, queue depth, wait time and CLOVA retries"""
+    return {
+        "clova": clova_limiter.stats(),
+        "clova_retries": clova_stt.retry_stats.stats(),
+        "openai": openai_limiter.stats()
+    }
 
 @app.get("/debug/audio-files")
 async def debug_audio_files():
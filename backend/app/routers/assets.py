@@ -0,0 +1,53 @@
+# backend/app/routers/assets.py
+from typing import Dict
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.config import settings
+from app.services.listening_assets import listening_assets
+from app.utils.http_cache import EncodedBody, cached_json_response
+
+router = APIRouter(prefix="/assets/listening", tags=["assets"])
+
+# manifest 버전별로 직렬화해 둔 응답 본문
+_manifest_bodies: Dict[str, EncodedBody] = {}
+
+
+@router.get("/manifest")
+async def get_manifest(request: Request):
+    """
+    Listening 오디오 manifest: 원본 경로("/data/...")별 재생 가능한 source 목록
+    (작은 Opus 변형 먼저, 원본 마지막)
+    """
+    version = listening_assets.version
+    body = _manifest_bodies.get(version)
+    if body is None:
+        body = EncodedBody.build(listening_assets.manifest(), version)
+        _manifest_bodies.clear()
+        _manifest_bodies[version] = body
+
+    return cached_json_response(request, body, settings.QUESTIONS_CACHE_CONTROL)
+
+
+@router.get("/{digest}/{filename}")
+async def get_asset(request: Request, digest: str, filename: str):
+    """
+    Content-hashed audio file. Long-lived immutable caching; Range requests
+    are answered with 206 partial content.
+    """
+    asset = listening_assets.get(digest)
+    if asset is None or asset.path.name != filename:
+        raise HTTPException(status_code=404, detail="Audio asset not found")
+
+    etag = f'"{asset.digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": settings.LISTENING_ASSET_CACHE_CONTROL,
+    }
+
+    # 내용 해시 URL이므로 ETag가 같으면 항상 같은 파일
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(asset.path, media_type=asset.media_type, headers=headers)
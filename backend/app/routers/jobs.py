@@ -0,0 +1,120 @@
+# backend/app/routers/jobs.py
+import asyncio
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.config import settings
+from app.services.jobs import job_manager, JobQueueFullError, TERMINAL_STATES
+from app.services.metrics import stage_timer
+from app.utils.sse import SSE_HEADERS, format_sse, sse_keepalive
+from app.utils.upload import receive_upload
+
+router = APIRouter(prefix="/speech/jobs", tags=["jobs"])
+
+# SSE 연결 유지를 위한 keep-alive 주기 (초)
+KEEPALIVE_INTERVAL = 15.0
+
+
+def _require_started():
+    if not job_manager.started:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+
+
+@router.post("", status_code=202)
+async def submit_job(
+    request: Request,
+    file: UploadFile = File(...),
+    task_id: int = Form(..., ge=1, le=4)
+):
+    """
+    Submit a speech analysis job and return immediately.
+
+    The analysis (STT + pronunciation + OpenAI evaluation) runs on the job
+    worker pool. Poll the status URL or subscribe to the events URL (SSE)
+    for progress and the final SpeechAnalyzeResponse.
+    """
+    _require_started()
+
+    with stage_timer("upload", task_id):
+        upload = await receive_upload(file)
+    try:
+        state = await job_manager.submit(upload, task_id)
+    except JobQueueFullError:
+        upload.cleanup()
+        raise HTTPException(
+            status_code=503,
+            detail="Job queue is full. Please retry later.",
+            headers={"Retry-After": str(settings.JOB_RETRY_AFTER)}
+        )
+    except Exception:
+        upload.cleanup()
+        raise
+
+    job_id = state["job_id"]
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job_id,
+            "status": state["status"],
+            "status_url": str(request.url_for("get_job", job_id=job_id)),
+            "events_url": str(request.url_for("stream_job_events", job_id=job_id)),
+        },
+        headers={"Location": str(request.url_for("get_job", job_id=job_id))}
+    )
+
+
+@router.get("/stats")
+async def get_job_stats():
+    """Worker pool and queue depth"""
+    _require_started()
+    return await job_manager.stats()
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Current job status (and result once completed)"""
+    _require_started()
+
+    state = await job_manager.get(job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return state
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """
+    Server-sent events stream of job status changes.
+    Each event is named after the job status and carries the full job state;
+    the stream ends after the completed/failed event.
+    """
+    _require_started()
+
+    if await job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream():
+        last_state = None
+        idle = 0.0
+
+        while not await request.is_disconnected():
+            state = await job_manager.get(job_id)
+            if state is None:
+                yield format_sse({"detail": "Job expired"}, event="error")
+                return
+
+            if state != last_state:
+                yield format_sse(state, event=state["status"])
+                last_state = state
+                idle = 0.0
+
+            if state["status"] in TERMINAL_STATES:
+                return
+
+            await asyncio.sleep(settings.JOB_EVENTS_POLL_INTERVAL)
+            idle += settings.JOB_EVENTS_POLL_INTERVAL
+            if idle >= KEEPALIVE_INTERVAL:
+                yield sse_keepalive()
+                idle = 0.0
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -1,96 +1,109 @@
 # backend/app/routers/questions.py
-from fastapi import APIRouter, HTTPException
-from typing import List
-import json
-import os
-from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.config import settings
+from app.services.listening_assets import listening_assets
+from app.services.question_store import QuestionBank, QuestionDataError, question_store
+from app.utils.http_cache import EncodedBody, cached_json_response
 
 router = APIRouter(prefix="/questions", tags=["questions"])
 
-# 문제 데이터 파일 경로
-QUESTIONS_FILE = Path(__file__).parent.parent / "data" / "questions.json"
+# 문제 은행 + 오디오 자산 버전별로 직렬화/압축해 둔 응답 본문 (버전이 바뀌면 비움)
+_bodies: Dict[str, EncodedBody] = {}
+_bodies_version: Optional[str] = None
 
 
-def load_questions():
-    """문제 데이터 로드"""
+def load_questions() -> QuestionBank:
+    """문제 데이터 조회 (메모리 스냅샷, 파일 변경 시 자동 재로드)"""
     try:
-        with open(QUESTIONS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
+        return question_store.get()
+    except QuestionDataError:
         raise HTTPException(status_code=500, detail="Failed to parse questions data")
 
 
+def _respond(request: Request, bank: QuestionBank, key: str, build: Callable[[], Any]) -> Response:
+    """같은 버전의 같은 응답은 한 번만 직렬화/압축하고 ETag로 재검증"""
+    global _bodies, _bodies_version
+    # audioFile이 오디오 내용 해시 URL로 바뀌므로 자산 버전도 포함
+    version = f"{bank.version}.{listening_assets.version}"
+    if _bodies_version != version:
+        _bodies = {}
+        _bodies_version = version
+
+    body = _bodies.get(key)
+    if body is None:
+        body = EncodedBody.build(build(), version)
+        _bodies[key] = body
+
+    return cached_json_response(request, body, settings.QUESTIONS_CACHE_CONTROL)
+
+
+def _with_audio(questions) -> list:
+    """audioFile을 캐시 가능한 내용 해시 URL로 교체"""
+    return [listening_assets.resolve_question(q) for q in questions]
+
+
 @router.get("/")
-async def get_all_questions():
+async def get_all_questions(request: Request):
     """모든 문제 조회"""
-    questions = load_questions()
-    return {
-        "total": len(questions),
-        "questions": questions
-    }
+    bank = load_questions()
+    return _respond(request, bank, "all", lambda: {
+        "total": len(bank.questions),
+        "questions": _with_audio(bank.questions)
+    })
 
 
 @router.get("/categories")
-async def get_categories():
+async def get_categories(request: Request):
     """문제 카테고리 목록 조회"""
-    questions = load_questions()
-    categories = {}
-
-    for q in questions:
-        category = q.get("category", "Unknown")
-        if category not in categories:
-            categories[category] = []
-        categories[category].append({
-            "id": q["id"],
-            "title": q["title"],
-            "type": q["type"],
-            "difficulty": q.get("difficulty", "medium")
-        })
-
-    return categories
+    bank = load_questions()
+    return _respond(request, bank, "categories", lambda: dict(bank.categories))
 
 
 @router.get("/{question_id}")
-async def get_question(question_id: str):
+async def get_question(request: Request, question_id: str):
     """특정 문제 조회"""
-    questions = load_questions()
-
-    for q in questions:
-        if q["id"] == question_id:
-            return q
+    bank = load_questions()
+    question = bank.by_id.get(question_id)
+    if question is None:
+        raise HTTPException(status_code=404, detail="Question not found")
 
-    raise HTTPException(status_code=404, detail="Question not found")
+    return _respond(request, bank, f"id:{question_id}", lambda: listening_assets.resolve_question(question))
 
 
 @router.get("/type/{question_type}")
-async def get_questions_by_type(question_type: str):
+async def get_questions_by_type(request: Request, question_type: str):
     """타입별 문제 조회 (Independent, Integrated)"""
-    questions = load_questions()
-    filtered = [q for q in questions if q.get("category", "").lower() == question_type.lower()]
+    bank = load_questions()
+    # 대소문자 변형마다 따로 압축 / 캐시하지 않도록 소문자 값으로 캐시하고,
+    # 응답에는 요청한 철자 대신 저장된 category 값을 돌려줌 ("Independent")
+    category = question_type.lower()
+    filtered = bank.by_category.get(category)
 
     if not filtered:
         raise HTTPException(status_code=404, detail=f"No questions found for type: {question_type}")
 
-    return {
-        "type": question_type,
+    return _respond(request, bank, f"type:{category}", lambda: {
+        "type": filtered[0].get("category", question_type),
         "count": len(filtered),
-        "questions": filtered
-    }
+        "questions": _with_audio(filtered)
+    })
 
 
 @router.get("/difficulty/{level}")
-async def get_questions_by_difficulty(level: str):
+async def get_questions_by_difficulty(request: Request, level: str):
     """난이도별 문제 조회"""
-    questions = load_questions()
-    filtered = [q for q in questions if q.get("difficulty", "").lower() == level.lower()]
+    bank = load_questions()
+    # type과 같이 소문자 값으로 캐시하고 저장된 difficulty 값을 돌려줌
+    difficulty = level.lower()
+    filtered = bank.by_difficulty.get(difficulty)
 
     if not filtered:
         raise HTTPException(status_code=404, detail=f"No questions found for difficulty: {level}")
 
-    return {
-        "difficulty": level,
+    return _respond(request, bank, f"difficulty:{difficulty}", lambda: {
+        "difficulty": filtered[0].get("difficulty", level),
         "count": len(filtered),
-        "questions": filtered
-    }
+        "questions": _with_audio(filtered)
+    })
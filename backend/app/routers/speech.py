@@ -1,17 +1,29 @@
 # backend/app/routers/speech.py
-import uuid
-from pathlib import Path
+import asyncio
+import json
+from pathlib import PurePosixPath
+from typing import Dict, List, Optional
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
 from app.config import settings
-from app.schemas import SpeechAnalyzeResponse, ErrorResponse
-from app.services.clova_stt import transcribe_with_pronunciation_eval
-from app.services.openai_eval import evaluate_speaking
-from app.utils.audio import convert_to_wav, validate_audio_file
+from app.schemas import QuickScoreResponse, SpeechAnalyzeResponse, ErrorResponse
+from app.services.limits import UpstreamBusyError
+from app.services.metrics import stage_timer
+from app.services.pipeline import (
+    analyze_upload,
+    analyze_upload_with_backoff,
+    quick_score_upload,
+    stream_analysis,
+)
+from app.utils.deadline import start_deadline
+from app.utils.sse import SSE_HEADERS, format_sse
+from app.utils.upload import BatchItem, receive_batch, receive_upload
 
 router = APIRouter(prefix="/speech", tags=["speech"])
 
+
 @router.post("/analyze", response_model=SpeechAnalyzeResponse)
 async def analyze_speech(
     file: UploadFile = File(...),
@@ -21,71 +33,24 @@ async def analyze_speech(
     Analyze uploaded speech audio file.
 
     Process flow:
-    1. Save uploaded file to temp directory
-    2. Convert to WAV if needed
+    1. Receive upload in chunks (size/type checked while reading)
+    2. Convert to WAV if needed (in memory via ffmpeg pipes for small uploads)
     3. Call Naver STT API for transcription
     4. Call Naver Pronunciation API for evaluation
     5. Call OpenAI API for comprehensive evaluation
     6. Return combined results
     """
 
-    temp_file_path = None
-    wav_file_path = None
+    upload = None
 
     try:
-        # Validate file extension
-        file_ext = Path(file.filename).suffix.lower()
-        if file_ext not in settings.ALLOWED_EXTENSIONS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type {file_ext} not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
-            )
-
-        # Generate unique filename
-        unique_filename = f"{uuid.uuid4()}{file_ext}"
-        temp_file_path = settings.TEMP_DIR / unique_filename
-
-        # Save uploaded file
-        with open(temp_file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-
-        # Validate file size
-        if not validate_audio_file(temp_file_path, settings.MAX_FILE_SIZE):
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE} bytes"
-            )
-
-        # Convert to WAV if necessary
-        wav_file_path = convert_to_wav(temp_file_path)
-
-        # Step 1 & 2: CLOVA Speech 단문 인식 API로 STT + 발음 평가 동시 수행
-        # - nbestScoreLangEval 파라미터로 발음 점수 함께 반환
-        # - 60초 이내 음성에 최적화
-        stt_result, pron_result = await transcribe_with_pronunciation_eval(
-            wav_file_path,
-            language="Eng"  # 영어 음성 인식
-        )
-
-        # Step 3: OpenAI Comprehensive Evaluation
-        pron_scores = {
-            "overall": pron_result.overall,
-            "fluency": pron_result.fluency
-        }
-        eval_result = await evaluate_speaking(task_id, stt_result.text, pron_scores)
-
-        # Combine all results
-        response = SpeechAnalyzeResponse(
-            task_id=task_id,
-            stt=stt_result,
-            pronunciation=pron_result,
-            evaluation=eval_result
-        )
+        # Validate and receive uploaded file
+        with stage_timer("upload", task_id):
+            upload = await receive_upload(file)
 
-        return response
+        return await analyze_upload(upload, task_id)
 
-    except HTTPException:
+    except (HTTPException, UpstreamBusyError):
         raise
     except Exception as e:
         print(f"Error processing speech analysis: {e}")
@@ -95,17 +60,193 @@ async def analyze_speech(
         )
     finally:
         # Cleanup temporary files
-        if temp_file_path and temp_file_path.exists():
-            try:
-                temp_file_path.unlink()
-            except Exception as e:
-                print(f"Error deleting temp file {temp_file_path}: {e}")
+        if upload is not None:
+            upload.cleanup()
+
+@router.post("/quick-score", response_model=QuickScoreResponse)
+async def quick_score_speech(
+    file: UploadFile = File(...),
+    task_id: int = Form(..., ge=1, le=4)
+):
+    """
+    Practice-mode scoring: rubric scores from a local model trained on
+    teacher evaluations, without an OpenAI call.
+
+    Falls back to the full OpenAI evaluation (source="llm", with feedback and
+    tips) when no model is deployed, speech recognition failed, or the model's
+    uncertainty exceeds QUICK_SCORE_MAX_UNCERTAINTY.
+    """
+    upload = None
+
+    try:
+        with stage_timer("upload", task_id):
+            upload = await receive_upload(file)
+
+        return await quick_score_upload(upload, task_id)
+
+    except (HTTPException, UpstreamBusyError):
+        raise
+    except Exception as e:
+        print(f"Error processing quick score: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+    finally:
+        if upload is not None:
+            upload.cleanup()
+
+@router.post("/analyze/stream")
+async def analyze_speech_stream(
+    file: UploadFile = File(...),
+    task_id: int = Form(..., ge=1, le=4)
+):
+    """
+    Streaming variant of /analyze (server-sent events).
 
-        if wav_file_path and wav_file_path != temp_file_path and wav_file_path.exists():
+    Events are sent as each stage completes:
+    - transcript: STT text and confidence, as soon as CLOVA returns
+    - pronunciation: pronunciation scores
+    - feedback_delta: OpenAI feedback text, token by token
+    - result: the final SpeechAnalyzeResponse (always the last event)
+    - error: sent instead of result if the pipeline fails
+    """
+    # 업로드 검증 오류는 스트림 시작 전에 일반 HTTP 오류로 반환
+    with stage_timer("upload", task_id):
+        upload = await receive_upload(file)
+
+    async def event_stream():
+        try:
+            async for event, payload in stream_analysis(upload, task_id):
+                yield format_sse(payload, event=event)
+        except UpstreamBusyError as e:
+            yield format_sse({
+                "detail": f"Service busy ({e.upstream}). Please retry later.",
+                "status_code": 503,
+                "retry_after": e.retry_after
+            }, event="error")
+        except Exception as e:
+            print(f"Error streaming speech analysis: {e}")
+            yield format_sse({"detail": f"Internal server error: {str(e)}"}, event="error")
+
+    # 임시 파일 정리는 응답의 background로 - 클라이언트가 스트림 시작 전에 끊어
+    # 제너레이터가 실행되지 않아도 응답이 끝나면 항상 실행됨
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        background=BackgroundTask(upload.cleanup)
+    )
+
+@router.post("/batch")
+async def analyze_speech_batch(
+    files: List[UploadFile] = File(...),
+    task_id: int = Form(1, ge=1, le=4),
+    task_ids: Optional[str] = Form(None)
+):
+    """
+    Analyze many recordings in one request (individual files and/or zip archives).
+
+    At most BATCH_CONCURRENCY files are analyzed at once, and each result is
+    streamed back as one NDJSON line as soon as it finishes (completion order,
+    not upload order):
+    - {"index", "filename", "task_id", "status": "completed", "result": SpeechAnalyzeResponse}
+    - {"index", "filename", "task_id", "status": "failed", "status_code", "detail"}
+    The last line is a summary: {"done": true, "total", "completed", "failed"}
+
+    task_id applies to every file; task_ids optionally overrides it per file as
+    a JSON object {"filename": task_id} (zip members by path or base name).
+    """
+    overrides = _parse_task_ids(task_ids)
+
+    # 응답 스트리밍이 시작되기 전에 폼 파일이 닫히므로 모든 파일을 먼저 받아둠
+    with stage_timer("upload", task_id):
+        items = await receive_batch(files)
+
+    async def analyze_item(index: int, item: BatchItem, semaphore: asyncio.Semaphore) -> dict:
+        item_task_id = overrides.get(
+            item.filename,
+            overrides.get(PurePosixPath(item.filename).name, task_id)
+        )
+        line = {"index": index, "filename": item.filename, "task_id": item_task_id}
+
+        if item.error is not None:
+            return {**line, "status": "failed", "status_code": item.error.status_code, "detail": item.error.detail}
+
+        async with semaphore:
+            # 배치 전체는 요청 기한보다 오래 걸릴 수 있으므로 파일마다 기한을 새로 시작
+            start_deadline(settings.REQUEST_DEADLINE)
             try:
-                wav_file_path.unlink()
+                result = await analyze_upload_with_backoff(item.upload, item_task_id, settings.JOB_BUSY_RETRIES)
+                return {**line, "status": "completed", "result": result.model_dump()}
+            except UpstreamBusyError as e:
+                return {
+                    **line,
+                    "status": "failed",
+                    "status_code": 503,
+                    "detail": f"Service busy ({e.upstream}). Please retry later.",
+                    "retry_after": e.retry_after
+                }
             except Exception as e:
-                print(f"Error deleting wav file {wav_file_path}: {e}")
+                print(f"Error processing batch item {item.filename}: {e}")
+                return {**line, "status": "failed", "status_code": 500, "detail": f"Internal server error: {str(e)}"}
+            finally:
+                item.upload.cleanup()
+
+    async def result_stream():
+        semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(analyze_item(index, item, semaphore))
+            for index, item in enumerate(items)
+        ]
+        completed = 0
+
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                line = await next_result
+                if line["status"] == "completed":
+                    completed += 1
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+
+            yield json.dumps({
+                "done": True,
+                "total": len(items),
+                "completed": completed,
+                "failed": len(items) - completed
+            }) + "\n"
+        finally:
+            # 클라이언트 연결이 끊긴 경우 남은 분석 취소 및 임시 파일 정리
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for item in items:
+                if item.upload is not None:
+                    item.upload.cleanup()
+
+    return StreamingResponse(
+        result_stream(),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}
+    )
+
+def _parse_task_ids(raw: Optional[str]) -> Dict[str, int]:
+    """task_ids 폼 필드 ({"filename": task_id} JSON) 검증"""
+    if not raw:
+        return {}
+
+    try:
+        task_ids = json.loads(raw)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="task_ids must be a JSON object of {filename: task_id}")
+
+    if not isinstance(task_ids, dict) or not all(
+        # bool은 int의 하위 클래스이므로 true/false는 따로 거부
+        isinstance(value, int) and not isinstance(value, bool) and 1 <= value <= 4
+        for value in task_ids.values()
+    ):
+        raise HTTPException(status_code=400, detail="task_ids must map filenames to task ids between 1 and 4")
+
+    return task_ids
 
 @router.post("/evaluate")
 async def evaluate_speech(file: UploadFile = File(...)):
@@ -115,49 +256,18 @@ async def evaluate_speech(file: UploadFile = File(...)):
     This endpoint is simpler than /analyze and returns results in a format
     compatible with the frontend ResultsPage.
     """
-    temp_file_path = None
-    wav_file_path = None
+    upload = None
 
     try:
-        # Validate file extension
-        file_ext = Path(file.filename).suffix.lower()
-        if file_ext not in settings.ALLOWED_EXTENSIONS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type {file_ext} not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
-            )
-
-        # Generate unique filename
-        unique_filename = f"{uuid.uuid4()}{file_ext}"
-        temp_file_path = settings.TEMP_DIR / unique_filename
-
-        # Save uploaded file
-        with open(temp_file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-
-        # Validate file size
-        if not validate_audio_file(temp_file_path, settings.MAX_FILE_SIZE):
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE} bytes"
-            )
-
-        # Convert to WAV if necessary
-        wav_file_path = convert_to_wav(temp_file_path)
-
-        # STT + Pronunciation Evaluation
-        stt_result, pron_result = await transcribe_with_pronunciation_eval(
-            wav_file_path,
-            language="Eng"
-        )
+        # Validate and receive uploaded file
+        with stage_timer("upload", 1):
+            upload = await receive_upload(file)
 
-        # OpenAI Evaluation (using task_id=1 as default)
-        pron_scores = {
-            "overall": pron_result.overall,
-            "fluency": pron_result.fluency
-        }
-        eval_result = await evaluate_speaking(1, stt_result.text, pron_scores)
+        # Full pipeline (using task_id=1 as default)
+        result = await analyze_upload(upload, 1)
+        stt_result = result.stt
+        pron_result = result.pronunciation
+        eval_result = result.evaluation
 
         # Return results in frontend-compatible format
         return JSONResponse({
@@ -189,7 +299,7 @@ async def evaluate_speech(file: UploadFile = File(...)):
             "tips": eval_result.tips
         })
 
-    except HTTPException:
+    except (HTTPException, UpstreamBusyError):
         raise
     except Exception as e:
         print(f"Error processing speech evaluation: {e}")
@@ -199,17 +309,8 @@ async def evaluate_speech(file: UploadFile = File(...)):
         )
     finally:
         # Cleanup temporary files
-        if temp_file_path and temp_file_path.exists():
-            try:
-                temp_file_path.unlink()
-            except Exception as e:
-                print(f"Error deleting temp file {temp_file_path}: {e}")
-
-        if wav_file_path and wav_file_path != temp_file_path and wav_file_path.exists():
-            try:
-                wav_file_path.unlink()
-            except Exception as e:
-                print(f"Error deleting wav file {wav_file_path}: {e}")
+        if upload is not None:
+            upload.cleanup()
 
 @router.get("/health")
 async def health_check():
@@ -1,6 +1,6 @@
 # backend/app/schemas.py
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 
 class STTResult(BaseModel):
     text: str
@@ -32,5 +32,15 @@ class SpeechAnalyzeResponse(BaseModel):
     pronunciation: PronResult
     evaluation: EvalResult
 
+class QuickScoreResponse(BaseModel):
+    task_id: int
+    stt: STTResult
+    pronunciation: PronResult
+    scores: EvaluationScores
+    source: Literal["model", "llm"]  # model: 로컬 모델 예측, llm: OpenAI 평가로 넘김
+    uncertainty: Optional[float] = None  # 로컬 모델 예측의 불확실성 (모델을 사용한 경우)
+    feedback: Optional[str] = None  # OpenAI 평가를 사용한 경우에만
+    tips: List[str] = []
+
 class ErrorResponse(BaseModel):
     detail: str
@@ -10,29 +10,191 @@ API 문서: https://api.ncloud-docs.com/docs/ai-application-service-clovaspeech-
 - 실시간 처리 가능
 """
 
+import asyncio
+import hashlib
 import httpx
 import json
+import random
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
 from app.config import settings
 from app.schemas import STTResult, PronResult, PronunciationDetails
+from app.services.limits import clova_limiter
+from app.services.metrics import FALLBACKS
+from app.services.result_cache import AsyncResultCache
+from app.utils.audio_chunks import AudioChunk, split_wav_at_pauses, wav_duration
+from app.utils.deadline import current_deadline
+
+# HTTP/2 사용 가능 여부 (h2 패키지: pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# API 실패 시 반환하는 placeholder 텍스트
+FALLBACK_TEXT = "[음성 인식 실패]"
+
+# 재시도 대상 HTTP 상태 코드 (요청 제한 / 일시적 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 재시도 대상 네트워크 오류 - 요청이 처리되기 전에 연결 단계에서 실패한 경우
+# (읽기 타임아웃은 CLOVA가 이미 처리 중일 수 있고 남은 시간도 적으므로 재시도하지 않음)
+RETRYABLE_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+    httpx.RemoteProtocolError,  # keep-alive 연결이 서버 쪽에서 끊긴 경우
+)
+
+
+class RetryStats:
+    """CLOVA 호출 재시도 횟수와 최종 결과 카운터 (불안정한 업스트림과 실제 실패 구분용)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.attempts = 0
+        self.retries: Counter = Counter()   # 재시도 사유별 (status_429, ConnectError 등)
+        self.outcomes: Counter = Counter()  # 요청별 최종 결과
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "attempts": self.attempts,
+            "retries": dict(self.retries),
+            "outcomes": dict(self.outcomes),
+        }
+
+
+retry_stats = RetryStats()
+
+# 오디오 내용 해시 기반 결과 캐시 (재응시/재시도 시 CLOVA 재호출 방지)
+stt_cache = AsyncResultCache(
+    "clova_stt",
+    max_entries=settings.STT_CACHE_SIZE,
+    ttl=settings.RESULT_CACHE_TTL
+)
+
+# 프로세스 전체에서 공유하는 커넥션 풀 (FastAPI lifespan에서 생성/종료)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _create_client() -> httpx.AsyncClient:
+    """Keep-alive 커넥션 풀을 가진 CLOVA 전용 클라이언트 생성"""
+    return httpx.AsyncClient(
+        timeout=settings.CLOVA_TIMEOUT,
+        http2=HTTP2_AVAILABLE and settings.CLOVA_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.CLOVA_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CLOVA_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.CLOVA_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    공유 클라이언트 반환.
+    lifespan 밖(스크립트 등)에서 호출된 경우 지연 생성
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+    return _client
+
+
+async def start_client():
+    """
+    앱 시작 시 커넥션 풀 생성 및 warm-up.
+    첫 요청이 TCP/TLS 핸드셰이크 비용을 치르지 않도록 미리 연결을 열어둠
+    """
+    client = get_client()
+
+    if not settings.CLOVA_WARMUP:
+        return
+
+    parts = urlsplit(settings.NAVER_CLOVA_STT_ENDPOINT)
+    origin = f"{parts.scheme}://{parts.netloc}/"
+    try:
+        # 응답 내용과 상관없이 연결만 수립되면 풀에 keep-alive로 남음
+        await client.head(origin, timeout=5.0)
+        print(f"CLOVA connection pool warmed up: {origin}")
+    except httpx.HTTPError as e:
+        print(f"CLOVA connection warm-up failed (ignored): {e}")
+
+
+async def close_client():
+    """앱 종료 시 커넥션 풀 정리"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 async def transcribe_with_pronunciation_eval(
-    file_path: Path,
+    audio: Union[Path, bytes],
     language: str = "Eng"
 ) -> tuple[STTResult, PronResult]:
     """
     단문 음성 인식 + 발음 평가를 동시에 수행
+    (CLOVA_MAX_CHUNK_SECONDS보다 긴 WAV는 조각으로 나눠 병렬 인식 후 병합)
 
     Args:
-        file_path: 오디오 파일 경로
+        audio: 오디오 데이터 (bytes) 또는 오디오 파일 경로
         language: 언어 코드 (Eng, Kor, Jpn, Chn)
 
     Returns:
         (STTResult, PronResult): 음성 인식 결과 및 발음 평가 결과
     """
 
+    # 오디오 데이터 준비 (파일 경로인 경우에만 디스크에서 읽기)
+    if isinstance(audio, bytes):
+        audio_data = audio
+    else:
+        with open(audio, "rb") as audio_file:
+            audio_data = audio_file.read()
+
+    # 단문 인식 API 길이 제한을 넘는 녹음은 pause 지점에서 나눠 동시에 인식
+    duration = wav_duration(audio_data)
+    if duration is not None and duration > settings.CLOVA_MAX_CHUNK_SECONDS:
+        chunks = await asyncio.to_thread(
+            split_wav_at_pauses,
+            audio_data,
+            settings.CLOVA_MAX_CHUNK_SECONDS,
+            settings.CLOVA_CHUNK_SEARCH_SECONDS
+        )
+        if len(chunks) > 1:
+            results = await asyncio.gather(*(
+                _transcribe_cached(chunk.data, language) for chunk in chunks
+            ))
+            return _merge_chunk_results(chunks, results)
+
+    return await _transcribe_cached(audio_data, language)
+
+
+async def _transcribe_cached(audio_data: bytes, language: str) -> tuple[STTResult, PronResult]:
+    """
+    같은 오디오는 한 번만 인식 (동시 요청도 하나로 합침)
+    실패 시의 fallback 결과는 캐시하지 않음
+    """
+    cache_key = f"{hashlib.sha256(audio_data).hexdigest()}:{language}"
+    return await stt_cache.get_or_compute(
+        cache_key,
+        lambda: _request_transcription(audio_data, language),
+        cacheable=lambda result: result[0].text != FALLBACK_TEXT
+    )
+
+
+async def _request_transcription(
+    audio_data: bytes,
+    language: str
+) -> tuple[STTResult, PronResult]:
+    """CLOVA Speech API 호출 (캐시 미적용)"""
+
     # API Endpoint 및 파라미터 설정
     url = settings.NAVER_CLOVA_STT_ENDPOINT
 
@@ -56,49 +218,161 @@ async def transcribe_with_pronunciation_eval(
         "Content-Type": "application/octet-stream",
     }
 
-    # 오디오 파일 읽기
-    with open(file_path, "rb") as audio_file:
-        audio_data = audio_file.read()
+    client = get_client()
+    deadline = current_deadline(settings.REQUEST_DEADLINE)
+    retry_stats.requests += 1
+
+    for attempt in range(settings.CLOVA_MAX_RETRIES + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return _give_up("deadline_exceeded")
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        try:
-            response = await client.post(
-                url,
-                headers=headers,
-                params=params,
-                content=audio_data
-            )
-            response.raise_for_status()
+        retry_reason = None
+        retry_after = None
 
-            result = response.json()
+        # 동시 호출 수 제한 - 대기열이 가득 차면 UpstreamBusyError (fallback으로 처리하지 않음)
+        # 재시도 대기 중에는 슬롯을 반납
+        async with clova_limiter.slot():
+            retry_stats.attempts += 1
+            try:
+                response = await client.post(
+                    url,
+                    headers=headers,
+                    params=params,
+                    content=audio_data,
+                    timeout=min(settings.CLOVA_TIMEOUT, remaining)
+                )
 
-            # 응답 디버깅용 출력
-            print(f"CLOVA Speech API Response: {json.dumps(result, indent=2, ensure_ascii=False)}")
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    print(f"CLOVA Speech API HTTP Error (attempt {attempt + 1}): {response.status_code}")
+                    retry_reason = f"status_{response.status_code}"
+                    retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                else:
+                    response.raise_for_status()
 
-            # STT 결과 파싱
-            stt_result = _parse_stt_result(result)
+                    result = response.json()
 
-            # 발음 평가 결과 파싱
-            pron_result = _parse_pronunciation_result(result)
+                    # 응답 디버깅용 출력
+                    print(f"CLOVA Speech API Response: {json.dumps(result, indent=2, ensure_ascii=False)}")
 
-            return stt_result, pron_result
+                    # STT 결과 파싱
+                    stt_result = _parse_stt_result(result)
 
-        except httpx.HTTPStatusError as e:
-            print(f"CLOVA Speech API HTTP Error: {e.response.status_code}")
-            print(f"Response: {e.response.text}")
-            return _get_fallback_results()
+                    # 발음 평가 결과 파싱
+                    pron_result = _parse_pronunciation_result(result)
 
-        except httpx.HTTPError as e:
-            print(f"CLOVA Speech API Network Error: {e}")
-            return _get_fallback_results()
+                    retry_stats.outcomes["success" if attempt == 0 else "success_after_retry"] += 1
+                    return stt_result, pron_result
 
-        except json.JSONDecodeError as e:
-            print(f"CLOVA Speech API JSON Parse Error: {e}")
-            return _get_fallback_results()
+            except RETRYABLE_ERRORS as e:
+                print(f"CLOVA Speech API Network Error (attempt {attempt + 1}): {e!r}")
+                retry_reason = type(e).__name__
 
-        except Exception as e:
-            print(f"CLOVA Speech Unexpected Error: {e}")
-            return _get_fallback_results()
+            except httpx.HTTPStatusError as e:
+                print(f"CLOVA Speech API HTTP Error: {e.response.status_code}")
+                print(f"Response: {e.response.text}")
+                return _give_up("http_error")
+
+            except httpx.HTTPError as e:
+                print(f"CLOVA Speech API Network Error: {e!r}")
+                return _give_up("network_error")
+
+            except json.JSONDecodeError as e:
+                print(f"CLOVA Speech API JSON Parse Error: {e}")
+                return _give_up("invalid_response")
+
+            except Exception as e:
+                print(f"CLOVA Speech Unexpected Error: {e}")
+                return _give_up("error")
+
+        if attempt == settings.CLOVA_MAX_RETRIES:
+            break
+
+        # 남은 기한 안에 다시 시도할 수 없으면 즉시 포기
+        delay = _backoff_delay(attempt, retry_after)
+        if time.monotonic() + delay >= deadline:
+            return _give_up("deadline_exceeded")
+
+        retry_stats.retries[retry_reason] += 1
+        await asyncio.sleep(delay)
+
+    return _give_up("retries_exhausted")
+
+
+def _backoff_delay(attempt: int, retry_after: Optional[float]) -> float:
+    """
+    지수 백오프 + full jitter. 서버가 Retry-After를 보낸 경우 그보다 일찍 재시도하지 않음
+    """
+    cap = min(settings.CLOVA_BACKOFF_MAX, settings.CLOVA_BACKOFF_BASE * (2 ** attempt))
+    delay = random.uniform(0, cap)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP-date) → 대기 시간 (초)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _give_up(outcome: str) -> tuple[STTResult, PronResult]:
+    """최종 실패 결과 기록 후 fallback 반환"""
+    retry_stats.outcomes[outcome] += 1
+    FALLBACKS.labels("clova", outcome).inc()
+    if outcome in ("deadline_exceeded", "retries_exhausted"):
+        print(f"CLOVA Speech API gave up: {outcome}")
+    return _get_fallback_results()
+
+
+def _merge_chunk_results(
+    chunks: List[AudioChunk],
+    results: List[tuple[STTResult, PronResult]]
+) -> tuple[STTResult, PronResult]:
+    """
+    조각별 인식 결과를 하나로 합침
+    - 텍스트: 순서대로 이어붙임
+    - 단어 구간: 조각 시작 시각만큼 이동
+    - confidence / 발음 점수: 조각 길이 가중 평균
+    """
+    if any(stt.text == FALLBACK_TEXT for stt, _ in results):
+        # 일부만 인식된 답변이 채점되지 않도록 전체를 실패로 처리
+        # (성공한 조각은 캐시되므로 재시도 시 다시 호출하지 않음)
+        return _get_fallback_results()
+
+    total_duration = sum(chunk.duration for chunk in chunks) or 1.0
+
+    def weighted(values: List[float]) -> float:
+        return sum(value * chunk.duration for value, chunk in zip(values, chunks)) / total_duration
+
+    segments = []
+    for chunk, (_, pron) in zip(chunks, results):
+        chunk_segments = pron.details.segments if pron.details else None
+        for segment in chunk_segments or []:
+            segments.append({
+                **segment,
+                "start": segment.get("start", 0) + chunk.offset,
+                "end": segment.get("end", 0) + chunk.offset
+            })
+
+    stt_result = STTResult(
+        text=" ".join(stt.text.strip() for stt, _ in results if stt.text.strip()),
+        confidence=weighted([stt.confidence for stt, _ in results])
+    )
+    pron_result = PronResult(
+        overall=weighted([pron.overall for _, pron in results]),
+        fluency=weighted([pron.fluency for _, pron in results]),
+        details=PronunciationDetails(segments=segments)
+    )
+    return stt_result, pron_result
 
 
 def _parse_stt_result(api_response: dict) -> STTResult:
@@ -189,7 +463,7 @@ def _estimate_pronunciation_from_text(text: str) -> PronResult:
     발음 평가 결과가 없을 때 텍스트 기반 추정
     (간이 방식 - 실제 발음 분석은 아님)
     """
-    if not text or text in ["[음성 인식 실패]", "[음성 인식 실패 - API 오류]"]:
+    if not text or text in [FALLBACK_TEXT, "[음성 인식 실패 - API 오류]"]:
         return PronResult(
             overall=0.0,
             fluency=0.0,
@@ -222,7 +496,7 @@ def _estimate_pronunciation_from_text(text: str) -> PronResult:
 def _get_fallback_results() -> tuple[STTResult, PronResult]:
     """API 호출 실패 시 기본 응답"""
     stt_result = STTResult(
-        text="[음성 인식 실패]",
+        text=FALLBACK_TEXT,
         confidence=0.0
     )
     pron_result = PronResult(
@@ -0,0 +1,304 @@
+# backend/app/services/jobs.py
+"""
+비동기 음성 평가 작업(job) 큐
+
+POST /speech/jobs 로 접수된 작업을 워커 풀이 동시 실행 수를 제한하며 처리하고,
+진행 상태/결과는 작업 ID로 조회 (GET 폴링 또는 SSE)
+
+큐 백엔드:
+- memory: 단일 노드용 in-process 큐 (기본값)
+- redis: 여러 replica가 큐와 상태를 공유 (Redis 호환 서버: Redis, Valkey, KeyDB 등)
+"""
+
+import asyncio
+import copy
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.pipeline import analyze_upload_with_backoff
+from app.utils.audio import UploadedAudio
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+TERMINAL_STATES = {JOB_COMPLETED, JOB_FAILED}
+
+# 큐에서 꺼낸 작업: (job_id, task_id, upload)
+QueuedJob = Tuple[str, int, UploadedAudio]
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue has reached JOB_QUEUE_MAX_SIZE."""
+
+
+class InProcessJobBackend:
+    """단일 노드용 백엔드: asyncio.Queue + 메모리 상태 저장"""
+
+    def __init__(self, max_queue_size: int, result_ttl: float):
+        self.result_ttl = result_ttl
+        self._queue: "asyncio.Queue[QueuedJob]" = asyncio.Queue(maxsize=max_queue_size)
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._last_sweep = time.monotonic()
+
+    async def enqueue(self, job_id: str, task_id: int, upload: UploadedAudio):
+        try:
+            self._queue.put_nowait((job_id, task_id, upload))
+        except asyncio.QueueFull:
+            raise JobQueueFullError()
+
+    async def dequeue(self) -> Optional[QueuedJob]:
+        return await self._queue.get()
+
+    async def set_state(self, job_id: str, state: Dict[str, Any]):
+        # Redis 백엔드와 동일하게 스냅샷으로 저장/반환 (호출자가 변경해도 영향 없음)
+        self._states[job_id] = copy.deepcopy(state)
+        self._sweep()
+
+    async def get_state(self, job_id: str) -> Optional[Dict[str, Any]]:
+        state = self._states.get(job_id)
+        return copy.deepcopy(state) if state is not None else None
+
+    async def delete_state(self, job_id: str):
+        self._states.pop(job_id, None)
+
+    async def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def close(self):
+        # 처리되지 않은 작업의 임시 파일 정리
+        while not self._queue.empty():
+            _, _, upload = self._queue.get_nowait()
+            upload.cleanup()
+
+    def _sweep(self):
+        """TTL이 지난 완료/실패 작업 상태 제거 (최대 1분에 한 번)"""
+        now = time.monotonic()
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, state in self._states.items()
+            if state["status"] in TERMINAL_STATES and state["updated_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._states[job_id]
+
+
+class RedisJobBackend:
+    """여러 replica용 백엔드: Redis 리스트를 큐로, 키-값으로 상태/오디오 공유"""
+
+    def __init__(self, url: str, max_queue_size: int, result_ttl: float, prefix: str = "toefl:jobs"):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis 패키지가 설치되지 않았습니다: pip install redis")
+
+        self.max_queue_size = max_queue_size
+        self.result_ttl = int(result_ttl)
+        self.prefix = prefix
+        self._redis = aioredis.from_url(url)
+
+    def _key(self, kind: str, job_id: str = "") -> str:
+        return f"{self.prefix}:{kind}:{job_id}" if job_id else f"{self.prefix}:{kind}"
+
+    async def enqueue(self, job_id: str, task_id: int, upload: UploadedAudio):
+        if await self._redis.llen(self._key("queue")) >= self.max_queue_size:
+            raise JobQueueFullError()
+
+        # 다른 replica의 워커가 처리할 수 있도록 오디오를 Redis에 보관
+        await self._redis.set(self._key("audio", job_id), upload.read_bytes(), ex=self.result_ttl)
+        await self._redis.lpush(self._key("queue"), json.dumps({
+            "job_id": job_id,
+            "task_id": task_id,
+            "format": upload.format
+        }))
+        upload.cleanup()
+
+    async def dequeue(self) -> Optional[QueuedJob]:
+        _, raw = await self._redis.brpop(self._key("queue"))
+        spec = json.loads(raw)
+
+        data = await self._redis.getdel(self._key("audio", spec["job_id"]))
+        if data is None:
+            # 오디오가 만료된 작업
+            state = await self.get_state(spec["job_id"])
+            if state is not None:
+                state.update(status=JOB_FAILED, error="Audio data expired before processing", updated_at=time.time())
+                await self.set_state(spec["job_id"], state)
+            return None
+
+        return spec["job_id"], spec["task_id"], UploadedAudio.from_bytes(data, spec["format"])
+
+    async def set_state(self, job_id: str, state: Dict[str, Any]):
+        await self._redis.set(
+            self._key("state", job_id),
+            json.dumps(state, ensure_ascii=False),
+            ex=self.result_ttl
+        )
+
+    async def get_state(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(self._key("state", job_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def delete_state(self, job_id: str):
+        await self._redis.delete(self._key("state", job_id))
+
+    async def queue_depth(self) -> int:
+        return await self._redis.llen(self._key("queue"))
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def _create_backend():
+    if settings.JOB_BACKEND == "redis":
+        return RedisJobBackend(
+            settings.JOB_REDIS_URL,
+            max_queue_size=settings.JOB_QUEUE_MAX_SIZE,
+            result_ttl=settings.JOB_RESULT_TTL
+        )
+    return InProcessJobBackend(
+        max_queue_size=settings.JOB_QUEUE_MAX_SIZE,
+        result_ttl=settings.JOB_RESULT_TTL
+    )
+
+
+class JobManager:
+    """
+    Accepts analysis jobs and runs them on a fixed-size worker pool.
+    The number of workers (JOB_WORKERS) bounds how many pipelines run at once
+    on this replica, independent of how many jobs are queued.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.running = 0
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def started(self) -> bool:
+        return self.backend is not None
+
+    async def start(self):
+        """Create the queue backend and spawn workers (FastAPI lifespan)."""
+        self.backend = _create_backend()
+        self._workers = [
+            asyncio.create_task(self._worker_loop(), name=f"speech-job-worker-{i}")
+            for i in range(settings.JOB_WORKERS)
+        ]
+
+    async def stop(self):
+        """Cancel workers and close the backend."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        if self.backend is not None:
+            await self.backend.close()
+            self.backend = None
+
+    async def submit(self, upload: UploadedAudio, task_id: int) -> Dict[str, Any]:
+        """
+        Queue an upload for analysis. The job takes ownership of the upload.
+
+        Raises:
+            JobQueueFullError: the queue is full (upload is not taken over)
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        state = {
+            "job_id": job_id,
+            "task_id": task_id,
+            "status": JOB_QUEUED,
+            "stage": JOB_QUEUED,
+            "partial": {},
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        await self.backend.set_state(job_id, state)
+        try:
+            await self.backend.enqueue(job_id, task_id, upload)
+        except JobQueueFullError:
+            await self.backend.delete_state(job_id)
+            raise
+
+        return state
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.backend.get_state(job_id)
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": settings.JOB_BACKEND,
+            "workers": len(self._workers),
+            "running": self.running,
+            "queued": await self.backend.queue_depth() if self.backend else 0,
+        }
+
+    async def _worker_loop(self):
+        while True:
+            try:
+                job = await self.backend.dequeue()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 큐 백엔드 연결 오류 등 - 잠시 후 재시도
+                print(f"Job queue error: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if job is not None:
+                await self._run(*job)
+
+    async def _run(self, job_id: str, task_id: int, upload: UploadedAudio):
+        state = await self.backend.get_state(job_id)
+        if state is None:
+            # 상태가 만료된 작업 - 결과를 조회할 수 없으므로 실행하지 않음
+            upload.cleanup()
+            return
+
+        async def on_progress(stage: str, payload: Dict[str, Any]):
+            state["status"] = JOB_RUNNING
+            state["stage"] = stage
+            state["partial"].update(payload)
+            state["updated_at"] = time.time()
+            await self.backend.set_state(job_id, state)
+
+        self.running += 1
+        try:
+            result = await analyze_upload_with_backoff(
+                upload, task_id, settings.JOB_BUSY_RETRIES, on_progress=on_progress
+            )
+            state.update(status=JOB_COMPLETED, stage=JOB_COMPLETED, result=result.model_dump())
+        except asyncio.CancelledError:
+            state.update(status=JOB_FAILED, error="Server shutting down")
+            raise
+        except Exception as e:
+            print(f"Error processing speech job {job_id}: {e}")
+            state.update(status=JOB_FAILED, error=str(e))
+        finally:
+            self.running -= 1
+            upload.cleanup()
+            state["updated_at"] = time.time()
+            try:
+                await self.backend.set_state(job_id, state)
+            except Exception as e:
+                print(f"Error saving state of speech job {job_id}: {e}")
+
+
+job_manager = JobManager()
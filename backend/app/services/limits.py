@@ -0,0 +1,116 @@
+# backend/app/services/limits.py
+"""
+업스트림(CLOVA / OpenAI)별 동시 호출 제한 및 backpressure
+
+트래픽이 몰릴 때 업스트림 호출이 무제한으로 늘어나 429 → fallback 점수로 이어지지 않도록
+업스트림마다 동시 호출 수와 대기열 길이를 제한. 대기열이 가득 차거나 대기 시간이
+초과되면 UpstreamBusyError를 발생시켜 API가 503 + Retry-After로 즉시 응답하게 함
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.config import settings
+
+
+class UpstreamBusyError(Exception):
+    """Raised when an upstream's wait queue is full or the queue wait timed out."""
+
+    def __init__(self, upstream: str, retry_after: int):
+        super().__init__(f"{upstream} is busy, retry after {retry_after}s")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class UpstreamLimiter:
+    """Concurrency cap with a bounded wait queue for one upstream API."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold one upstream call slot for the duration of the block.
+
+        Raises:
+            UpstreamBusyError: the wait queue is full or the wait timed out
+        """
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise UpstreamBusyError(self.name, self.retry_after)
+
+        self.waiting += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise UpstreamBusyError(self.name, self.retry_after)
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        """Queue depth, in-flight calls and wait time."""
+        return {
+            "name": self.name,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.waiting,
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.acquired, 3) if self.acquired else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 3),
+        }
+
+
+clova_limiter = UpstreamLimiter(
+    "clova",
+    max_concurrency=settings.CLOVA_MAX_CONCURRENCY,
+    max_queue=settings.CLOVA_MAX_QUEUE,
+    queue_timeout=settings.UPSTREAM_QUEUE_TIMEOUT,
+    retry_after=settings.UPSTREAM_RETRY_AFTER
+)
+
+openai_limiter = UpstreamLimiter(
+    "openai",
+    max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+    max_queue=settings.OPENAI_MAX_QUEUE,
+    queue_timeout=settings.UPSTREAM_QUEUE_TIMEOUT,
+    retry_after=settings.UPSTREAM_RETRY_AFTER
+)
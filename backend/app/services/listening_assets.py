@@ -0,0 +1,200 @@
+# backend/app/services/listening_assets.py
+"""
+Listening(듣기) 오디오 자산 manifest
+
+app/data 아래 오디오 파일을 내용 해시 기반 URL(/assets/listening/{digest}/{파일명})로
+제공해 브라우저/CDN이 영구 캐시(immutable)할 수 있게 함. 파일 내용이 바뀌면 URL도
+바뀌므로 캐시 무효화가 필요 없음
+
+선택적으로 ffmpeg로 저비트레이트 Opus 변형을 미리 만들어 두고, 클라이언트가
+<audio>의 <source> 목록에서 재생 가능한 형식을 고르게 함
+"""
+
+import asyncio
+import hashlib
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.utils.audio import transcode_pool
+
+# questions.json의 audioFile 경로("/data/...")가 가리키는 디렉토리
+DATA_DIR = Path(__file__).parent.parent / "data"
+DATA_URL_PREFIX = "/data"
+ASSET_URL_PREFIX = "/assets/listening"
+
+MEDIA_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".m4a": "audio/mp4",
+    ".ogg": "audio/ogg",
+    ".wav": "audio/wav",
+    ".opus": 'audio/ogg; codecs="opus"',
+}
+
+
+@dataclass(frozen=True)
+class ListeningAsset:
+    """One servable audio file addressed by its content hash."""
+    digest: str
+    path: Path
+    media_type: str
+    size: int
+    bitrate: Optional[int] = None  # 변형 파일의 비트레이트 (kbps), 원본은 None
+
+    @property
+    def url(self) -> str:
+        return f"{ASSET_URL_PREFIX}/{self.digest}/{self.path.name}"
+
+    def to_source(self) -> Dict[str, Any]:
+        source = {"src": self.url, "type": self.media_type, "size": self.size}
+        if self.bitrate is not None:
+            source["bitrate"] = self.bitrate
+        return source
+
+
+def _file_digest(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()[:16]
+
+
+class ListeningAssetStore:
+    """Content-hashed originals and their pre-transcoded variants."""
+
+    def __init__(self, data_dir: Path, variant_dir: Path):
+        self.data_dir = data_dir
+        self.variant_dir = variant_dir
+        self.version = "empty"
+
+        # 원본 경로 ("/data/q2_listening/x.mp3") → 원본 자산
+        self._originals: Dict[str, ListeningAsset] = {}
+        # 원본 경로 → 변형 자산 (비트레이트 낮은 순)
+        self._variants: Dict[str, List[ListeningAsset]] = {}
+        # digest → 자산 (원본 + 변형)
+        self._by_digest: Dict[str, ListeningAsset] = {}
+
+    async def load(self):
+        """Hash the originals and pick up variants built earlier (startup)."""
+        await asyncio.to_thread(self._scan)
+
+    def _scan(self):
+        originals: Dict[str, ListeningAsset] = {}
+        variants: Dict[str, List[ListeningAsset]] = {}
+
+        if self.data_dir.exists():
+            for path in sorted(self.data_dir.rglob("*")):
+                media_type = MEDIA_TYPES.get(path.suffix.lower())
+                if media_type is None or not path.is_file():
+                    continue
+                source = f"{DATA_URL_PREFIX}/{path.relative_to(self.data_dir).as_posix()}"
+                originals[source] = ListeningAsset(
+                    digest=_file_digest(path),
+                    path=path,
+                    media_type=media_type,
+                    size=path.stat().st_size
+                )
+
+        for source, original in originals.items():
+            found = []
+            for bitrate in settings.LISTENING_OPUS_BITRATES:
+                variant_path = self._variant_path(original, bitrate)
+                if variant_path.exists():
+                    found.append(ListeningAsset(
+                        digest=_file_digest(variant_path),
+                        path=variant_path,
+                        media_type=MEDIA_TYPES[".opus"],
+                        size=variant_path.stat().st_size,
+                        bitrate=bitrate
+                    ))
+            if found:
+                variants[source] = found
+
+        by_digest = {asset.digest: asset for asset in originals.values()}
+        for assets in variants.values():
+            by_digest.update({asset.digest: asset for asset in assets})
+
+        # 참조를 한 번에 교체
+        self._originals = originals
+        self._variants = variants
+        self._by_digest = by_digest
+        self.version = hashlib.sha256(",".join(sorted(by_digest)).encode()).hexdigest()[:16]
+
+    def _variant_path(self, original: ListeningAsset, bitrate: int) -> Path:
+        # 원본 해시를 이름에 포함 - 원본이 바뀌면 새로 만듦
+        return self.variant_dir / f"{original.path.stem}.{original.digest}.{bitrate}k.opus"
+
+    async def build_variants(self):
+        """
+        Transcode missing Opus variants with ffmpeg, then rescan.
+        Runs in the background after startup; failures only mean no variants.
+        """
+        if not settings.LISTENING_OPUS_BITRATES:
+            return
+
+        self.variant_dir.mkdir(parents=True, exist_ok=True)
+        built = 0
+        for original in list(self._originals.values()):
+            for bitrate in settings.LISTENING_OPUS_BITRATES:
+                target = self._variant_path(original, bitrate)
+                if target.exists():
+                    continue
+                partial = target.with_name(target.name + ".part")
+                try:
+                    # -vn: 앨범 아트 등 영상 스트림 제외
+                    # -ac 1: 강의/대화 음성이므로 mono로 충분
+                    await transcode_pool.run([
+                        "ffmpeg", "-y",
+                        "-i", str(original.path),
+                        "-vn", "-ac", "1",
+                        "-c:a", "libopus", "-b:a", f"{bitrate}k",
+                        "-f", "ogg", str(partial)
+                    ])
+                    partial.replace(target)
+                    built += 1
+                except FileNotFoundError:
+                    print("Warning: ffmpeg not found. Skipping listening audio variants.")
+                    return
+                except (subprocess.CalledProcessError, TimeoutError) as e:
+                    partial.unlink(missing_ok=True)
+                    print(f"Failed to build {bitrate}k variant of {original.path.name}: {e}")
+
+        if built:
+            await self.load()
+            print(f"Built {built} listening audio variants (version {self.version})")
+
+    def get(self, digest: str) -> Optional[ListeningAsset]:
+        return self._by_digest.get(digest)
+
+    def sources(self, source: str) -> List[Dict[str, Any]]:
+        """<source> 목록: 작은 Opus 변형 먼저, 원본은 마지막 (모든 브라우저 재생 가능)"""
+        original = self._originals.get(source)
+        if original is None:
+            return []
+        return [asset.to_source() for asset in self._variants.get(source, [])] + [original.to_source()]
+
+    def resolve_question(self, question: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        문제의 audioFile을 내용 해시 URL로 바꾸고 audioSources 목록 추가.
+        manifest에 없는 파일은 그대로 둠
+        """
+        original = self._originals.get(question.get("audioFile") or "")
+        if original is None:
+            return question
+        return {
+            **question,
+            "audioFile": original.url,
+            "audioSources": self.sources(question["audioFile"]),
+        }
+
+    def manifest(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "assets": {source: self.sources(source) for source in self._originals},
+        }
+
+
+listening_assets = ListeningAssetStore(DATA_DIR, settings.LISTENING_VARIANT_DIR)
@@ -0,0 +1,139 @@
+# backend/app/services/metrics.py
+"""
+Prometheus 메트릭 (/metrics)
+
+- 단계별 처리 시간 히스토그램 (upload, convert, transcribe, evaluate, total) - task_id, outcome 라벨
+- fallback 경로 카운터 (CLOVA / OpenAI)
+- OpenAI 토큰 사용량 (prompt / completion / cached) - task_id 라벨
+- 빠른 채점 결과 (로컬 모델 / OpenAI로 넘긴 이유)
+- 처리 중인 요청/분석 수 게이지 (HPA 스케일링 지표)
+- 캐시, 업스트림 제한, ffmpeg 풀, CLOVA 재시도 등 기존 stats() 값을 게이지로 내보냄
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+from app.services.limits import UpstreamBusyError
+
+# 단계 결과 (outcome 라벨 값)
+OUTCOME_SUCCESS = "success"
+OUTCOME_FALLBACK = "fallback"  # 업스트림 실패로 기본값 반환
+OUTCOME_SKIPPED = "skipped"    # 호출할 필요가 없어 건너뜀 (예: 음성 인식 실패 시 평가)
+OUTCOME_BUSY = "busy"          # 업스트림 포화 (503)
+OUTCOME_ERROR = "error"
+
+STAGE_SECONDS = Histogram(
+    "speech_stage_duration_seconds",
+    "Time spent in each speech analysis stage",
+    ["stage", "task_id", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 120)
+)
+
+FALLBACKS = Counter(
+    "speech_fallback_total",
+    "Results replaced by fallback values because an upstream call failed",
+    ["upstream", "reason"]
+)
+
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total",
+    "OpenAI evaluation token usage (prompt, completion, cached prompt tokens)",
+    ["task_id", "kind"]
+)
+
+OPENAI_TRUNCATED = Counter(
+    "openai_truncated_responses_total",
+    "OpenAI evaluations cut off by OPENAI_MAX_OUTPUT_TOKENS",
+    ["task_id"]
+)
+
+QUICK_SCORES = Counter(
+    "speech_quick_score_total",
+    "Quick-score results by source (model or llm) and reason for the choice",
+    ["source", "reason"]
+)
+
+ANALYSES_IN_FLIGHT = Gauge(
+    "speech_analyses_in_flight",
+    "Speech analysis pipelines currently running (sync, stream, batch and jobs)"
+)
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled"
+)
+
+
+class StageTimer:
+    """Outcome holder for stage_timer(); set .outcome when the stage fell back."""
+
+    def __init__(self):
+        self.outcome = OUTCOME_SUCCESS
+
+
+@contextmanager
+def stage_timer(stage: str, task_id: int) -> Iterator[StageTimer]:
+    """
+    Time one pipeline stage into STAGE_SECONDS.
+    The outcome is "busy"/"error" when the block raises, otherwise timer.outcome.
+    """
+    timer = StageTimer()
+    started = time.perf_counter()
+    try:
+        yield timer
+    except UpstreamBusyError:
+        timer.outcome = OUTCOME_BUSY
+        raise
+    except BaseException:
+        timer.outcome = OUTCOME_ERROR
+        raise
+    finally:
+        STAGE_SECONDS.labels(stage, str(task_id), timer.outcome).observe(time.perf_counter() - started)
+
+
+class StatsCollector:
+    """
+    Exports numeric values of existing stats() dicts as gauges.
+    Nested dicts (e.g. retry reasons) become one series per key.
+    """
+
+    def __init__(self):
+        self._sources: List[Tuple[str, Dict[str, str], Callable[[], dict]]] = []
+
+    def add(self, prefix: str, labels: Dict[str, str], stats: Callable[[], dict]):
+        self._sources.append((prefix, labels, stats))
+
+    def collect(self):
+        families: Dict[str, GaugeMetricFamily] = {}
+
+        def add_value(name: str, label_names: List[str], label_values: List[str], value):
+            if name not in families:
+                families[name] = GaugeMetricFamily(name, name.replace("_", " "), labels=label_names)
+            families[name].add_metric(label_values, value)
+
+        for prefix, labels, stats in self._sources:
+            try:
+                values = stats()
+            except Exception as e:
+                print(f"Error collecting {prefix} stats: {e}")
+                continue
+
+            label_names = list(labels)
+            label_values = list(labels.values())
+            for key, value in values.items():
+                name = f"{prefix}_{key}"
+                if isinstance(value, dict):
+                    for sub_key, sub_value in value.items():
+                        add_value(name, label_names + ["key"], label_values + [str(sub_key)], sub_value)
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    add_value(name, label_names, label_values, value)
+
+        yield from families.values()
+
+
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
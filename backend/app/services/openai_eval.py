@@ -1,10 +1,31 @@
 # backend/app/services/openai_eval.py
+import hashlib
 import json
+import re
+from typing import Any, AsyncIterator, Dict, List, Tuple
 from openai import AsyncOpenAI
 from app.config import settings
 from app.schemas import EvalResult, EvaluationScores
+from app.services.clova_stt import FALLBACK_TEXT
+from app.services.limits import openai_limiter, UpstreamBusyError
+from app.services.metrics import FALLBACKS, OPENAI_TOKENS, OPENAI_TRUNCATED
+from app.services.result_cache import AsyncResultCache
 
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+client = AsyncOpenAI(
+    api_key=settings.OPENAI_API_KEY,
+    base_url=settings.OPENAI_BASE_URL or None
+)
+
+# (task_id, 전사 텍스트, 발음 점수, 모델) 기반 평가 결과 캐시
+eval_cache = AsyncResultCache(
+    "openai_eval",
+    max_entries=settings.EVAL_CACHE_SIZE,
+    ttl=settings.RESULT_CACHE_TTL
+)
+
+# API 호출 실패 시 / 음성 인식 실패 시 반환하는 피드백 문구
+FALLBACK_FEEDBACK = "현재 상세한 피드백을 생성할 수 없습니다. 하지만 걱정하지 마세요! 이미 좋은 첫 걸음을 내디뎠습니다. 다시 시도하면 더 구체적인 피드백을 받을 수 있을 거예요."
+STT_FAILED_FEEDBACK = "음성을 인식하지 못해 평가를 진행할 수 없었습니다. 일시적인 문제일 수 있으니 잠시 후 다시 녹음해서 제출해주세요."
 
 # TOEFL Speaking Task prompts
 TASK_PROMPTS = {
@@ -14,22 +35,9 @@ TASK_PROMPTS = {
     4: "Integrated Task: Academic Course"
 }
 
-async def evaluate_speaking(task_id: int, stt_text: str, pron_scores: dict) -> EvalResult:
-    """
-    Evaluate speaking performance using OpenAI Fine-tuned model.
-
-    Args:
-        task_id: TOEFL Speaking task number (1-4)
-        stt_text: Transcribed text from STT
-        pron_scores: Dictionary containing pronunciation scores
-
-    Returns:
-        EvalResult with scores, feedback, and tips
-    """
-
-    task_description = TASK_PROMPTS.get(task_id, "Speaking Task")
-
-    system_message = """당신은 따뜻하고 격려적인 TOEFL Speaking 전문 평가자입니다. 학생들이 자신의 강점을 인식하고 개선점을 긍정적으로 받아들일 수 있도록 돕는 것이 목표입니다.
+# 평가 기준(rubric) 및 지침 - 모든 요청에서 바이트 단위로 동일한 prefix로 유지해야
+# OpenAI 프롬프트 캐싱이 적용됨 (요청별로 달라지는 내용은 넣지 말 것)
+SYSTEM_PROMPT = """당신은 따뜻하고 격려적인 TOEFL Speaking 전문 평가자입니다. 학생들이 자신의 강점을 인식하고 개선점을 긍정적으로 받아들일 수 있도록 돕는 것이 목표입니다.
 
 당신의 임무는 학생의 답변을 전사된 텍스트 기반으로 평가하고 다음을 제공하는 것입니다:
 1. 점수 (0-4 척도, 소수점 1자리): Fluency(유창성), Pronunciation(발음), Content(내용), Grammar(문법)
@@ -83,6 +91,9 @@ async def evaluate_speaking(task_id: int, stt_text: str, pron_scores: dict) -> E
 2. 피드백은 따뜻하고 격려적인 톤 유지
 3. 비판보다는 구체적인 개선 방향 제시
 4. 학생의 노력을 인정하고 긍정적으로 동기부여
+5. 답변과 함께 주어지는 발음 지표는 대략적인 추정치이므로 참고만 하고, 전사된 텍스트를 기반으로 자체 평가
+6. 점수는 소수점 1자리까지 (예: 3.5, 2.8), 총점은 네 카테고리의 평균값
+7. 먼저 잘한 점을 언급하고, 개선점을 부드럽게 제시
 
 다음 형식의 JSON 객체로만 응답하세요:
 {
@@ -95,6 +106,120 @@ async def evaluate_speaking(task_id: int, stt_text: str, pron_scores: dict) -> E
   "tips": ["<구체적인 한국어 팁 1>", "<구체적인 한국어 팁 2>", "<구체적인 한국어 팁 3>"]
 }"""
 
+
+async def evaluate_speaking(task_id: int, stt_text: str, pron_scores: dict) -> EvalResult:
+    """
+    Evaluate speaking performance using OpenAI Fine-tuned model.
+
+    Args:
+        task_id: TOEFL Speaking task number (1-4)
+        stt_text: Transcribed text from STT
+        pron_scores: Dictionary containing pronunciation scores
+
+    Returns:
+        EvalResult with scores, feedback, and tips
+    """
+
+    # 음성 인식 실패 placeholder는 평가할 내용이 없으므로 OpenAI를 호출하지 않음
+    if stt_text == FALLBACK_TEXT:
+        return _get_stt_failed_evaluation()
+
+    messages = _build_messages(task_id, stt_text, pron_scores)
+    cache_key = _cache_key(task_id, stt_text, pron_scores)
+
+    try:
+        # 같은 입력은 한 번만 평가 (동시 요청도 하나로 합침)
+        # 오류는 캐시되지 않고 아래 fallback으로 처리됨
+        return await eval_cache.get_or_compute(
+            cache_key,
+            lambda: _request_evaluation(task_id, messages)
+        )
+
+    except UpstreamBusyError:
+        # 과부하 시 기본 점수로 대체하지 않고 호출자에게 알림 (503)
+        raise
+    except Exception as e:
+        print(f"OpenAI API Error: {e}")
+        FALLBACKS.labels("openai", type(e).__name__).inc()
+        return _get_fallback_evaluation()
+
+
+async def evaluate_speaking_stream(
+    task_id: int,
+    stt_text: str,
+    pron_scores: dict
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming variant of evaluate_speaking.
+
+    Yields:
+        ("feedback_delta", str) as feedback text arrives from the model,
+        then exactly one ("result", EvalResult) with the validated evaluation
+    """
+    if stt_text == FALLBACK_TEXT:
+        result = _get_stt_failed_evaluation()
+        yield "feedback_delta", result.feedback
+        yield "result", result
+        return
+
+    cache_key = _cache_key(task_id, stt_text, pron_scores)
+
+    cached = eval_cache.get(cache_key)
+    if cached is not None:
+        yield "feedback_delta", cached.feedback
+        yield "result", cached
+        return
+
+    try:
+        # 스트리밍이 끝날 때까지 호출 슬롯 유지
+        async with openai_limiter.slot():
+            stream = await client.chat.completions.create(
+                model=settings.OPENAI_MODEL_NAME,
+                messages=_build_messages(task_id, stt_text, pron_scores),
+                temperature=0.7,
+                max_completion_tokens=settings.OPENAI_MAX_OUTPUT_TOKENS,
+                response_format={"type": "json_object"},
+                stream=True,
+                stream_options={"include_usage": True}  # 마지막 chunk에 토큰 사용량 포함
+            )
+
+            # 모델은 JSON 객체를 출력하므로 "feedback" 문자열 값만 골라서 전달
+            extractor = _JSONStringFieldExtractor("feedback")
+            parts = []
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    _record_usage(task_id, chunk.usage)
+                if not chunk.choices:
+                    continue
+                if chunk.choices[0].finish_reason == "length":
+                    _warn_truncated(task_id)
+                delta = chunk.choices[0].delta.content or ""
+                parts.append(delta)
+
+                feedback_delta = extractor.feed(delta)
+                if feedback_delta:
+                    yield "feedback_delta", feedback_delta
+
+        result = _parse_evaluation("".join(parts))
+        eval_cache.put(cache_key, result)
+
+    except UpstreamBusyError:
+        raise
+    except Exception as e:
+        print(f"OpenAI API Error: {e}")
+        FALLBACKS.labels("openai", type(e).__name__).inc()
+        result = _get_fallback_evaluation()
+
+    yield "result", result
+
+
+def _build_messages(task_id: int, stt_text: str, pron_scores: dict) -> List[Dict[str, str]]:
+    """
+    평가 요청 메시지 구성
+    고정된 SYSTEM_PROMPT가 항상 맨 앞에 오고 답변별 내용은 마지막 user 메시지에만 들어감
+    """
+    task_description = TASK_PROMPTS.get(task_id, "Speaking Task")
+
     user_message = f"""Task: {task_description} (Task {task_id})
 
 전사된 답변:
@@ -102,79 +227,187 @@ async def evaluate_speaking(task_id: int, stt_text: str, pron_scores: dict) -> E
 
 추정된 발음 지표 (참고용):
 - 전체 발음: {pron_scores.get('overall', 0):.1f}/100
-- 유창성 추정: {pron_scores.get('fluency', 0):.1f}/100
+- 유창성 추정: {pron_scores.get('fluency', 0):.1f}/100"""
 
-참고: 이는 대략적인 추정치입니다. 전사된 텍스트를 기반으로 자체 평가를 제공해주세요.
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_message}
+    ]
 
-이 TOEFL Speaking 답변을 평가해주세요.
-**중요:**
-- 점수는 소수점 1자리까지 (예: 3.5, 2.8)
-- 총점은 네 카테고리의 평균값
-- 피드백은 따뜻하고 격려적인 톤으로 한국어로 작성
-- 먼저 잘한 점을 언급하고, 개선점을 부드럽게 제시"""
 
-    try:
+def _cache_key(task_id: int, stt_text: str, pron_scores: dict) -> str:
+    """평가 결과 캐시 키: (task_id, 전사 텍스트, 발음 점수, 모델)"""
+    return hashlib.sha256(json.dumps([
+        task_id,
+        stt_text,
+        round(float(pron_scores.get('overall', 0)), 1),
+        round(float(pron_scores.get('fluency', 0)), 1),
+        settings.OPENAI_MODEL_NAME
+    ], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+async def _request_evaluation(task_id: int, messages: List[Dict[str, str]]) -> EvalResult:
+    """OpenAI API 호출 및 응답 파싱 (캐시 미적용, 실패 시 예외 발생)"""
+    async with openai_limiter.slot():
         response = await client.chat.completions.create(
             model=settings.OPENAI_MODEL_NAME,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ],
+            messages=messages,
             temperature=0.7,
+            max_completion_tokens=settings.OPENAI_MAX_OUTPUT_TOKENS,
             response_format={"type": "json_object"}
         )
 
-        result_text = response.choices[0].message.content
-        result = json.loads(result_text)
-
-        # Extract scores as floats and round to 1 decimal place
-        fluency = round(min(4.0, max(0.0, float(result.get("fluency", 2.5)))), 1)
-        pronunciation = round(min(4.0, max(0.0, float(result.get("pronunciation", 2.5)))), 1)
-        content = round(min(4.0, max(0.0, float(result.get("content", 2.5)))), 1)
-        grammar = round(min(4.0, max(0.0, float(result.get("grammar", 2.5)))), 1)
-        # Calculate total as average of 4 categories
-        total = round((fluency + pronunciation + content + grammar) / 4, 1)
-
-        scores = EvaluationScores(
-            fluency=fluency,
-            pronunciation=pronunciation,
-            content=content,
-            grammar=grammar,
-            total=total
-        )
+    if response.usage is not None:
+        _record_usage(task_id, response.usage)
+    if response.choices[0].finish_reason == "length":
+        _warn_truncated(task_id)
 
-        feedback = result.get("feedback", "No feedback available.")
-        tips = result.get("tips", [])
-
-        # Ensure we have at least 2 tips (in Korean)
-        if len(tips) < 2:
-            tips.extend([
-                "유창성 향상을 위해 규칙적으로 말하기 연습을 하세요.",
-                "자신의 답변을 녹음하고 원어민 발화와 비교해보세요."
-            ])
-        tips = tips[:3]  # Limit to 3 tips
-
-        return EvalResult(
-            scores=scores,
-            feedback=feedback,
-            tips=tips
-        )
+    return _parse_evaluation(response.choices[0].message.content)
 
-    except Exception as e:
-        print(f"OpenAI API Error: {e}")
-        # Fallback: return default evaluation
-        return EvalResult(
-            scores=EvaluationScores(
-                fluency=2.5,
-                pronunciation=2.5,
-                content=2.5,
-                grammar=2.5,
-                total=2.5
-            ),
-            feedback="현재 상세한 피드백을 생성할 수 없습니다. 하지만 걱정하지 마세요! 이미 좋은 첫 걸음을 내디뎠습니다. 다시 시도하면 더 구체적인 피드백을 받을 수 있을 거예요.",
-            tips=[
-                "편안한 마음으로 규칙적으로 말하기 연습을 해보세요. 매일 5분씩이라도 꾸준히 하는 것이 중요합니다.",
-                "답변하기 전에 간단하게 핵심 아이디어 2-3개를 떠올려보세요. 이렇게 하면 더 자신감 있게 말할 수 있어요.",
-                "자신이 말한 내용을 녹음해서 들어보세요. 스스로 개선점을 찾는 것도 훌륭한 학습 방법입니다."
-            ]
-        )
+
+def _record_usage(task_id: int, usage):
+    """응답의 토큰 사용량 기록 (cached = 프롬프트 캐시 적중 토큰)"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None) or 0
+
+    label = str(task_id)
+    OPENAI_TOKENS.labels(label, "prompt").inc(usage.prompt_tokens or 0)
+    OPENAI_TOKENS.labels(label, "completion").inc(usage.completion_tokens or 0)
+    OPENAI_TOKENS.labels(label, "cached").inc(cached_tokens)
+
+
+def _warn_truncated(task_id: int):
+    # 출력 토큰 한도에 걸려 JSON이 잘린 경우 - 파싱 실패로 fallback 처리됨
+    OPENAI_TRUNCATED.labels(str(task_id)).inc()
+    print(f"OpenAI response truncated at {settings.OPENAI_MAX_OUTPUT_TOKENS} tokens (task {task_id})")
+
+
+def _parse_evaluation(result_text: str) -> EvalResult:
+    """모델 응답(JSON 텍스트)을 검증된 EvalResult로 변환"""
+    result = json.loads(result_text)
+
+    # Extract scores as floats and round to 1 decimal place
+    fluency = round(min(4.0, max(0.0, float(result.get("fluency", 2.5)))), 1)
+    pronunciation = round(min(4.0, max(0.0, float(result.get("pronunciation", 2.5)))), 1)
+    content = round(min(4.0, max(0.0, float(result.get("content", 2.5)))), 1)
+    grammar = round(min(4.0, max(0.0, float(result.get("grammar", 2.5)))), 1)
+    # Calculate total as average of 4 categories
+    total = round((fluency + pronunciation + content + grammar) / 4, 1)
+
+    scores = EvaluationScores(
+        fluency=fluency,
+        pronunciation=pronunciation,
+        content=content,
+        grammar=grammar,
+        total=total
+    )
+
+    feedback = result.get("feedback", "No feedback available.")
+    tips = result.get("tips", [])
+
+    # Ensure we have at least 2 tips (in Korean)
+    if len(tips) < 2:
+        tips.extend([
+            "유창성 향상을 위해 규칙적으로 말하기 연습을 하세요.",
+            "자신의 답변을 녹음하고 원어민 발화와 비교해보세요."
+        ])
+    tips = tips[:3]  # Limit to 3 tips
+
+    return EvalResult(
+        scores=scores,
+        feedback=feedback,
+        tips=tips
+    )
+
+
+class _JSONStringFieldExtractor:
+    """
+    Incrementally extracts the value of one top-level string field from a
+    JSON object that arrives in arbitrary fragments (streamed tokens).
+    """
+
+    _ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+    def __init__(self, field: str):
+        self._pattern = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self._buffer = ""
+        self._pos = 0
+        self._inside = False
+        self._done = False
+
+    def feed(self, fragment: str) -> str:
+        """Add a fragment and return newly decoded characters of the field value."""
+        if self._done:
+            return ""
+
+        self._buffer += fragment
+        if not self._inside:
+            match = self._pattern.search(self._buffer)
+            if match is None:
+                return ""
+            self._inside = True
+            self._pos = match.end()
+
+        out = []
+        buffer = self._buffer
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+            if char == '"':
+                self._done = True
+                break
+            if char != '\\':
+                out.append(char)
+                self._pos += 1
+                continue
+
+            # 이스케이프 시퀀스 - 조각 경계에서 잘린 경우 다음 조각까지 대기
+            if self._pos + 1 >= len(buffer):
+                break
+            code = buffer[self._pos + 1]
+            if code == 'u':
+                if self._pos + 6 > len(buffer):
+                    break
+                out.append(chr(int(buffer[self._pos + 2:self._pos + 6], 16)))
+                self._pos += 6
+            else:
+                out.append(self._ESCAPES.get(code, code))
+                self._pos += 2
+
+        return "".join(out)
+
+
+def _get_fallback_evaluation() -> EvalResult:
+    """OpenAI API 호출 실패 시 기본 응답"""
+    return EvalResult(
+        scores=EvaluationScores(
+            fluency=2.5,
+            pronunciation=2.5,
+            content=2.5,
+            grammar=2.5,
+            total=2.5
+        ),
+        feedback=FALLBACK_FEEDBACK,
+        tips=[
+            "편안한 마음으로 규칙적으로 말하기 연습을 해보세요. 매일 5분씩이라도 꾸준히 하는 것이 중요합니다.",
+            "답변하기 전에 간단하게 핵심 아이디어 2-3개를 떠올려보세요. 이렇게 하면 더 자신감 있게 말할 수 있어요.",
+            "자신이 말한 내용을 녹음해서 들어보세요. 스스로 개선점을 찾는 것도 훌륭한 학습 방법입니다."
+        ]
+    )
+
+
+def _get_stt_failed_evaluation() -> EvalResult:
+    """음성 인식 실패 시 응답 (OpenAI 호출 없음)"""
+    return EvalResult(
+        scores=EvaluationScores(
+            fluency=0.0,
+            pronunciation=0.0,
+            content=0.0,
+            grammar=0.0,
+            total=0.0
+        ),
+        feedback=STT_FAILED_FEEDBACK,
+        tips=[
+            "마이크가 제대로 연결되어 있는지, 브라우저의 마이크 권한이 허용되어 있는지 확인해보세요.",
+            "조용한 곳에서 마이크와 적당한 거리를 두고 또렷하게 말해보세요."
+        ]
+    )
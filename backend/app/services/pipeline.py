@@ -0,0 +1,309 @@
+# backend/app/services/pipeline.py
+"""
+음성 분석 파이프라인: WAV 변환 → CLOVA STT + 발음 평가 → OpenAI 종합 평가
+
+/speech/analyze, /speech/evaluate, 스트리밍(/speech/analyze/stream), 비동기 작업(job)이 공유
+빠른 채점(/speech/quick-score)은 OpenAI 대신 로컬 모델을 먼저 사용
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from app.config import settings
+from app.schemas import EvaluationScores, QuickScoreResponse, SpeechAnalyzeResponse, STTResult, PronResult
+from app.services.clova_stt import FALLBACK_TEXT, transcribe_with_pronunciation_eval
+from app.services.limits import UpstreamBusyError
+from app.services.metrics import (
+    ANALYSES_IN_FLIGHT,
+    OUTCOME_FALLBACK,
+    QUICK_SCORES,
+    OUTCOME_SKIPPED,
+    StageTimer,
+    stage_timer,
+)
+from app.services.openai_eval import (
+    FALLBACK_FEEDBACK,
+    STT_FAILED_FEEDBACK,
+    evaluate_speaking,
+    evaluate_speaking_stream,
+)
+from app.services.quick_score import QuickScoreModelError, quick_score_models
+from app.utils.audio import UploadedAudio, convert_to_wav, transcode_to_wav_bytes
+from app.utils.speech_features import quick_score_features
+
+# 진행 상황 콜백: (단계 이름, 단계별 부분 결과)
+ProgressCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+async def prepare_wav(upload: UploadedAudio) -> tuple[Union[bytes, Path], Optional[Path]]:
+    """
+    Convert an upload to 16kHz mono WAV for the STT request.
+
+    In-memory uploads are piped through ffmpeg and never touch the disk;
+    spilled uploads use the file-based conversion.
+
+    Returns:
+        (wav audio as bytes or path, wav file to delete afterwards or None)
+    """
+    if upload.data is not None:
+        return await transcode_to_wav_bytes(upload.data, upload.format), None
+
+    wav_file_path = await convert_to_wav(upload.path)
+    return wav_file_path, (wav_file_path if wav_file_path != upload.path else None)
+
+
+async def analyze_upload(
+    upload: UploadedAudio,
+    task_id: int,
+    on_progress: Optional[ProgressCallback] = None
+) -> SpeechAnalyzeResponse:
+    """
+    Run the full analysis pipeline for one upload.
+    The caller owns the upload and is responsible for upload.cleanup().
+
+    Args:
+        upload: Received audio
+        task_id: TOEFL Speaking task number (1-4)
+        on_progress: Optional callback invoked as each stage starts/finishes
+
+    Returns:
+        Combined STT, pronunciation and evaluation results
+    """
+
+    async def notify(stage: str, payload: Optional[Dict[str, Any]] = None):
+        if on_progress is not None:
+            await on_progress(stage, payload or {})
+
+    wav_file_path = None
+
+    ANALYSES_IN_FLIGHT.inc()
+    try:
+        with stage_timer("total", task_id):
+            # Convert to WAV if necessary
+            await notify("converting")
+            with stage_timer("convert", task_id):
+                wav_audio, wav_file_path = await prepare_wav(upload)
+
+            # Step 1 & 2: CLOVA Speech 단문 인식 API로 STT + 발음 평가 동시 수행
+            # - nbestScoreLangEval 파라미터로 발음 점수 함께 반환
+            # - 60초 이내 음성에 최적화
+            await notify("transcribing")
+            stt_result, pron_result = await _transcribe(wav_audio, task_id)
+            await notify("transcribed", {
+                "stt": stt_result.model_dump(),
+                "pronunciation": pron_result.model_dump()
+            })
+
+            # Step 3: OpenAI Comprehensive Evaluation
+            await notify("evaluating")
+            pron_scores = {
+                "overall": pron_result.overall,
+                "fluency": pron_result.fluency
+            }
+            with stage_timer("evaluate", task_id) as timer:
+                eval_result = await evaluate_speaking(task_id, stt_result.text, pron_scores)
+                _set_evaluation_outcome(timer, eval_result.feedback)
+
+            # Combine all results
+            return SpeechAnalyzeResponse(
+                task_id=task_id,
+                stt=stt_result,
+                pronunciation=pron_result,
+                evaluation=eval_result
+            )
+    finally:
+        ANALYSES_IN_FLIGHT.dec()
+        _delete_wav(wav_file_path)
+
+
+async def analyze_upload_with_backoff(
+    upload: UploadedAudio,
+    task_id: int,
+    busy_retries: int,
+    on_progress: Optional[ProgressCallback] = None
+) -> SpeechAnalyzeResponse:
+    """
+    Run analyze_upload; when an upstream is saturated, wait Retry-After and try
+    again instead of failing (for jobs and batches, which are not latency-bound
+    like single synchronous requests).
+    """
+    for attempt in range(busy_retries + 1):
+        try:
+            return await analyze_upload(upload, task_id, on_progress=on_progress)
+        except UpstreamBusyError as e:
+            if attempt == busy_retries:
+                raise
+            if on_progress is not None:
+                await on_progress("waiting_for_upstream", {})
+            await asyncio.sleep(e.retry_after)
+
+
+async def stream_analysis(
+    upload: UploadedAudio,
+    task_id: int
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Run the pipeline and yield partial results as each stage completes.
+    The caller owns the upload and is responsible for upload.cleanup().
+
+    Yields (event name, payload):
+        ("transcript", STTResult)           - as soon as CLOVA returns
+        ("pronunciation", PronResult)
+        ("feedback_delta", {"text": ...})   - OpenAI feedback, token by token
+        ("result", SpeechAnalyzeResponse)   - final validated response (last)
+    """
+    wav_file_path = None
+
+    ANALYSES_IN_FLIGHT.inc()
+    try:
+        try:
+            with stage_timer("convert", task_id):
+                wav_audio, wav_file_path = await prepare_wav(upload)
+            stt_result, pron_result = await _transcribe(wav_audio, task_id)
+        finally:
+            # STT 이후에는 WAV가 필요 없으므로 LLM 스트리밍 전에 정리
+            _delete_wav(wav_file_path)
+
+        yield "transcript", stt_result.model_dump()
+        yield "pronunciation", pron_result.model_dump()
+
+        pron_scores = {
+            "overall": pron_result.overall,
+            "fluency": pron_result.fluency
+        }
+        with stage_timer("evaluate", task_id) as timer:
+            async for kind, value in evaluate_speaking_stream(task_id, stt_result.text, pron_scores):
+                if kind == "feedback_delta":
+                    yield "feedback_delta", {"text": value}
+                else:
+                    _set_evaluation_outcome(timer, value.feedback)
+                    response = SpeechAnalyzeResponse(
+                        task_id=task_id,
+                        stt=stt_result,
+                        pronunciation=pron_result,
+                        evaluation=value
+                    )
+                    yield "result", response.model_dump()
+    finally:
+        ANALYSES_IN_FLIGHT.dec()
+
+
+async def quick_score_upload(upload: UploadedAudio, task_id: int) -> QuickScoreResponse:
+    """
+    Score an upload with the local model; escalate to evaluate_speaking when
+    there is no model, speech recognition failed, or the prediction is too
+    uncertain. The caller owns the upload and is responsible for upload.cleanup().
+    """
+    wav_file_path = None
+
+    ANALYSES_IN_FLIGHT.inc()
+    try:
+        with stage_timer("total", task_id):
+            with stage_timer("convert", task_id):
+                wav_audio, wav_file_path = await prepare_wav(upload)
+            stt_result, pron_result = await _transcribe(wav_audio, task_id)
+
+            with stage_timer("quick_score", task_id) as timer:
+                prediction, reason = await _predict_quick_score(wav_audio, stt_result, pron_result)
+                if prediction is None:
+                    timer.outcome = OUTCOME_SKIPPED
+
+            if prediction is not None and prediction.uncertainty <= settings.QUICK_SCORE_MAX_UNCERTAINTY:
+                QUICK_SCORES.labels("model", reason).inc()
+                scores = {name: round(value, 1) for name, value in prediction.scores.items()}
+                return QuickScoreResponse(
+                    task_id=task_id,
+                    stt=stt_result,
+                    pronunciation=pron_result,
+                    # total은 OpenAI 평가와 같이 네 항목의 평균
+                    scores=EvaluationScores(**scores, total=round(sum(scores.values()) / 4, 1)),
+                    source="model",
+                    uncertainty=round(prediction.uncertainty, 3)
+                )
+
+            if prediction is not None:
+                reason = "uncertain"
+            QUICK_SCORES.labels("llm", reason).inc()
+
+            pron_scores = {
+                "overall": pron_result.overall,
+                "fluency": pron_result.fluency
+            }
+            with stage_timer("evaluate", task_id) as timer:
+                eval_result = await evaluate_speaking(task_id, stt_result.text, pron_scores)
+                _set_evaluation_outcome(timer, eval_result.feedback)
+
+            return QuickScoreResponse(
+                task_id=task_id,
+                stt=stt_result,
+                pronunciation=pron_result,
+                scores=eval_result.scores,
+                source="llm",
+                uncertainty=round(prediction.uncertainty, 3) if prediction is not None else None,
+                feedback=eval_result.feedback,
+                tips=eval_result.tips
+            )
+    finally:
+        ANALYSES_IN_FLIGHT.dec()
+        _delete_wav(wav_file_path)
+
+
+async def _predict_quick_score(
+    wav_audio: Union[bytes, Path],
+    stt_result: STTResult,
+    pron_result: PronResult
+):
+    """
+    Returns:
+        (prediction or None, reason) - reason says why the model was or was not used
+    """
+    if stt_result.text == FALLBACK_TEXT:
+        return None, "stt_failed"
+
+    model = quick_score_models.get()
+    if model is None:
+        return None, "no_model"
+
+    if isinstance(wav_audio, Path):
+        wav_audio = await asyncio.to_thread(wav_audio.read_bytes)
+
+    try:
+        features = quick_score_features(
+            wav_audio,
+            stt_result.text,
+            stt_confidence=stt_result.confidence,
+            pron_overall=pron_result.overall,
+            pron_fluency=pron_result.fluency
+        )
+        return model.predict(features), "confident"
+    except (ValueError, QuickScoreModelError) as e:
+        print(f"Quick-score prediction failed: {e}")
+        return None, "model_error"
+
+
+async def _transcribe(wav_audio: Union[bytes, Path], task_id: int) -> Tuple[STTResult, PronResult]:
+    """CLOVA Speech 단문 인식 API로 STT + 발음 평가 동시 수행"""
+    with stage_timer("transcribe", task_id) as timer:
+        stt_result, pron_result = await transcribe_with_pronunciation_eval(
+            wav_audio,
+            language="Eng"  # 영어 음성 인식
+        )
+        if stt_result.text == FALLBACK_TEXT:
+            timer.outcome = OUTCOME_FALLBACK
+    return stt_result, pron_result
+
+
+def _set_evaluation_outcome(timer: StageTimer, feedback: str):
+    if feedback == FALLBACK_FEEDBACK:
+        timer.outcome = OUTCOME_FALLBACK
+    elif feedback == STT_FAILED_FEEDBACK:
+        timer.outcome = OUTCOME_SKIPPED
+
+
+def _delete_wav(wav_file_path: Optional[Path]):
+    if wav_file_path and wav_file_path.exists():
+        try:
+            wav_file_path.unlink()
+        except Exception as e:
+            print(f"Error deleting wav file {wav_file_path}: {e}")
@@ -0,0 +1,144 @@
+# backend/app/services/question_store.py
+"""
+문제 은행 인메모리 저장소
+
+questions.json을 한 번만 읽어 id / category / type / part / difficulty 인덱스를 만든 뒤
+변경 불가능한 스냅샷(QuestionBank)으로 제공. 파일의 mtime이 바뀌면 새 스냅샷을 만들어
+참조를 한 번에 교체하므로, 요청은 항상 완전한 이전 버전 또는 새 버전 중 하나만 봄
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# 문제 데이터 파일 경로
+QUESTIONS_FILE = Path(__file__).parent.parent / "data" / "questions.json"
+
+# 파일 변경 여부 확인 주기 (초) - 요청마다 stat 호출하지 않도록
+RELOAD_CHECK_INTERVAL = 1.0
+
+Question = Dict[str, Any]
+
+
+class QuestionDataError(Exception):
+    """Raised when questions.json cannot be parsed and no previous version exists."""
+
+
+def _index(questions: Tuple[Question, ...], key) -> Mapping[Any, Tuple[Question, ...]]:
+    groups: Dict[Any, List[Question]] = {}
+    for q in questions:
+        groups.setdefault(key(q), []).append(q)
+    return MappingProxyType({k: tuple(v) for k, v in groups.items()})
+
+
+@dataclass(frozen=True)
+class QuestionBank:
+    """Immutable snapshot of the question bank with lookup indexes."""
+    version: str
+    questions: Tuple[Question, ...]
+    by_id: Mapping[str, Question]
+    by_category: Mapping[str, Tuple[Question, ...]]    # 소문자 category
+    by_type: Mapping[str, Tuple[Question, ...]]        # 소문자 type
+    by_part: Mapping[Any, Tuple[Question, ...]]
+    by_difficulty: Mapping[str, Tuple[Question, ...]]  # 소문자 difficulty
+    categories: Mapping[str, Tuple[Dict[str, Any], ...]]  # /questions/categories 응답
+
+    @classmethod
+    def build(cls, questions: List[Question], version: str) -> "QuestionBank":
+        questions = tuple(questions)
+
+        categories: Dict[str, List[Dict[str, Any]]] = {}
+        for q in questions:
+            categories.setdefault(q.get("category", "Unknown"), []).append({
+                "id": q["id"],
+                "title": q["title"],
+                "type": q["type"],
+                "difficulty": q.get("difficulty", "medium")
+            })
+
+        return cls(
+            version=version,
+            questions=questions,
+            by_id=MappingProxyType({q["id"]: q for q in questions}),
+            by_category=_index(questions, lambda q: q.get("category", "").lower()),
+            by_type=_index(questions, lambda q: q.get("type", "").lower()),
+            by_part=_index(questions, lambda q: q.get("part")),
+            by_difficulty=_index(questions, lambda q: q.get("difficulty", "").lower()),
+            categories=MappingProxyType({k: tuple(v) for k, v in categories.items()}),
+        )
+
+
+EMPTY_BANK = QuestionBank.build([], version="empty")
+
+
+class QuestionStore:
+    """Serves the current QuestionBank and reloads it when the file changes."""
+
+    def __init__(self, path: Path, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+
+        self._bank: Optional[QuestionBank] = None
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> QuestionBank:
+        """
+        Current snapshot. Checks the file's mtime at most once per check_interval.
+
+        Raises:
+            QuestionDataError: the file is invalid and there is no previous version to serve
+        """
+        bank = self._bank
+        if bank is not None and time.monotonic() < self._next_check:
+            return bank
+
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            stamp = self._stat()
+            if self._bank is None or stamp != self._file_stamp:
+                self._reload(stamp)
+            return self._bank
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _reload(self, stamp: Optional[Tuple[int, int]]):
+        if stamp is None:
+            self._bank = EMPTY_BANK
+            self._file_stamp = None
+            return
+
+        try:
+            raw = self.path.read_bytes()
+            bank = QuestionBank.build(json.loads(raw), version=hashlib.sha256(raw).hexdigest()[:16])
+        except FileNotFoundError:
+            self._bank = EMPTY_BANK
+            self._file_stamp = None
+            return
+        except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, AttributeError) as e:
+            if self._bank is None:
+                raise QuestionDataError(str(e))
+            # 편집 중인 파일 등 - 이전 버전을 계속 제공하고 다음 확인 때 다시 시도
+            print(f"Failed to reload questions ({e}); keeping version {self._bank.version}")
+            return
+
+        # 참조 교체는 원자적 - 읽는 쪽은 잠금 없이 이전 또는 새 스냅샷을 봄
+        self._bank = bank
+        self._file_stamp = stamp
+        self.reloads += 1
+        print(f"Loaded {len(bank.questions)} questions (version {bank.version})")
+
+
+question_store = QuestionStore(QUESTIONS_FILE)
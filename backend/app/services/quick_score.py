@@ -0,0 +1,133 @@
+# backend/app/services/quick_score.py
+"""
+빠른 채점용 로컬 모델
+
+dataset_preparation/train_quick_score_model.py가 만든 JSON 모델(부트스트랩 ridge 회귀
+앙상블)로 네 가지 루브릭 점수를 예측. 앙상블 예측의 표준편차를 불확실성으로 사용하고,
+불확실성이 QUICK_SCORE_MAX_UNCERTAINTY보다 크면 호출하는 쪽에서 OpenAI 평가로 넘김
+
+모델 파일 형식:
+    {
+      "version": "...",
+      "feature_names": ["duration", ...],
+      "mean": [...], "scale": [...],           # 특징 표준화
+      "targets": {
+        "fluency": {"weights": [[...], ...],   # (앙상블 크기, 특징 수)
+                    "bias": [...]},            # (앙상블 크기,)
+        "pronunciation": ..., "content": ..., "grammar": ...
+      }
+    }
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+RUBRIC_TARGETS = ("fluency", "pronunciation", "content", "grammar")
+
+
+class QuickScoreModelError(Exception):
+    """Raised when the model file is malformed or needs features that are missing."""
+
+
+@dataclass(frozen=True)
+class QuickScorePrediction:
+    scores: Dict[str, float]  # 루브릭별 예측 점수 (0-4)
+    uncertainty: float        # 루브릭 중 가장 큰 앙상블 표준편차
+
+
+class QuickScoreModel:
+    """Bootstrap ridge ensemble over standardized speech features."""
+
+    def __init__(self, spec: dict):
+        try:
+            self.version = str(spec.get("version", "unknown"))
+            self.feature_names = list(spec["feature_names"])
+            self.mean = np.asarray(spec["mean"], dtype=np.float64)
+            self.scale = np.asarray(spec["scale"], dtype=np.float64)
+            self.weights = {
+                target: np.asarray(spec["targets"][target]["weights"], dtype=np.float64)
+                for target in RUBRIC_TARGETS
+            }
+            self.bias = {
+                target: np.asarray(spec["targets"][target]["bias"], dtype=np.float64)
+                for target in RUBRIC_TARGETS
+            }
+        except (KeyError, TypeError, ValueError) as e:
+            raise QuickScoreModelError(f"Invalid quick-score model: {e}")
+
+        n_features = len(self.feature_names)
+        if self.mean.shape != (n_features,) or self.scale.shape != (n_features,):
+            raise QuickScoreModelError("Feature statistics do not match feature_names")
+        for target in RUBRIC_TARGETS:
+            weights, bias = self.weights[target], self.bias[target]
+            if weights.ndim != 2 or weights.shape[1] != n_features or bias.shape != (weights.shape[0],):
+                raise QuickScoreModelError(f"Invalid weights for {target}")
+
+        # 분산 0인 특징으로 나누지 않도록
+        self.scale = np.where(self.scale > 0, self.scale, 1.0)
+
+    def predict(self, features: Dict[str, float]) -> QuickScorePrediction:
+        """
+        Raises:
+            QuickScoreModelError: a feature the model was trained on is missing
+        """
+        missing = [name for name in self.feature_names if name not in features]
+        if missing:
+            raise QuickScoreModelError(f"Missing features: {', '.join(missing)}")
+
+        x = (np.array([features[name] for name in self.feature_names]) - self.mean) / self.scale
+
+        scores = {}
+        uncertainty = 0.0
+        for target in RUBRIC_TARGETS:
+            ensemble = self.weights[target] @ x + self.bias[target]
+            scores[target] = float(np.clip(ensemble.mean(), 0.0, 4.0))
+            uncertainty = max(uncertainty, float(ensemble.std()))
+
+        return QuickScorePrediction(scores=scores, uncertainty=uncertainty)
+
+
+class QuickScoreModelStore:
+    """Loads the model file lazily and reloads it when the file changes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._model: Optional[QuickScoreModel] = None
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[QuickScoreModel]:
+        """Current model, or None when no (valid) model file exists."""
+        try:
+            st = self.path.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = None
+
+        if stamp == self._file_stamp:
+            return self._model
+
+        with self._lock:
+            if stamp != self._file_stamp:
+                self._model = self._load() if stamp is not None else None
+                self._file_stamp = stamp
+            return self._model
+
+    def _load(self) -> Optional[QuickScoreModel]:
+        try:
+            model = QuickScoreModel(json.loads(self.path.read_text(encoding="utf-8")))
+        except (OSError, json.JSONDecodeError, QuickScoreModelError) as e:
+            print(f"Failed to load quick-score model {self.path}: {e}")
+            return None
+        print(f"Loaded quick-score model {model.version} ({len(model.feature_names)} features)")
+        return model
+
+
+quick_score_models = QuickScoreModelStore(settings.QUICK_SCORE_MODEL_PATH)
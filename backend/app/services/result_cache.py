@@ -0,0 +1,149 @@
+# backend/app/services/result_cache.py
+"""
+업스트림(CLOVA / OpenAI) 호출 결과 캐시
+
+- LRU + TTL: 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+- 요청 합치기(coalescing): 같은 키로 동시에 들어온 요청은 업스트림을 한 번만 호출하고
+  결과를 공유
+- 적중/미스/제거 카운터로 캐시 크기 조정 가능
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class AsyncResultCache:
+    """LRU + TTL cache for coroutine results with in-flight request coalescing."""
+
+    def __init__(self, name: str, max_entries: int, ttl: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Return the cached value for key, or run compute() once for all
+        concurrent callers with the same key.
+
+        Args:
+            key: Cache key
+            compute: Coroutine factory that calls the upstream
+            cacheable: Predicate deciding whether a result may be stored
+                       (e.g. fallback results must not be cached)
+
+        Returns:
+            The cached or freshly computed value. Exceptions raised by
+            compute() propagate to every coalesced caller and are not cached.
+        """
+        while True:
+            value = self._get(key)
+            if value is not None:
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    # 이 요청 자체가 취소됨
+                    raise
+                # 먼저 시작한 요청이 취소됨 - 직접 다시 계산
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        # 기다리는 요청이 없을 때 "exception was never retrieved" 경고 방지
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            if cacheable is None or cacheable(value):
+                self._put(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value or None (no coalescing)."""
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store a value computed outside get_or_compute (e.g. a streamed result)."""
+        self._put(key, value)
+
+    def _get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _put(self, key: str, value: Any):
+        if self.max_entries <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Counters for sizing the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "inflight": len(self._inflight),
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -1,9 +1,199 @@
 # backend/app/utils/audio.py
+import asyncio
+import struct
 import subprocess
+import uuid
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-def convert_to_wav(input_path: Path, output_path: Optional[Path] = None) -> Path:
+from app.config import settings
+
+# 컨테이너 판별에 필요한 파일 앞부분 바이트 수
+AUDIO_HEADER_SIZE = 12
+
+# stdin 파이프로 디코딩할 수 없는 컨테이너
+# MP4/M4A는 moov atom이 파일 끝에 있는 경우가 많아 seek 가능한 입력이 필요함
+PIPE_UNSAFE_FORMATS = {".m4a"}
+
+# ffmpeg 공통 출력 옵션
+# -ar 16000: sample rate 16kHz (commonly used for STT)
+# -ac 1: mono channel
+# -acodec pcm_s16le: PCM signed 16-bit little-endian
+FFMPEG_WAV_OUTPUT_ARGS = ['-ar', '16000', '-ac', '1', '-acodec', 'pcm_s16le']
+
+
+@dataclass
+class UploadedAudio:
+    """
+    Uploaded audio held in memory (small uploads) or spilled to TEMP_DIR.
+    Exactly one of data / path is set.
+    """
+    format: str
+    data: Optional[bytes] = None
+    path: Optional[Path] = None
+
+    @classmethod
+    def from_bytes(cls, data: bytes, audio_format: str) -> "UploadedAudio":
+        """
+        Rebuild an upload from raw bytes (e.g. audio handed over through a job queue).
+        Large files and pipe-unsafe containers are spilled to TEMP_DIR.
+        """
+        if audio_format in PIPE_UNSAFE_FORMATS or len(data) > settings.IN_MEMORY_AUDIO_MAX_SIZE:
+            path = settings.TEMP_DIR / f"{uuid.uuid4()}{audio_format}"
+            path.write_bytes(data)
+            return cls(format=audio_format, path=path)
+        return cls(format=audio_format, data=data)
+
+    @property
+    def size(self) -> int:
+        """Size in bytes, whether held in memory or spilled."""
+        if self.data is not None:
+            return len(self.data)
+        return self.path.stat().st_size
+
+    def read_bytes(self) -> bytes:
+        """Full content, reading the spilled file if needed."""
+        if self.data is not None:
+            return self.data
+        return self.path.read_bytes()
+
+    def cleanup(self):
+        """Delete the spilled temp file, if any."""
+        if self.path and self.path.exists():
+            try:
+                self.path.unlink()
+            except Exception as e:
+                print(f"Error deleting temp file {self.path}: {e}")
+
+def detect_audio_format(header: bytes) -> Optional[str]:
+    """
+    Detect the audio container from the first bytes of a file.
+
+    Args:
+        header: Leading bytes of the file (at least AUDIO_HEADER_SIZE bytes)
+
+    Returns:
+        Extension matching the detected container (e.g. ".wav"), or None if unknown
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return ".wav"
+    if header[:4] == b"OggS":
+        return ".ogg"
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        # EBML header (WebM / Matroska, MediaRecorder 기본 포맷)
+        return ".webm"
+    if header[4:8] == b"ftyp":
+        # ISO base media (MP4 / M4A)
+        return ".m4a"
+    if header[:3] == b"ID3":
+        return ".mp3"
+    if len(header) >= 2 and header[0] == 0xFF and (header[1] & 0xE0) == 0xE0:
+        # MPEG audio frame sync (ID3 태그 없는 MP3)
+        return ".mp3"
+    return None
+
+class TranscodePool:
+    """
+    Runs ffmpeg as asyncio subprocesses with a concurrency cap and a per-job
+    timeout, so transcoding never blocks the event loop and a burst of
+    uploads cannot start more ffmpeg processes than the pod has cores for.
+    """
+
+    def __init__(self, max_concurrency: int, timeout: float):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # 상태 카운터 (/health 에서 보고)
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+
+    async def run(self, args: list, input_data: Optional[bytes] = None) -> bytes:
+        """
+        Run one ffmpeg command once a slot is free.
+
+        Args:
+            args: Full command line (including the ffmpeg executable)
+            input_data: Bytes to pipe to stdin, or None
+
+        Returns:
+            Captured stdout
+
+        Raises:
+            subprocess.CalledProcessError: ffmpeg exited with a non-zero code
+            TimeoutError: the job ran longer than the configured timeout
+            FileNotFoundError: ffmpeg is not installed
+        """
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.PIPE if input_data is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(input_data),
+                    timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                await _kill(process)
+                raise TimeoutError(f"ffmpeg did not finish within {self.timeout}s")
+            except asyncio.CancelledError:
+                # 클라이언트 연결이 끊긴 경우 - ffmpeg 프로세스를 남기지 않음
+                await _kill(process)
+                raise
+
+            if process.returncode != 0:
+                self.failed += 1
+                raise subprocess.CalledProcessError(process.returncode, args, stdout, stderr)
+
+            self.completed += 1
+            return stdout
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        """Current queue depth and job counters."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "queued": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+        }
+
+
+async def _kill(process: asyncio.subprocess.Process):
+    """Kill a subprocess and reap it."""
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    await process.wait()
+
+
+transcode_pool = TranscodePool(
+    max_concurrency=settings.FFMPEG_MAX_CONCURRENCY,
+    timeout=settings.FFMPEG_TIMEOUT
+)
+
+async def convert_to_wav(input_path: Path, output_path: Optional[Path] = None) -> Path:
     """
     Convert audio file to WAV format using ffmpeg.
     If output_path is None, creates a new file with .wav extension.
@@ -26,27 +216,90 @@ def convert_to_wav(input_path: Path, output_path: Optional[Path] = None) -> Path
         # Convert to WAV using ffmpeg
         # -y: overwrite output file if exists
         # -i: input file
-        # -ar 16000: sample rate 16kHz (commonly used for STT)
-        # -ac 1: mono channel
-        # -acodec pcm_s16le: PCM signed 16-bit little-endian
-        subprocess.run([
+        # (출력 옵션은 FFMPEG_WAV_OUTPUT_ARGS 참고)
+        await transcode_pool.run([
             'ffmpeg',
             '-y',
             '-i', str(input_path),
-            '-ar', '16000',
-            '-ac', '1',
-            '-acodec', 'pcm_s16le',
+            *FFMPEG_WAV_OUTPUT_ARGS,
             str(output_path)
-        ], check=True, capture_output=True)
+        ])
 
         return output_path
     except subprocess.CalledProcessError as e:
         raise RuntimeError(f"Failed to convert audio file: {e.stderr.decode()}")
+    except TimeoutError as e:
+        output_path.unlink(missing_ok=True)
+        raise RuntimeError(f"Audio conversion timed out: {e}")
     except FileNotFoundError:
         # ffmpeg not installed - return original file and let the API handle it
         print("Warning: ffmpeg not found. Skipping audio conversion.")
         return input_path
 
+async def transcode_to_wav_bytes(data: bytes, input_format: str) -> bytes:
+    """
+    Convert in-memory audio to WAV without touching the disk.
+    The audio is piped to ffmpeg's stdin and PCM WAV is read back from stdout.
+
+    Args:
+        data: Raw audio bytes
+        input_format: Detected container extension (e.g. ".webm")
+
+    Returns:
+        WAV file bytes (16kHz mono PCM)
+    """
+    # Check if input is already WAV
+    if input_format == '.wav':
+        return data
+
+    try:
+        # -i pipe:0: read from stdin
+        # -f wav pipe:1: write WAV to stdout
+        # -map_metadata -1 / bitexact: LIST 청크 없이 최소 헤더만 출력
+        stdout = await transcode_pool.run([
+            'ffmpeg',
+            '-hide_banner',
+            '-loglevel', 'error',
+            '-i', 'pipe:0',
+            *FFMPEG_WAV_OUTPUT_ARGS,
+            '-map_metadata', '-1',
+            '-fflags', '+bitexact',
+            '-f', 'wav',
+            'pipe:1'
+        ], input_data=data)
+
+        return _fix_wav_header(stdout)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to convert audio file: {e.stderr.decode()}")
+    except TimeoutError as e:
+        raise RuntimeError(f"Audio conversion timed out: {e}")
+    except FileNotFoundError:
+        # ffmpeg not installed - return original bytes and let the API handle it
+        print("Warning: ffmpeg not found. Skipping audio conversion.")
+        return data
+
+def _fix_wav_header(wav: bytes) -> bytes:
+    """
+    Patch RIFF / data chunk sizes of a WAV written to a pipe.
+    ffmpeg cannot seek back on stdout, so the size fields are left as placeholders.
+    """
+    if len(wav) < 12 or wav[:4] != b"RIFF" or wav[8:12] != b"WAVE":
+        return wav
+
+    fixed = bytearray(wav)
+    struct.pack_into("<I", fixed, 4, len(fixed) - 8)
+
+    offset = 12
+    while offset + 8 <= len(fixed):
+        chunk_id = bytes(fixed[offset:offset + 4])
+        if chunk_id == b"data":
+            struct.pack_into("<I", fixed, offset + 4, len(fixed) - offset - 8)
+            break
+        chunk_size = struct.unpack_from("<I", fixed, offset + 4)[0]
+        offset += 8 + chunk_size + (chunk_size & 1)
+
+    return bytes(fixed)
+
 def validate_audio_file(file_path: Path, max_size: int = 50 * 1024 * 1024) -> bool:
     """
     Validate audio file size and format.
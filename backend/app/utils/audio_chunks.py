@@ -0,0 +1,123 @@
+# backend/app/utils/audio_chunks.py
+"""
+긴 녹음을 CLOVA 단문 인식 API 길이 제한(60초) 이하의 조각으로 분할
+
+가능한 한 말이 끊긴 구간(pause)에서 자르기 위해, 각 조각의 끝부분 탐색 구간에서
+에너지가 가장 낮은 지점을 분할 지점으로 선택. 탐색 구간에 pause가 없어도 가장
+조용한 지점에서 자르므로 조각 길이는 항상 제한 이하
+"""
+
+import io
+import wave
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+# 에너지 계산 프레임 길이 (초)
+FRAME_SECONDS = 0.02
+# 음소 사이의 짧은 틈이 아닌 실제 pause에서 자르도록 에너지를 평활화하는 길이 (초)
+SMOOTHING_SECONDS = 0.2
+
+
+@dataclass
+class AudioChunk:
+    """One WAV chunk of a longer recording."""
+    data: bytes      # 독립적으로 재생 가능한 WAV
+    offset: float    # 원본에서의 시작 시각 (초)
+    duration: float  # 길이 (초)
+
+
+def wav_duration(wav_bytes: bytes) -> Optional[float]:
+    """WAV 길이 (초). WAV가 아니면 None"""
+    try:
+        with wave.open(io.BytesIO(wav_bytes), "rb") as reader:
+            return reader.getnframes() / float(reader.getframerate())
+    except (wave.Error, EOFError):
+        return None
+
+
+def split_wav_at_pauses(
+    wav_bytes: bytes,
+    max_seconds: float,
+    search_seconds: float
+) -> List[AudioChunk]:
+    """
+    Split a 16-bit PCM WAV into chunks no longer than max_seconds, cutting at
+    the quietest point within the last search_seconds of each chunk.
+
+    Returns a single chunk (the original bytes) when no split is needed or the
+    input is not 16-bit PCM WAV.
+    """
+    try:
+        with wave.open(io.BytesIO(wav_bytes), "rb") as reader:
+            params = reader.getparams()
+            frames = reader.readframes(params.nframes)
+    except (wave.Error, EOFError):
+        return [AudioChunk(data=wav_bytes, offset=0.0, duration=0.0)]
+
+    rate = params.framerate
+    total_seconds = params.nframes / float(rate)
+    if params.sampwidth != 2 or total_seconds <= max_seconds:
+        return [AudioChunk(data=wav_bytes, offset=0.0, duration=total_seconds)]
+
+    samples = np.frombuffer(frames, dtype="<i2")
+    if params.nchannels > 1:
+        samples = samples.reshape(-1, params.nchannels).mean(axis=1)
+
+    # 프레임별 RMS 에너지
+    frame_len = max(1, int(rate * FRAME_SECONDS))
+    n_frames = len(samples) // frame_len
+    framed = samples[:n_frames * frame_len].astype(np.float32).reshape(n_frames, frame_len)
+    energy = np.sqrt(np.mean(framed ** 2, axis=1))
+
+    smooth_frames = max(1, int(SMOOTHING_SECONDS / FRAME_SECONDS))
+    energy = np.convolve(energy, np.ones(smooth_frames) / smooth_frames, mode="same")
+
+    max_frames = int(max_seconds / FRAME_SECONDS)
+    search_frames = max(1, min(max_frames - 1, int(search_seconds / FRAME_SECONDS)))
+
+    # 분할 지점 (에너지 프레임 인덱스)
+    cuts = []
+    start = 0
+    while n_frames - start > max_frames:
+        lo = start + max_frames - search_frames
+        hi = start + max_frames
+        cut = lo + _quietest_point(energy[lo:hi])
+        cuts.append(cut)
+        start = cut
+
+    # 프레임 인덱스 → 원본 PCM 바이트 위치로 변환해서 잘라냄 (재인코딩 없음)
+    bytes_per_sample_frame = params.sampwidth * params.nchannels
+    boundaries = [0] + [cut * frame_len for cut in cuts] + [params.nframes]
+
+    chunks = []
+    for begin, end in zip(boundaries, boundaries[1:]):
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as writer:
+            writer.setnchannels(params.nchannels)
+            writer.setsampwidth(params.sampwidth)
+            writer.setframerate(rate)
+            writer.writeframes(frames[begin * bytes_per_sample_frame:end * bytes_per_sample_frame])
+        chunks.append(AudioChunk(
+            data=buffer.getvalue(),
+            offset=begin / float(rate),
+            duration=(end - begin) / float(rate)
+        ))
+
+    return chunks
+
+
+def _quietest_point(energy: np.ndarray) -> int:
+    """에너지가 가장 낮은 지점이 속한 조용한 구간의 가운데 인덱스"""
+    quietest = int(np.argmin(energy))
+    quiet = energy <= energy[quietest] * 1.1 + 1e-6
+
+    run_start = quietest
+    while run_start > 0 and quiet[run_start - 1]:
+        run_start -= 1
+    run_end = quietest
+    while run_end < len(quiet) - 1 and quiet[run_end + 1]:
+        run_end += 1
+
+    return (run_start + run_end) // 2
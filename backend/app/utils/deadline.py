@@ -0,0 +1,34 @@
+# backend/app/utils/deadline.py
+"""
+요청 단위 처리 기한(deadline)
+
+HTTP 요청이 시작될 때 기한을 정해두면 그 요청 안에서 일어나는 업스트림 재시도가
+남은 시간을 넘기지 않음. 요청 밖(비동기 작업 워커, 스크립트 등)에서는 호출 시점부터
+기본 기한을 적용
+"""
+
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def start_deadline(seconds: float) -> Token:
+    """Set the deadline for the current context; returns a token for reset_deadline()."""
+    return _deadline.set(time.monotonic() + seconds)
+
+
+def reset_deadline(token: Token):
+    _deadline.reset(token)
+
+
+def current_deadline(default_seconds: float) -> float:
+    """
+    Absolute deadline (time.monotonic() based) for the current context.
+    Falls back to now + default_seconds when no request deadline is set.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return time.monotonic() + default_seconds
+    return deadline
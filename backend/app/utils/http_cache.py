@@ -0,0 +1,132 @@
+# backend/app/utils/http_cache.py
+"""
+변경이 드문 JSON 응답용 HTTP 캐시 도우미
+
+- 응답 본문을 한 번만 직렬화하고 gzip / brotli 압축본을 미리 만들어 둠
+- 데이터 버전에서 만든 strong ETag + If-None-Match → 304
+- Accept-Encoding에 따라 미리 압축된 본문 선택 (Vary: Accept-Encoding)
+"""
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+# 선택적 의존성: 빠른 JSON 직렬화 / brotli 압축
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 이 크기보다 작은 본문은 압축하지 않음 (압축 이득보다 헤더/CPU 비용이 큼)
+MIN_COMPRESS_SIZE = 1024
+
+
+def dumps_json(payload: Any) -> bytes:
+    """JSON 직렬화 (orjson이 있으면 사용, FastAPI 기본 JSONResponse와 같은 형식)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    """A JSON body serialized once, with precompressed variants and their ETags."""
+    etag: str
+    bodies: Dict[str, bytes]  # content-coding ("identity", "br", "gzip") → 본문
+
+    @classmethod
+    def build(cls, payload: Any, version: str) -> "EncodedBody":
+        raw = dumps_json(payload)
+        bodies = {"identity": raw}
+        if len(raw) >= MIN_COMPRESS_SIZE:
+            if BROTLI_AVAILABLE:
+                bodies["br"] = brotli.compress(raw, quality=11)
+            bodies["gzip"] = gzip.compress(raw, compresslevel=9, mtime=0)
+
+        # 같은 데이터 버전이라도 응답(경로)마다 내용이 다르므로 본문 해시를 함께 사용
+        digest = hashlib.sha256(raw).hexdigest()[:16]
+        return cls(etag=f"{version}-{digest}", bodies=bodies)
+
+    def etag_for(self, coding: str) -> str:
+        # 인코딩이 다르면 바이트가 다르므로 strong ETag도 달라야 함
+        if coding == "identity":
+            return f'"{self.etag}"'
+        return f'"{self.etag}-{coding}"'
+
+
+def cached_json_response(
+    request: Request,
+    body: EncodedBody,
+    cache_control: str
+) -> Response:
+    """
+    Serve a precomputed body: 304 when If-None-Match matches, otherwise the
+    best precompressed variant the client accepts.
+    """
+    coding = _choose_coding(request.headers.get("accept-encoding", ""), body)
+    etag = body.etag_for(coding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), body):
+        return Response(status_code=304, headers=headers)
+
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(content=body.bodies[coding], media_type="application/json", headers=headers)
+
+
+def _choose_coding(accept_encoding: str, body: EncodedBody) -> str:
+    accepted = _parse_accept_encoding(accept_encoding)
+    for coding in ("br", "gzip"):
+        if coding in body.bodies and accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return "identity"
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def _etag_matches(if_none_match: Optional[str], body: EncodedBody) -> bool:
+    """If-None-Match 비교 (weak comparison: 인코딩에 상관없이 같은 내용이면 일치)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    variants = {body.etag_for(coding) for coding in body.bodies}
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in variants:
+            return True
+    return False
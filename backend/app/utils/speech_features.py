@@ -0,0 +1,129 @@
+# backend/app/utils/speech_features.py
+"""
+빠른 채점(/speech/quick-score)용 음성 특징 추출 - numpy만 사용
+
+dataset_preparation/extract_audio_features.py의 특징(길이, 에너지, 휴지, 말하기 속도 등) 중
+librosa 없이 수 ms 안에 계산할 수 있는 것만 사용. 학습 스크립트
+(dataset_preparation/train_quick_score_model.py)도 이 모듈을 그대로 사용하므로
+학습과 추론의 특징 정의가 항상 같음
+
+이 모듈은 app 설정(app.config)에 의존하지 않아야 함 (학습 스크립트에서 import)
+"""
+
+import io
+import wave
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# 프레임 길이 (초)
+FRAME_SECONDS = 0.02
+# 최대 에너지 대비 이 값(dB) 이상 낮은 프레임은 무음 (librosa.effects.split top_db=30과 같은 기준)
+TOP_DB = 30.0
+# 이보다 짧은 무음은 휴지로 세지 않음 (단어 사이의 짧은 틈)
+MIN_PAUSE_SECONDS = 0.25
+
+# 인식 결과에서 얻는 특징 (CLOVA 발음 평가 없이 학습한 모델은 사용하지 않음)
+PRONUNCIATION_FEATURES = ("stt_confidence", "pron_overall", "pron_fluency")
+
+
+def read_pcm(wav_bytes: bytes) -> Tuple[np.ndarray, int]:
+    """
+    16-bit PCM WAV → mono float32 samples in [-1, 1] and sample rate.
+
+    Raises:
+        ValueError: not a 16-bit PCM WAV
+    """
+    try:
+        with wave.open(io.BytesIO(wav_bytes), "rb") as reader:
+            params = reader.getparams()
+            frames = reader.readframes(params.nframes)
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"Not a PCM WAV file: {e}")
+
+    if params.sampwidth != 2:
+        raise ValueError(f"Unsupported sample width: {params.sampwidth * 8} bit")
+
+    samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    if params.nchannels > 1:
+        samples = samples.reshape(-1, params.nchannels).mean(axis=1)
+    return samples, params.framerate
+
+
+def acoustic_features(samples: np.ndarray, sr: int) -> Dict[str, float]:
+    """길이, 발화 비율, 휴지, 에너지, zero crossing rate"""
+    duration = len(samples) / float(sr) if sr else 0.0
+
+    frame_len = max(1, int(sr * FRAME_SECONDS))
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return {
+            "duration": duration,
+            "speech_ratio": 0.0,
+            "num_pauses": 0.0,
+            "pause_mean": 0.0,
+            "pause_total": 0.0,
+            "pause_rate": 0.0,
+            "energy_mean": 0.0,
+            "energy_std": 0.0,
+            "zcr_mean": 0.0,
+        }
+
+    frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+
+    # 발화/무음 구분
+    db = 20.0 * np.log10(np.maximum(rms, 1e-10))
+    voiced = db >= db.max() - TOP_DB
+
+    # 발화 구간 사이의 무음 길이 (앞뒤 무음은 제외)
+    voiced_idx = np.flatnonzero(voiced)
+    pauses = np.array([])
+    if len(voiced_idx) > 1:
+        gaps = np.diff(voiced_idx) - 1
+        pauses = gaps[gaps * FRAME_SECONDS >= MIN_PAUSE_SECONDS] * FRAME_SECONDS
+
+    return {
+        "duration": duration,
+        "speech_ratio": float(voiced.mean()),
+        "num_pauses": float(len(pauses)),
+        "pause_mean": float(pauses.mean()) if len(pauses) else 0.0,
+        "pause_total": float(pauses.sum()) if len(pauses) else 0.0,
+        "pause_rate": len(pauses) / duration if duration > 0 else 0.0,
+        "energy_mean": float(rms[voiced].mean()),
+        "energy_std": float(rms[voiced].std()),
+        "zcr_mean": float(zcr[voiced].mean()),
+    }
+
+
+def quick_score_features(
+    wav_bytes: bytes,
+    text: str,
+    stt_confidence: Optional[float] = None,
+    pron_overall: Optional[float] = None,
+    pron_fluency: Optional[float] = None
+) -> Dict[str, float]:
+    """
+    Acoustic features of the recording plus transcript/pronunciation features.
+    Pronunciation features are included only when given.
+    """
+    samples, sr = read_pcm(wav_bytes)
+    features = acoustic_features(samples, sr)
+
+    word_count = len(text.split())
+    voiced_seconds = features["duration"] * features["speech_ratio"]
+    features.update({
+        "word_count": float(word_count),
+        "words_per_second": word_count / features["duration"] if features["duration"] > 0 else 0.0,
+        # 휴지를 제외한 실제 발화 속도
+        "articulation_rate": word_count / voiced_seconds if voiced_seconds > 0 else 0.0,
+    })
+
+    optional = {
+        "stt_confidence": stt_confidence,
+        "pron_overall": pron_overall,
+        "pron_fluency": pron_fluency,
+    }
+    features.update({name: float(value) for name, value in optional.items() if value is not None})
+    return features
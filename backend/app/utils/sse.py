@@ -0,0 +1,32 @@
+# backend/app/utils/sse.py
+import json
+from typing import Any, Optional
+
+# 프록시/ingress가 SSE 응답을 버퍼링하거나 캐시하지 않도록 하는 헤더
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """
+    Format one server-sent event.
+
+    Args:
+        data: JSON-serializable payload
+        event: Optional event name
+
+    Returns:
+        Event text terminated by a blank line
+    """
+    message = ""
+    if event:
+        message += f"event: {event}\n"
+    message += f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    return message
+
+
+def sse_keepalive() -> str:
+    """Comment line that keeps idle SSE connections open through proxies."""
+    return ": keep-alive\n\n"
@@ -0,0 +1,227 @@
+# backend/app/utils/upload.py
+import asyncio
+import uuid
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import List, Optional, Tuple
+from fastapi import UploadFile, HTTPException
+
+from app.config import settings
+from app.utils.audio import (
+    AUDIO_HEADER_SIZE,
+    PIPE_UNSAFE_FORMATS,
+    UploadedAudio,
+    detect_audio_format,
+)
+
+
+async def receive_upload(file: UploadFile) -> UploadedAudio:
+    """
+    Read an uploaded file chunk by chunk.
+
+    The container type is sniffed from the first bytes before anything is
+    stored, and MAX_FILE_SIZE is checked per file while reading (413). By
+    the time this runs Starlette has already spooled the request body, so
+    oversized requests are rejected earlier by the middlewares in main.py
+    (declared Content-Length, or bytes received for chunked uploads); this
+    check covers files in a batch request, which has a larger request
+    limit. Uploads up to IN_MEMORY_AUDIO_MAX_SIZE stay in memory; larger
+    ones (and containers ffmpeg cannot read from a pipe) are spilled to the
+    temp directory.
+
+    Returns:
+        UploadedAudio holding either the bytes or the temp file path
+    """
+    file_ext = Path(file.filename or "").suffix.lower()
+    if file_ext not in settings.ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type {file_ext} not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
+        )
+
+    header = await file.read(AUDIO_HEADER_SIZE)
+    detected_ext = detect_audio_format(header)
+    if detected_ext is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Unrecognized audio container. Allowed types: "
+                   f"{settings.ALLOWED_EXTENSIONS}"
+        )
+
+    upload = UploadedAudio(format=detected_ext)
+    buffer = bytearray(header)
+    spill_file = None
+    size = len(header)
+
+    try:
+        if detected_ext in PIPE_UNSAFE_FORMATS:
+            upload.path = settings.TEMP_DIR / f"{uuid.uuid4()}{detected_ext}"
+            spill_file = open(upload.path, "wb")
+
+        while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > settings.MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE} bytes"
+                )
+
+            if spill_file is None and size > settings.IN_MEMORY_AUDIO_MAX_SIZE:
+                # 메모리 한도 초과 - 지금까지 받은 내용을 디스크로 옮기고 이어서 저장
+                upload.path = settings.TEMP_DIR / f"{uuid.uuid4()}{detected_ext}"
+                spill_file = open(upload.path, "wb")
+
+            if spill_file is not None:
+                if buffer:
+                    spill_file.write(buffer)
+                    buffer = bytearray()
+                spill_file.write(chunk)
+            else:
+                buffer.extend(chunk)
+
+        if spill_file is not None:
+            spill_file.write(buffer)
+        else:
+            upload.data = bytes(buffer)
+    except BaseException:
+        if spill_file is not None:
+            spill_file.close()
+        upload.cleanup()
+        raise
+
+    if spill_file is not None:
+        spill_file.close()
+
+    return upload
+
+
+@dataclass
+class BatchItem:
+    """One recording of a batch upload: either received audio or the reason it was rejected."""
+    filename: str
+    upload: Optional[UploadedAudio] = None
+    error: Optional[HTTPException] = None
+
+
+async def receive_batch(files: List[UploadFile]) -> List[BatchItem]:
+    """
+    Receive a batch of recordings sent as individual files and/or zip archives.
+
+    Per-file problems (bad extension, unknown container, too large) are
+    recorded on the item instead of failing the whole batch. The batch itself
+    is rejected (400/413) when it has too many files or its total size -
+    loose files plus the expanded size of every archive - exceeds
+    BATCH_MAX_SIZE.
+
+    The caller owns the returned uploads and must clean them up.
+    """
+    items: List[BatchItem] = []
+    total_size = 0
+    try:
+        for file in files:
+            if Path(file.filename or "").suffix.lower() == ".zip":
+                # 남은 한도를 넘는 압축은 풀기 전에 거부
+                archive_items, expanded_size = await _receive_archive(
+                    file, settings.BATCH_MAX_SIZE - total_size
+                )
+                items.extend(archive_items)
+                total_size += expanded_size
+            else:
+                try:
+                    upload = await receive_upload(file)
+                except HTTPException as e:
+                    items.append(BatchItem(file.filename or "", error=e))
+                else:
+                    items.append(BatchItem(file.filename or "", upload=upload))
+                    total_size += upload.size
+
+            if total_size > settings.BATCH_MAX_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Batch expands beyond {settings.BATCH_MAX_SIZE} bytes"
+                )
+
+            if len(items) > settings.BATCH_MAX_FILES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Too many files in batch. Maximum is {settings.BATCH_MAX_FILES}"
+                )
+    except BaseException:
+        for item in items:
+            if item.upload is not None:
+                item.upload.cleanup()
+        raise
+
+    return items
+
+
+async def _receive_archive(file: UploadFile, size_budget: int) -> Tuple[List[BatchItem], int]:
+    """
+    Extract the audio members of a zip archive as batch items.
+
+    Returns:
+        (items, expanded size of the archive members)
+    """
+    try:
+        archive = zipfile.ZipFile(file.file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail=f"Invalid zip archive: {file.filename}")
+
+    with archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir() and not _is_hidden_member(info.filename)
+        ]
+
+        # 압축 해제 후 크기 검사 (zip bomb 방지) - 배치 전체 한도 중 남은 만큼
+        expanded_size = sum(info.file_size for info in members)
+        if expanded_size > size_budget:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Archive {file.filename} expands beyond the batch limit of {settings.BATCH_MAX_SIZE} bytes"
+            )
+
+        items = []
+        for info in members:
+            items.append(await _receive_archive_member(archive, info))
+        return items, expanded_size
+
+
+async def _receive_archive_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> BatchItem:
+    file_ext = PurePosixPath(info.filename).suffix.lower()
+    if file_ext not in settings.ALLOWED_EXTENSIONS:
+        return BatchItem(info.filename, error=HTTPException(
+            status_code=400,
+            detail=f"File type {file_ext} not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
+        ))
+
+    if info.file_size > settings.MAX_FILE_SIZE:
+        return BatchItem(info.filename, error=HTTPException(
+            status_code=413,
+            detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE} bytes"
+        ))
+
+    try:
+        data = await asyncio.to_thread(archive.read, info)
+    except (zipfile.BadZipFile, NotImplementedError, RuntimeError) as e:
+        # 손상된 항목, 지원하지 않는 압축 방식, 암호화된 항목
+        return BatchItem(info.filename, error=HTTPException(
+            status_code=400,
+            detail=f"Cannot extract {info.filename}: {e}"
+        ))
+
+    detected_ext = detect_audio_format(data[:AUDIO_HEADER_SIZE])
+    if detected_ext is None:
+        return BatchItem(info.filename, error=HTTPException(
+            status_code=415,
+            detail="Unrecognized audio container. Allowed types: "
+                   f"{settings.ALLOWED_EXTENSIONS}"
+        ))
+
+    return BatchItem(info.filename, upload=UploadedAudio.from_bytes(data, detected_ext))
+
+
+def _is_hidden_member(name: str) -> bool:
+    """macOS 리소스 포크(__MACOSX/, ._*) 및 숨김 파일"""
+    return any(part.startswith((".", "__MACOSX")) for part in PurePosixPath(name).parts)
@@ -0,0 +1 @@
+# Offline load-testing harness (mock upstreams + load driver)
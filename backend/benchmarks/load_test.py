@@ -0,0 +1,371 @@
+# backend/benchmarks/load_test.py
+"""
+오프라인 부하 테스트
+
+mock 업스트림(benchmarks/mock_upstreams.py)과 백엔드를 로컬에서 띄우고, 합성 음성으로
+/speech/analyze, /speech/evaluate에 지정한 동시성으로 요청을 보낸 뒤 다음을 출력
+- 처리량 (req/s), 상태 코드별 건수, 클라이언트 측 p50/p95/p99 지연
+- 단계별(upload, convert, transcribe, evaluate, total) p50/p95/p99 - 백엔드 /metrics 히스토그램 기준
+- fallback 횟수, mock 업스트림이 받은 요청/429/500 수
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.load_test --concurrency 16 --requests 200
+    python -m benchmarks.load_test --endpoint evaluate --clova-429-rate 0.1 --openai-max-concurrency 8
+
+이미 실행 중인 백엔드를 대상으로 하려면 --backend-url (업스트림 설정은 그 서버의 것을 따름)
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import wave
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+from prometheus_client.parser import text_string_to_metric_families
+
+from benchmarks.mock_upstreams import add_behavior_arguments, behavior_arguments
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SAMPLE_RATE = 16000
+STAGE_METRIC = "speech_stage_duration_seconds"
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def synthetic_wav(seconds: float, seed: int = 0) -> bytes:
+    """
+    말소리 비슷한 합성 음성 (16kHz mono 16-bit PCM WAV)
+    음절 단위로 켜졌다 꺼지는 배음 + 약한 잡음, 중간중간 휴지
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    f0 = 140 + 25 * np.sin(2 * np.pi * 0.3 * t)
+    voice = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in (1, 2, 3))
+    syllables = (np.sin(2 * np.pi * 4 * t) > -0.2).astype(float)
+    pauses = (np.mod(t, 6.0) < 5.2).astype(float)
+    y = 0.2 * voice * syllables * pauses + 0.01 * rng.standard_normal(len(t))
+    pcm = (np.clip(y, -1.0, 1.0) * 32767).astype("<i2")
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(SAMPLE_RATE)
+        writer.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def unique_variant(wav: bytes, index: int) -> bytes:
+    """
+    마지막 샘플 몇 개만 바꾼 사본 - 요청마다 오디오 해시가 달라 STT 캐시에 걸리지 않음
+    (합성 음성을 요청마다 새로 만들지 않기 위해)
+    """
+    data = bytearray(wav)
+    data[-8:] = index.to_bytes(8, "little")
+    return bytes(data)
+
+
+# -------------------------------------------------------------------------
+# 프로세스 실행
+# -------------------------------------------------------------------------
+
+def start_process(args: List[str], env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+
+
+async def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"{url} exited early:\n{process.stderr.read().decode(errors='replace')}")
+            try:
+                await client.get(url, timeout=1.0)
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not start within {timeout}s")
+
+
+def stop_process(process: Optional[subprocess.Popen]):
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# -------------------------------------------------------------------------
+# 부하 발생
+# -------------------------------------------------------------------------
+
+async def drive(
+    base_url: str,
+    endpoints: List[str],
+    audio: bytes,
+    concurrency: int,
+    total_requests: int,
+    timeout: float
+) -> Tuple[List[Tuple[str, int, float]], float]:
+    """
+    동시 concurrency개의 클라이언트가 총 total_requests개 요청 전송
+
+    Returns:
+        ([(endpoint, status code, 지연 초)], 전체 소요 시간)
+    """
+    results: List[Tuple[str, int, float]] = []
+    counter = iter(range(total_requests))
+
+    async def worker(client: httpx.AsyncClient):
+        for index in counter:
+            endpoint = endpoints[index % len(endpoints)]
+            files = {"file": (f"bench_{index}.wav", unique_variant(audio, index), "audio/wav")}
+            data = {"task_id": str(random.randint(1, 4))} if endpoint == "/speech/analyze" else {}
+
+            started = time.perf_counter()
+            try:
+                response = await client.post(endpoint, files=files, data=data)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0  # 연결 실패 / 타임아웃
+            results.append((endpoint, status, time.perf_counter() - started))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return results, elapsed
+
+
+# -------------------------------------------------------------------------
+# 결과 집계
+# -------------------------------------------------------------------------
+
+def percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q * 100)) if values else float("nan")
+
+
+async def scrape_metrics(base_url: str) -> Dict[str, Dict[Tuple, float]]:
+    """/metrics → {메트릭 샘플 이름: {라벨 튜플: 값}}"""
+    async with httpx.AsyncClient(base_url=base_url, timeout=10.0) as client:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+
+    samples: Dict[str, Dict[Tuple, float]] = {}
+    for family in text_string_to_metric_families(response.text):
+        for sample in family.samples:
+            samples.setdefault(sample.name, {})[tuple(sorted(sample.labels.items()))] = sample.value
+    return samples
+
+
+def stage_buckets(
+    before: Dict[str, Dict[Tuple, float]],
+    after: Dict[str, Dict[Tuple, float]]
+) -> Dict[str, Dict[float, float]]:
+    """부하 테스트 동안 늘어난 단계별 히스토그램 bucket 누적 개수 (task_id, outcome 합산)"""
+    name = f"{STAGE_METRIC}_bucket"
+    stages: Dict[str, Dict[float, float]] = {}
+    for labels, value in after.get(name, {}).items():
+        delta = value - before.get(name, {}).get(labels, 0.0)
+        label_map = dict(labels)
+        bucket = stages.setdefault(label_map["stage"], {})
+        le = float(label_map["le"])
+        bucket[le] = bucket.get(le, 0.0) + delta
+    return stages
+
+
+def histogram_quantile(q: float, buckets: Dict[float, float]) -> float:
+    """Prometheus histogram_quantile()과 같은 bucket 내 선형 보간"""
+    bounds = sorted(buckets)
+    total = buckets[bounds[-1]]
+    if total <= 0:
+        return float("nan")
+
+    rank = q * total
+    lower_bound, lower_count = 0.0, 0.0
+    for bound in bounds:
+        count = buckets[bound]
+        if count >= rank:
+            if bound == float("inf"):
+                return lower_bound  # 가장 큰 유한 bucket 경계
+            if count == lower_count:
+                return bound
+            return lower_bound + (bound - lower_bound) * (rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = bound, count
+    return lower_bound
+
+
+def counter_deltas(
+    before: Dict[str, Dict[Tuple, float]],
+    after: Dict[str, Dict[Tuple, float]],
+    name: str
+) -> Dict[Tuple, float]:
+    deltas = {}
+    for labels, value in after.get(name, {}).items():
+        delta = value - before.get(name, {}).get(labels, 0.0)
+        if delta:
+            deltas[labels] = delta
+    return deltas
+
+
+def print_report(
+    results: List[Tuple[str, int, float]],
+    elapsed: float,
+    before: Dict[str, Dict[Tuple, float]],
+    after: Dict[str, Dict[Tuple, float]],
+    upstream_counts: Optional[dict]
+) -> dict:
+    print()
+    print("=" * 72)
+    print(f"요청 {len(results)}개, {elapsed:.1f}초 → 처리량 {len(results) / elapsed:.2f} req/s")
+    print("=" * 72)
+
+    report = {"requests": len(results), "elapsed": elapsed, "throughput": len(results) / elapsed, "endpoints": {}}
+
+    print(f"\n{'endpoint':24s} {'count':>6s} {'p50':>8s} {'p95':>8s} {'p99':>8s}  status")
+    for endpoint in sorted({r[0] for r in results}):
+        latencies = [r[2] for r in results if r[0] == endpoint and r[1] == 200]
+        statuses = Counter(r[1] for r in results if r[0] == endpoint)
+        p = [percentile(latencies, q) for q in QUANTILES]
+        print(f"{endpoint:24s} {sum(statuses.values()):6d} {p[0]:8.3f} {p[1]:8.3f} {p[2]:8.3f}  {dict(statuses)}")
+        report["endpoints"][endpoint] = {
+            "status": {str(k): v for k, v in statuses.items()},
+            **{f"p{int(q * 100)}": v for q, v in zip(QUANTILES, p)},
+        }
+
+    stages = stage_buckets(before, after)
+    report["stages"] = {}
+    if stages:
+        print(f"\n{'stage':24s} {'count':>6s} {'p50':>8s} {'p95':>8s} {'p99':>8s}   (서버 /metrics 기준, 초)")
+        for stage in ("upload", "convert", "transcribe", "evaluate", "quick_score", "total"):
+            if stage not in stages:
+                continue
+            buckets = stages[stage]
+            p = [histogram_quantile(q, buckets) for q in QUANTILES]
+            print(f"{stage:24s} {int(buckets[float('inf')]):6d} {p[0]:8.3f} {p[1]:8.3f} {p[2]:8.3f}")
+            report["stages"][stage] = {f"p{int(q * 100)}": v for q, v in zip(QUANTILES, p)}
+
+    fallbacks = counter_deltas(before, after, "speech_fallback_total")
+    if fallbacks:
+        print("\nfallback:")
+        for labels, value in sorted(fallbacks.items()):
+            print(f"  {dict(labels)}: {int(value)}")
+    report["fallbacks"] = {json.dumps(dict(k)): v for k, v in fallbacks.items()}
+
+    if upstream_counts:
+        print(f"\nmock 업스트림: {upstream_counts}")
+        report["upstreams"] = upstream_counts
+
+    return report
+
+
+# -------------------------------------------------------------------------
+
+async def run(args: argparse.Namespace) -> dict:
+    mock = backend = None
+    try:
+        if args.backend_url:
+            base_url = args.backend_url
+            mock_url = None
+        else:
+            mock_url = f"http://127.0.0.1:{args.mock_port}"
+            base_url = f"http://127.0.0.1:{args.backend_port}"
+
+            mock = start_process(
+                ["-m", "benchmarks.mock_upstreams", "--port", str(args.mock_port), *behavior_arguments(args)]
+            )
+            await wait_until_ready(f"{mock_url}/stats", mock)
+
+            env = {
+                "NAVER_CLOVA_STT_ENDPOINT": f"{mock_url}/recog/v1/stt",
+                "NAVER_CLOVA_SECRET_KEY": "mock",
+                "OPENAI_BASE_URL": f"{mock_url}/v1",
+                "OPENAI_API_KEY": "mock",
+                "CLOVA_WARMUP": "false",
+                "CLOVA_HTTP2": "false",
+            }
+            if not args.with_cache:
+                # 업스트림 경로를 측정하기 위해 결과 캐시 비활성화
+                env.update({"STT_CACHE_SIZE": "0", "EVAL_CACHE_SIZE": "0"})
+
+            backend = start_process(
+                ["-m", "uvicorn", "app.main:app", "--port", str(args.backend_port),
+                 "--workers", str(args.backend_workers), "--log-level", "warning"],
+                env=env
+            )
+            await wait_until_ready(f"{base_url}/health", backend)
+
+        endpoints = ["/speech/analyze", "/speech/evaluate"] if args.endpoint == "both" else [f"/speech/{args.endpoint}"]
+        audio = synthetic_wav(args.audio_seconds)
+        print(f"합성 음성 {args.audio_seconds:g}초 ({len(audio) / 1024:.0f}KB), "
+              f"동시성 {args.concurrency}, 요청 {args.requests}개 → {', '.join(endpoints)}")
+
+        # 연결 / 지연 import 등 첫 요청 비용 제외
+        if args.warmup:
+            await drive(base_url, endpoints, audio, min(args.concurrency, args.warmup), args.warmup, args.timeout)
+
+        before = await scrape_metrics(base_url)
+        if mock_url:
+            async with httpx.AsyncClient() as client:
+                await client.post(f"{mock_url}/stats/reset")
+
+        results, elapsed = await drive(base_url, endpoints, audio, args.concurrency, args.requests, args.timeout)
+
+        after = await scrape_metrics(base_url)
+        upstream_counts = None
+        if mock_url:
+            async with httpx.AsyncClient() as client:
+                upstream_counts = (await client.get(f"{mock_url}/stats")).json()
+
+        return print_report(results, elapsed, before, after, upstream_counts)
+    finally:
+        stop_process(backend)
+        stop_process(mock)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test with mocked CLOVA / OpenAI")
+    parser.add_argument("--endpoint", choices=["analyze", "evaluate", "both"], default="both")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=4, help="측정 전 보낼 요청 수")
+    parser.add_argument("--audio-seconds", type=float, default=45.0, help="합성 음성 길이 (초)")
+    parser.add_argument("--timeout", type=float, default=130.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--backend-url", default=None, help="이미 실행 중인 백엔드 (지정 시 mock/백엔드를 띄우지 않음)")
+    parser.add_argument("--backend-port", type=int, default=9000)
+    parser.add_argument("--backend-workers", type=int, default=1)
+    parser.add_argument("--mock-port", type=int, default=9100)
+    parser.add_argument("--with-cache", action="store_true", help="STT/평가 결과 캐시 사용")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    add_behavior_arguments(parser)
+
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
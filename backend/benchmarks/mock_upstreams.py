@@ -0,0 +1,263 @@
+# backend/benchmarks/mock_upstreams.py
+"""
+CLOVA Speech / OpenAI 대역 서버 (부하 테스트용)
+
+API 크레딧을 쓰지 않고 백엔드를 부하 테스트할 수 있도록 두 업스트림의 프로토콜을 흉내 냄
+- POST /recog/v1/stt            CLOVA 단문 인식 (바이너리 오디오 → text/confidence/발음 점수)
+- POST /v1/chat/completions     OpenAI chat completions (일반 / stream + include_usage)
+
+업스트림별로 응답 지연 분포, 오류율(5xx), 429 비율, 동시 처리 한도(초과 시 429)를 설정
+
+실행:
+    python -m benchmarks.mock_upstreams --port 9100 \\
+        --clova-latency lognormal:0.8,0.35 --openai-latency lognormal:1.5,0.4 \\
+        --clova-429-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+WORDS = (
+    "I think that studying subjects that interest me is more important because "
+    "it keeps me motivated and helps me learn faster for example last semester "
+    "I took a history class and I really enjoyed the discussions with my classmates"
+).split()
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    지연 분포 문자열 → 샘플러 (초)
+
+    - "const:0.5"             항상 0.5초
+    - "uniform:0.2,1.0"       0.2-1.0초 균등 분포
+    - "lognormal:0.8,0.35"    중앙값 0.8초, sigma 0.35 로그정규 분포 (긴 꼬리)
+    """
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(v) for v in args.split(",") if v.strip()]
+        if kind == "const" and len(values) == 1:
+            return lambda: values[0]
+        if kind == "uniform" and len(values) == 2:
+            return lambda: random.uniform(values[0], values[1])
+        if kind == "lognormal" and len(values) == 2:
+            mu = math.log(values[0])
+            return lambda: random.lognormvariate(mu, values[1])
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"Invalid latency distribution: {spec}")
+
+
+@dataclass
+class UpstreamBehavior:
+    """Latency and failure profile of one mocked upstream."""
+    latency: Callable[[], float] = field(default_factory=lambda: parse_latency("const:0"))
+    error_rate: float = 0.0        # 500 응답 비율
+    rate_limit_rate: float = 0.0   # 무작위 429 비율
+    max_concurrency: int = 0       # 동시 처리 한도 (초과 시 429, 0이면 무제한)
+    retry_after: float = 1.0       # 429 응답의 Retry-After (초)
+
+    in_flight: int = 0
+    counts: dict = field(default_factory=lambda: {"requests": 0, "ok": 0, "429": 0, "500": 0})
+
+    def reject(self) -> Optional[Response]:
+        """요청을 받지 않을 경우 429/500 응답, 받으면 None"""
+        self.counts["requests"] += 1
+        if self.max_concurrency and self.in_flight >= self.max_concurrency:
+            return self._too_many_requests()
+        if random.random() < self.rate_limit_rate:
+            return self._too_many_requests()
+        if random.random() < self.error_rate:
+            self.counts["500"] += 1
+            return JSONResponse({"error": {"message": "mock upstream error"}}, status_code=500)
+        return None
+
+    def _too_many_requests(self) -> Response:
+        self.counts["429"] += 1
+        return JSONResponse(
+            {"error": {"message": "mock rate limit"}},
+            status_code=429,
+            headers={"Retry-After": f"{self.retry_after:g}"}
+        )
+
+
+def _transcript(rng: random.Random) -> str:
+    # 매번 다른 문장 - 백엔드 평가 캐시에 걸리지 않도록
+    start = rng.randrange(len(WORDS))
+    length = rng.randint(25, 60)
+    return " ".join(WORDS[(start + i) % len(WORDS)] for i in range(length))
+
+
+def create_app(clova: UpstreamBehavior, openai: UpstreamBehavior) -> FastAPI:
+    app = FastAPI(title="Mock upstreams")
+    rng = random.Random()
+
+    @app.post("/recog/v1/stt")
+    async def clova_stt(request: Request):
+        await request.body()
+        rejected = clova.reject()
+        if rejected is not None:
+            return rejected
+
+        clova.in_flight += 1
+        try:
+            await asyncio.sleep(clova.latency())
+        finally:
+            clova.in_flight -= 1
+
+        clova.counts["ok"] += 1
+        text = _transcript(rng)
+        return {
+            "text": text,
+            "confidence": round(rng.uniform(0.75, 0.98), 3),
+            "pronunciationScore": round(rng.uniform(55, 95), 1),
+            "fluencyScore": round(rng.uniform(50, 95), 1),
+            "words": [
+                {"text": word, "pronunciationScore": rng.randint(50, 100), "start": i * 400, "end": i * 400 + 350}
+                for i, word in enumerate(text.split())
+            ],
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        rejected = openai.reject()
+        if rejected is not None:
+            return rejected
+
+        content = json.dumps({
+            "fluency": round(rng.uniform(2.0, 3.8), 1),
+            "pronunciation": round(rng.uniform(2.0, 3.8), 1),
+            "content": round(rng.uniform(2.0, 3.8), 1),
+            "grammar": round(rng.uniform(2.0, 3.8), 1),
+            "feedback": "전반적으로 자연스럽게 답변했습니다. 예시를 조금 더 구체적으로 들어보세요.",
+            "tips": ["답변 전에 핵심 아이디어를 정리해보세요.", "연결어를 다양하게 사용해보세요."],
+        }, ensure_ascii=False)
+        prompt_tokens = sum(len(m.get("content", "")) for m in body.get("messages", [])) // 3
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 3,
+            "total_tokens": prompt_tokens + len(content) // 3,
+            "prompt_tokens_details": {"cached_tokens": prompt_tokens // 2},
+        }
+        base = {"id": f"chatcmpl-mock-{rng.getrandbits(32):x}", "created": int(time.time()), "model": body.get("model", "mock")}
+
+        if not body.get("stream"):
+            openai.in_flight += 1
+            try:
+                await asyncio.sleep(openai.latency())
+            finally:
+                openai.in_flight -= 1
+            openai.counts["ok"] += 1
+            return {
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            }
+
+        async def events():
+            # 전체 지연을 토큰 조각 수만큼 나눠 흘려보냄
+            pieces = [content[i:i + 12] for i in range(0, len(content), 12)]
+            delay = openai.latency() / len(pieces)
+            openai.in_flight += 1
+            try:
+                for piece in pieces:
+                    await asyncio.sleep(delay)
+                    chunk = {
+                        **base,
+                        "object": "chat.completion.chunk",
+                        "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                done = {**base, "object": "chat.completion.chunk",
+                        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+                yield f"data: {json.dumps(done)}\n\n"
+                if body.get("stream_options", {}).get("include_usage"):
+                    yield f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})}\n\n"
+                yield "data: [DONE]\n\n"
+                openai.counts["ok"] += 1
+            finally:
+                openai.in_flight -= 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        return {"clova": clova.counts, "openai": openai.counts}
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        for behavior in (clova, openai):
+            behavior.counts = {key: 0 for key in behavior.counts}
+        return {"status": "ok"}
+
+    return app
+
+
+BEHAVIOR_OPTIONS = ("latency", "error_rate", "429_rate", "max_concurrency", "retry_after")
+
+
+def latency_spec(spec: str) -> str:
+    """argparse type: 지연 분포 문자열 검증 (문자열 그대로 반환)"""
+    parse_latency(spec)
+    return spec
+
+
+def add_behavior_arguments(parser: argparse.ArgumentParser):
+    """업스트림별 지연/오류 옵션 (load_test.py와 공유)"""
+    for name, latency in (("clova", "lognormal:0.8,0.35"), ("openai", "lognormal:1.5,0.4")):
+        parser.add_argument(f"--{name}-latency", type=latency_spec, default=latency,
+                            metavar="DIST", help=f"{name} 응답 지연 분포 (기본: {latency})")
+        parser.add_argument(f"--{name}-error-rate", type=float, default=0.0,
+                            help=f"{name} 500 응답 비율")
+        parser.add_argument(f"--{name}-429-rate", type=float, default=0.0,
+                            help=f"{name} 무작위 429 응답 비율")
+        parser.add_argument(f"--{name}-max-concurrency", type=int, default=0,
+                            help=f"{name} 동시 처리 한도, 초과 시 429 (0: 무제한)")
+        parser.add_argument(f"--{name}-retry-after", type=float, default=1.0,
+                            help=f"{name} 429 응답의 Retry-After (초)")
+
+
+def behavior_arguments(args: argparse.Namespace) -> list:
+    """파싱된 옵션 → mock 서버 명령줄 인자 (load_test.py가 서버를 띄울 때 사용)"""
+    argv = []
+    for name in ("clova", "openai"):
+        for option in BEHAVIOR_OPTIONS:
+            argv += [f"--{name}-{option.replace('_', '-')}", str(getattr(args, f"{name}_{option}"))]
+    return argv
+
+
+def behavior_from_args(args: argparse.Namespace, name: str) -> UpstreamBehavior:
+    return UpstreamBehavior(
+        latency=parse_latency(getattr(args, f"{name}_latency")),
+        error_rate=getattr(args, f"{name}_error_rate"),
+        rate_limit_rate=getattr(args, f"{name}_429_rate"),
+        max_concurrency=getattr(args, f"{name}_max_concurrency"),
+        retry_after=getattr(args, f"{name}_retry_after"),
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="CLOVA / OpenAI mock servers for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    app = create_app(behavior_from_args(args, "clova"), behavior_from_args(args, "openai"))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,207 @@
+"""
+음성 분석 컨텍스트
+한 파일을 한 번만 디코딩하고 STFT / mel 스펙트로그램 / RMS를 한 번만 계산해
+여러 특징 계열(MFCC, pitch, spectral, tempo, 휴지)이 공유하도록 함
+
+extract_audio_features.py와 unused_lstm/audio_feature_extraction.py가 함께 사용
+
+Pitch(F0) 추정 방법 (pitch_values):
+- "piptrack": librosa.piptrack + 프레임별 최대 크기 bin 선택 (기존 결과와 동일, 벡터화)
+- "yin": NumPy YIN - 음성 대역(60-500Hz)에서 더 안정적이고 빠름 (옥타브 오류, 잡음 bin에 덜 민감)
+"""
+
+from functools import cached_property, lru_cache
+from typing import Tuple
+
+import librosa
+import numpy as np
+import scipy.fft
+
+
+PITCH_METHODS = ("piptrack", "yin")
+
+# YIN 기본 설정 (말소리 F0 대역)
+YIN_FMIN = 60.0
+YIN_FMAX = 500.0
+YIN_THRESHOLD = 0.15
+YIN_FRAME_LENGTH = 1024
+# 가장 큰 프레임보다 이만큼(dB) 이상 작은 프레임은 무음으로 보고 pitch를 구하지 않음
+YIN_SILENCE_DB = 40.0
+
+
+@lru_cache(maxsize=8)
+def _mel_basis(sr: int, n_fft: int) -> np.ndarray:
+    """mel 필터 뱅크 (sr, n_fft별로 한 번만 생성)"""
+    return librosa.filters.mel(sr=sr, n_fft=n_fft)
+
+
+class AudioAnalysis:
+    """
+    한 음성 파일의 분석 컨텍스트
+    디코딩은 한 번, STFT / mel 스펙트로그램 / RMS는 처음 필요할 때 한 번만 계산하고
+    모든 특징 계열이 공유 (librosa 기본값 n_fft=2048, hop_length=512와 같은 결과)
+    """
+
+    def __init__(self, y: np.ndarray, sr: int, n_fft: int = 2048, hop_length: int = 512):
+        self.y = y
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+
+    @classmethod
+    def from_file(cls, audio_path: str, sample_rate: int = 16000) -> "AudioAnalysis":
+        y, sr = librosa.load(audio_path, sr=sample_rate)
+        return cls(y, sr)
+
+    @property
+    def duration(self) -> float:
+        return float(librosa.get_duration(y=self.y, sr=self.sr))
+
+    @cached_property
+    def magnitude(self) -> np.ndarray:
+        """|STFT| - piptrack, spectral centroid/rolloff/contrast, spectral flux"""
+        return np.abs(librosa.stft(self.y, n_fft=self.n_fft, hop_length=self.hop_length))
+
+    @cached_property
+    def power(self) -> np.ndarray:
+        """|STFT|^2 - chroma, mel 스펙트로그램"""
+        return self.magnitude ** 2
+
+    @cached_property
+    def log_mel(self) -> np.ndarray:
+        """log-power mel 스펙트로그램 - MFCC, onset strength"""
+        # librosa.feature.melspectrogram과 같은 연산
+        mel = np.einsum("...ft,mf->...mt", self.power, _mel_basis(self.sr, self.n_fft), optimize=True)
+        return librosa.power_to_db(mel)
+
+    @cached_property
+    def rms(self) -> np.ndarray:
+        """프레임 RMS - energy, 무음 구간 탐지"""
+        return librosa.feature.rms(y=self.y, frame_length=self.n_fft, hop_length=self.hop_length)[0]
+
+    def nonsilent_intervals(self, top_db: float = 30) -> np.ndarray:
+        """librosa.effects.split(y, top_db)와 같은 결과 (공유 RMS 사용)"""
+        non_silent = librosa.amplitude_to_db(self.rms, ref=np.max, top_db=None) > -top_db
+
+        edges = [np.flatnonzero(np.diff(non_silent.astype(int))) + 1]
+        if non_silent[0]:
+            edges.insert(0, np.array([0]))
+        if non_silent[-1]:
+            edges.append(np.array([len(non_silent)]))
+
+        edges = librosa.frames_to_samples(np.concatenate(edges), hop_length=self.hop_length)
+        edges = np.minimum(edges, self.y.shape[-1])
+        return edges.reshape((-1, 2))
+
+    def pitch_values(self, method: str = "piptrack") -> np.ndarray:
+        """
+        유성음 프레임의 pitch(Hz) 값들 (무성음/무음 프레임 제외)
+
+        Args:
+            method: "piptrack" 또는 "yin"
+        """
+        if method == "piptrack":
+            pitches, magnitudes = librosa.piptrack(S=self.magnitude, sr=self.sr)
+            return piptrack_pitch_values(pitches, magnitudes)
+        if method == "yin":
+            f0, voiced = yin(self.y, self.sr, hop_length=self.hop_length)
+            return f0[voiced]
+        raise ValueError(f"Unknown pitch method: {method} (choose from {', '.join(PITCH_METHODS)})")
+
+
+def piptrack_pitch_values(pitches: np.ndarray, magnitudes: np.ndarray) -> np.ndarray:
+    """
+    프레임마다 크기가 가장 큰 bin의 pitch를 골라 0보다 큰 값만 반환
+    (프레임별 Python 루프 `magnitudes[:, t].argmax()`와 같은 결과를 한 번에 계산)
+    """
+    index = magnitudes.argmax(axis=0)
+    pitch = pitches[index, np.arange(pitches.shape[1])]
+    return pitch[pitch > 0]
+
+
+def yin(
+    y: np.ndarray,
+    sr: int,
+    fmin: float = YIN_FMIN,
+    fmax: float = YIN_FMAX,
+    frame_length: int = YIN_FRAME_LENGTH,
+    hop_length: int = 512,
+    threshold: float = YIN_THRESHOLD,
+    silence_db: float = YIN_SILENCE_DB
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    YIN F0 추정 (de Cheveigné & Kawahara, 2002) - 모든 프레임을 한 번에 계산
+
+    프레임은 STFT(center=True)와 같은 위치에 맞춤 (프레임 수 1 + len(y) // hop_length)
+
+    Returns:
+        (f0 Hz 배열, 유성음 여부 배열) - 무성음 프레임의 f0는 0
+    """
+    min_lag = max(1, int(np.floor(sr / fmax)))
+    max_lag = int(np.ceil(sr / fmin))
+    # 포물선 보간을 위해 max_lag + 1까지 계산
+    window = frame_length - (max_lag + 1)
+    if window < max_lag:
+        raise ValueError(f"frame_length={frame_length} is too short for fmin={fmin}Hz")
+
+    padded = np.pad(np.asarray(y, dtype=np.float32), frame_length // 2)
+    n_frames = 1 + len(y) // hop_length
+    starts = np.arange(n_frames) * hop_length
+    frames = np.lib.stride_tricks.sliding_window_view(padded, frame_length)[::hop_length][:n_frames]
+
+    f0 = np.zeros(n_frames)
+    voiced = np.zeros(n_frames, dtype=bool)
+
+    # 구간 에너지는 신호 전체의 누적합 한 번으로 계산: Σ x[a:b]^2 = energy[b] - energy[a]
+    energy = np.concatenate([[0.0], np.cumsum(padded.astype(np.float64) ** 2)])
+
+    # 무음 프레임은 계산하지 않음
+    frame_energy = energy[starts + frame_length] - energy[starts]
+    level = 10 * np.log10(np.maximum(frame_energy / frame_length, 1e-20))
+    active = np.flatnonzero(level > level.max() - silence_db)
+    if len(active) == 0:
+        return f0, voiced
+    frames = frames[active]
+    starts = starts[active]
+
+    # 차이 함수 d(τ) = Σ_{j<W} (x_j - x_{j+τ})^2 = E[0, W) + E[τ, τ+W) - 2·r(τ)
+    # 상호상관 r(τ)는 FFT로 계산 (j + τ < frame_length이므로 frame_length 길이 FFT로 충분)
+    # scipy.fft는 float32를 그대로 변환해 numpy.fft보다 빠름
+    n_fft = 1 << int(np.ceil(np.log2(frame_length)))
+    spectrum = scipy.fft.rfft(frames, n=n_fft, axis=1)
+    head = scipy.fft.rfft(frames[:, :window], n=n_fft, axis=1)
+    acf = scipy.fft.irfft(spectrum * np.conj(head), n=n_fft, axis=1)[:, :max_lag + 2]
+
+    lags = np.arange(max_lag + 2)
+    offsets = starts[:, None] + lags
+    diff = (energy[starts + window] - energy[starts])[:, None] \
+        + (energy[offsets + window] - energy[offsets]) - 2 * acf
+    diff[:, 0] = 0.0
+    diff = np.maximum(diff, 0.0)
+
+    # 누적 평균 정규화 d'(τ)
+    cumulative = np.cumsum(diff[:, 1:], axis=1)
+    cmnd = np.ones_like(diff)
+    cmnd[:, 1:] = diff[:, 1:] * lags[1:] / np.maximum(cumulative, 1e-12)
+
+    # 임계값 아래의 첫 번째 극소점
+    search = cmnd[:, min_lag:max_lag + 1]
+    is_min = np.zeros_like(search, dtype=bool)
+    is_min[:, 1:-1] = (search[:, 1:-1] <= search[:, :-2]) & (search[:, 1:-1] <= search[:, 2:])
+    candidates = is_min & (search < threshold)
+    found = candidates.any(axis=1)
+    tau = min_lag + np.argmax(candidates, axis=1)
+
+    # 포물선 보간으로 lag 보정
+    rows = np.arange(len(frames))
+    prev_value = cmnd[rows, tau - 1]
+    value = cmnd[rows, tau]
+    next_value = cmnd[rows, tau + 1]
+    denominator = prev_value - 2 * value + next_value
+    safe = np.where(np.abs(denominator) > 1e-12, denominator, 1.0)
+    shift = np.where(np.abs(denominator) > 1e-12, 0.5 * (prev_value - next_value) / safe, 0.0)
+    refined = tau + np.clip(shift, -1.0, 1.0)
+
+    voiced[active] = found
+    f0[active] = np.where(found, sr / refined, 0.0)
+    return f0, voiced
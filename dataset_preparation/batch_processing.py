@@ -0,0 +1,131 @@
+"""
+파일 단위 일괄 처리 (프로세스 풀 + 진행 상황)
+음성 파일마다 독립적인 특징 추출을 여러 코어에 나눠 실행
+
+extract_audio_features.py와 unused_lstm/audio_feature_extraction.py가 함께 사용
+- workers=1이면 현재 프로세스에서 순서대로 처리 (기존 동작)
+- workers>1이면 multiprocessing.Pool.imap_unordered로 chunk 단위 분배, 끝나는 순서대로 결과 반환
+- 한 파일의 오류는 결과로 돌려주고 나머지 파일은 계속 처리
+- 결과는 JSONL에 파일별로 이어 쓰고, 다시 실행하면 기록된 파일은 건너뜀 (read_jsonl_records)
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def read_jsonl_records(path: Path) -> List[Dict]:
+    """
+    결과를 이어 쓰는 JSONL 파일의 기존 기록 (재개용)
+
+    중단되면 마지막 줄이 잘려 있을 수 있음 - 읽을 수 없는 줄을 버리고 파일을 다시 써서
+    이어 쓰는 기록이 잘린 줄에 붙지 않도록 함
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    records, dropped = [], 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                dropped += 1
+
+    if dropped:
+        print(f"⚠️  {path}: 읽을 수 없는 줄 {dropped}개 제거 (중단된 기록)")
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return records
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def default_chunksize(n_items: int, workers: int) -> int:
+    """워커당 여러 chunk가 돌아가도록 (느린 파일이 한 워커에 몰리지 않게), 최대 16개"""
+    return max(1, min(16, n_items // (workers * 8)))
+
+
+class _SafeCall:
+    """예외를 결과로 바꿔 돌려주는 래퍼 (풀 워커로 pickle 가능)"""
+
+    def __init__(self, fn: Callable[[Any], Any]):
+        self.fn = fn
+
+    def __call__(self, item: Any) -> Tuple[Any, Any, Optional[str]]:
+        try:
+            return item, self.fn(item), None
+        except Exception as e:
+            return item, None, f"{type(e).__name__}: {e}"
+
+
+def iter_parallel(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int = 1,
+    chunksize: Optional[int] = None
+) -> Iterator[Tuple[Any, Any, Optional[str]]]:
+    """
+    items 각각에 fn을 실행하고 (item, 결과, 오류 메시지) 를 끝나는 순서대로 반환
+
+    Args:
+        fn: 모듈 최상위 함수 또는 pickle 가능한 callable (functools.partial 등)
+        items: 처리할 항목 (파일 경로 등)
+        workers: 프로세스 수 (1이면 현재 프로세스에서 처리)
+        chunksize: 한 번에 워커에 넘길 항목 수 (None이면 자동)
+    """
+    items: List[Any] = list(items)
+    call = _SafeCall(fn)
+
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield call(item)
+        return
+
+    workers = min(workers, len(items))
+    chunksize = chunksize or default_chunksize(len(items), workers)
+    with multiprocessing.Pool(processes=workers) as pool:
+        yield from pool.imap_unordered(call, items, chunksize=chunksize)
+
+
+class ProgressReporter:
+    """처리한 파일 수 / 처리량(files/sec) / 남은 시간 출력"""
+
+    def __init__(self, total: int, skipped: int = 0):
+        self.total = total
+        self.skipped = skipped
+        self.done = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def throughput(self) -> float:
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    def update(self, name: str, error: Optional[str] = None) -> str:
+        """한 파일 완료 - 진행 상황 한 줄 반환"""
+        self.done += 1
+        if error is not None:
+            self.failed += 1
+
+        remaining = self.total - self.done
+        eta = remaining / self.throughput if self.throughput > 0 else 0.0
+        return (f"[{self.skipped + self.done}/{self.skipped + self.total}] {name} "
+                f"({self.throughput:.2f} files/s, 남은 시간 {eta:.0f}초)")
+
+    def summary(self) -> str:
+        return (f"{self.done}개 처리 ({self.failed}개 실패), 이전 실행에서 완료 {self.skipped}개 건너뜀 - "
+                f"{self.elapsed:.1f}초, {self.throughput:.2f} files/s")
@@ -0,0 +1,294 @@
+"""
+음성 특징 추출 마이크로벤치마크
+extract_audio_features.extract_mfcc_features 와 unused_lstm의 AudioFeatureExtractor가
+데이터셋 생성의 CPU 병목이므로, 특징 계열별 시간과 파일 처리량, 최대 메모리를 측정
+
+- 합성 음성(말소리 비슷한 신호) 15/45/60/120초로 재현 가능한 입력 생성 (시드 고정)
+- 계열별(디코딩, MFCC, pitch(piptrack 루프 / 벡터화 / YIN), RMS, ZCR, spectral, tempo, split 휴지) 시간 측정
+- 전체 추출 함수의 files/sec, tracemalloc 최대 메모리
+- 결과를 JSON으로 저장하고 --compare로 이전 결과와 비교
+"""
+
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import librosa
+import numpy as np
+
+# 벤치마크 대상 모듈
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "unused_lstm"))
+
+from audio_analysis import AudioAnalysis  # noqa: E402
+from extract_audio_features import extract_mfcc_features  # noqa: E402
+from audio_feature_extraction import AudioFeatureExtractor  # noqa: E402
+
+SAMPLE_RATE = 16000
+DEFAULT_DURATIONS = [15, 45, 60, 120]
+
+
+def synthetic_speech(seconds: float, sr: int = SAMPLE_RATE, seed: int = 0) -> np.ndarray:
+    """
+    말소리 비슷한 합성 신호
+    - 천천히 변하는 기본 주파수(100-220Hz)의 배음 + 두 개의 formant 강조
+    - 음절(약 4Hz) 단위 진폭 변화, 0.3-1.2초 휴지, 약한 배경 잡음
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sr)
+    t = np.arange(n) / sr
+
+    # 기본 주파수 윤곽 (억양)
+    knots = rng.uniform(100, 220, size=int(seconds) + 2)
+    f0 = np.interp(t, np.arange(len(knots)), knots)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    voice = np.zeros(n)
+    for k in range(1, 9):
+        # 500Hz / 1500Hz 부근 배음을 강조 (formant)
+        gain = 1.0 / k + 0.6 * np.exp(-((k * f0 - 500) / 200) ** 2) + 0.4 * np.exp(-((k * f0 - 1500) / 300) ** 2)
+        voice += gain * np.sin(k * phase)
+
+    # 음절 단위 진폭
+    syllable_rate = rng.uniform(3.5, 5.0)
+    envelope = np.clip(np.sin(2 * np.pi * syllable_rate * t + rng.uniform(0, np.pi)), 0, None) ** 0.5
+
+    # 발화 구간 / 휴지
+    speaking = np.zeros(n)
+    pos = 0.0
+    while pos < seconds:
+        run = rng.uniform(1.5, 5.0)
+        start, end = int(pos * sr), int(min(seconds, pos + run) * sr)
+        speaking[start:end] = 1.0
+        pos += run + rng.uniform(0.3, 1.2)
+
+    y = 0.1 * voice * envelope * speaking + 0.003 * rng.standard_normal(n)
+    return (y / max(1e-9, np.max(np.abs(y))) * 0.8).astype(np.float32)
+
+
+def write_wav(path: Path, y: np.ndarray, sr: int = SAMPLE_RATE):
+    pcm = (np.clip(y, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sr)
+        writer.writeframes(pcm.tobytes())
+
+
+# -------------------------------------------------------------------------
+# 특징 계열 (현재 추출 코드와 같은 librosa 호출)
+# -------------------------------------------------------------------------
+
+def _piptrack_pitch(y, sr):
+    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+    pitch_values = []
+    for t in range(pitches.shape[1]):
+        index = magnitudes[:, t].argmax()
+        pitch = pitches[index, t]
+        if pitch > 0:
+            pitch_values.append(pitch)
+    return pitch_values
+
+
+def _spectral(y, sr):
+    librosa.feature.spectral_centroid(y=y, sr=sr)
+    librosa.feature.spectral_rolloff(y=y, sr=sr)
+    librosa.feature.spectral_contrast(y=y, sr=sr)
+    librosa.feature.chroma_stft(y=y, sr=sr)
+    S = np.abs(librosa.stft(y))
+    return np.mean(np.diff(S, axis=1))
+
+
+def _mfcc(y, sr):
+    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+    librosa.feature.delta(mfcc)
+    librosa.feature.delta(mfcc, order=2)
+    return mfcc
+
+
+def _tempo(y, sr):
+    onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+    return librosa.beat.tempo(onset_envelope=onset_env, sr=sr)[0]
+
+
+FAMILIES: Dict[str, Callable[[np.ndarray, int], object]] = {
+    "mfcc": _mfcc,
+    "piptrack_pitch": _piptrack_pitch,
+    # audio_analysis의 pitch 경로 (STFT 포함, 벡터화된 bin 선택 / NumPy YIN)
+    "pitch_piptrack": lambda y, sr: AudioAnalysis(y, sr).pitch_values("piptrack"),
+    "pitch_yin": lambda y, sr: AudioAnalysis(y, sr).pitch_values("yin"),
+    "rms": lambda y, sr: librosa.feature.rms(y=y),
+    "zcr": lambda y, sr: librosa.feature.zero_crossing_rate(y),
+    "spectral": _spectral,
+    "tempo": _tempo,
+    "split_pauses": lambda y, sr: librosa.effects.split(y, top_db=30),
+}
+
+# 파일 단위 전체 추출 함수
+PIPELINES: Dict[str, Callable[[str], Dict]] = {
+    "extract_mfcc_features": lambda path: extract_mfcc_features(path, sr=SAMPLE_RATE),
+    "AudioFeatureExtractor.extract_all_features": lambda path: AudioFeatureExtractor(SAMPLE_RATE).extract_all_features(path),
+}
+
+
+def measure(fn: Callable[[], object], repeats: int) -> Dict[str, float]:
+    """
+    repeats번 실행한 시간(최소/중앙값)과 tracemalloc 최대 메모리
+
+    시간은 tracemalloc을 끈 상태에서 측정 (추적 비용이 시간에 섞이지 않도록)
+    """
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "min_seconds": round(min(times), 6),
+        "median_seconds": round(float(np.median(times)), 6),
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+        "librosa": librosa.__version__,
+    }
+
+
+def run_benchmark(
+    durations: List[float],
+    repeats: int = 3,
+    families: List[str] = None,
+    pipelines: bool = True
+) -> Dict:
+    """
+    Args:
+        durations: 합성 음성 길이 목록 (초)
+        repeats: 측정 반복 횟수
+        families: 측정할 특징 계열 (None이면 전체)
+        pipelines: 전체 추출 함수(files/sec)도 측정
+    """
+    families = families or list(FAMILIES)
+    results = {"environment": environment(), "repeats": repeats, "durations": {}}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # librosa 지연 import / 캐시 초기화 비용 제외
+        warm = synthetic_speech(2.0)
+        write_wav(Path(tmp_dir) / "warmup.wav", warm)
+        librosa.load(str(Path(tmp_dir) / "warmup.wav"), sr=SAMPLE_RATE)
+        for name in families:
+            FAMILIES[name](warm, SAMPLE_RATE)
+
+        for seconds in durations:
+            print(f"\n🎤 {seconds:g}초 합성 음성")
+            y = synthetic_speech(seconds, seed=int(seconds))
+            wav_path = Path(tmp_dir) / f"synthetic_{seconds:g}s.wav"
+            write_wav(wav_path, y)
+
+            entry = {"families": {}, "pipelines": {}}
+
+            entry["families"]["load"] = measure(lambda: librosa.load(str(wav_path), sr=SAMPLE_RATE), repeats)
+            for name in families:
+                entry["families"][name] = measure(lambda name=name: FAMILIES[name](y, SAMPLE_RATE), repeats)
+
+            for name, result in entry["families"].items():
+                print(f"  {name:24s} {result['median_seconds'] * 1000:9.1f} ms   peak {result['peak_memory_mb']:7.1f} MB")
+
+            if pipelines:
+                for name, pipeline in PIPELINES.items():
+                    result = measure(lambda pipeline=pipeline: pipeline(str(wav_path)), repeats)
+                    result["files_per_second"] = round(1.0 / result["median_seconds"], 3)
+                    entry["pipelines"][name] = result
+                    print(f"  {name:44s} {result['files_per_second']:7.2f} files/s   "
+                          f"peak {result['peak_memory_mb']:7.1f} MB")
+
+            results["durations"][f"{seconds:g}"] = entry
+
+    return results
+
+
+def compare(baseline: Dict, current: Dict):
+    """이전 결과 대비 중앙값 시간 비율 (>1이면 빨라짐)"""
+    print("\n📊 이전 결과 대비 속도 (baseline / current)")
+    print(f"   baseline: {baseline['environment'].get('git_commit')} ({baseline['environment']['timestamp']})")
+    for seconds, entry in current["durations"].items():
+        old_entry = baseline["durations"].get(seconds)
+        if old_entry is None:
+            continue
+        print(f"\n  {seconds}초")
+        for group in ("families", "pipelines"):
+            for name, result in entry[group].items():
+                old = old_entry.get(group, {}).get(name)
+                if old is None:
+                    continue
+                speedup = old["median_seconds"] / result["median_seconds"] if result["median_seconds"] else float("inf")
+                print(f"    {name:44s} x{speedup:6.2f}   "
+                      f"메모리 {old['peak_memory_mb']:.1f} → {result['peak_memory_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='음성 특징 추출 마이크로벤치마크')
+    parser.add_argument('--durations', type=float, nargs='+', default=DEFAULT_DURATIONS,
+                        help='합성 음성 길이 (초)')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='측정 반복 횟수')
+    parser.add_argument('--families', type=str, nargs='+', choices=list(FAMILIES), default=None,
+                        help='측정할 특징 계열 (기본: 전체)')
+    parser.add_argument('--skip_pipelines', action='store_true',
+                        help='전체 추출 함수 측정 생략')
+    parser.add_argument('--output', type=str, default='feature_benchmark.json',
+                        help='결과 JSON 파일')
+    parser.add_argument('--compare', type=str, default=None,
+                        help='비교할 이전 결과 JSON')
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️  음성 특징 추출 벤치마크")
+    print("=" * 60)
+
+    results = run_benchmark(
+        durations=args.durations,
+        repeats=args.repeats,
+        families=args.families,
+        pipelines=not args.skip_pipelines
+    )
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), results)
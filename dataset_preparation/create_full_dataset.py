@@ -7,9 +7,11 @@ import argparse
 import json
 from pathlib import Path
 import sys
+from typing import Optional
 
-# 상위 폴더를 import path에 추가
-sys.path.append(str(Path(__file__).parent))
+# 음성 특징 추출 / 음성 모델 학습 모듈 (unused_lstm)을 import path에 추가
+sys.path.append(str(Path(__file__).resolve().parent))
+sys.path.append(str(Path(__file__).resolve().parent.parent / "unused_lstm"))
 
 from audio_feature_extraction import process_audio_dataset, create_feature_summary
 from train_audio_model import train_audio_model
@@ -23,7 +25,9 @@ def create_full_dataset(
     train_audio_model_flag: bool = True,
     prepare_llm_data: bool = True,
     audio_model_epochs: int = 100,
-    llm_format: str = "huggingface"
+    llm_format: str = "huggingface",
+    workers: int = 1,
+    cache_dir: Optional[str] = None
 ):
     """
     전체 데이터셋 준비 파이프라인
@@ -36,6 +40,8 @@ def create_full_dataset(
         prepare_llm_data: LLM 데이터 준비 여부
         audio_model_epochs: 음성 모델 학습 에포크
         llm_format: LLM 데이터 형식 (openai/huggingface/gemini)
+        workers: 음성 특징 추출 프로세스 수
+        cache_dir: 파일별 음성 특징 캐시 (None이면 output_dir/feature_cache)
     """
 
     output_path = Path(output_dir)
@@ -57,23 +63,27 @@ def create_full_dataset(
     print("-" * 80)
 
     audio_features_path = output_path / "audio_features.jsonl"
+    # 학습 / 통계는 컬럼형 저장소(memmap)에서 읽음 - JSONL은 추출 재개용 기록
+    feature_store_dir = output_path / "audio_features"
+
+    # 매번 전체 목록으로 다시 만들되, 내용과 추출 설정이 그대로인 파일은 캐시에서 읽음
+    # (새 녹음 / 바뀐 녹음만 추출, n_mfcc 등 설정이 바뀌면 해당 특징만 다시 계산)
+    cache_dir = cache_dir or str(output_path / "feature_cache")
+    print(f"🎤 음성 파일 처리 시작... (특징 캐시: {cache_dir})")
+
+    process_audio_dataset(
+        audio_dir=audio_dir,
+        csv_path=csv_path,
+        output_path=str(audio_features_path),
+        workers=workers,
+        cache_dir=cache_dir,
+        resume=False,
+        store_dir=str(feature_store_dir)
+    )
 
-    if not audio_features_path.exists():
-        print("🎤 음성 파일 처리 시작...")
-
-        results = process_audio_dataset(
-            audio_dir=audio_dir,
-            csv_path=csv_path,
-            output_path=str(audio_features_path)
-        )
-
-        print()
-        create_feature_summary(str(audio_features_path))
-        print()
-    else:
-        print(f"✅ 음성 특징 파일이 이미 존재합니다: {audio_features_path}")
-        print("   (삭제 후 다시 실행하면 재생성됩니다)")
-        print()
+    print()
+    create_feature_summary(str(feature_store_dir))
+    print()
 
     # ===================================================================
     # 2단계: 음성 모델 학습 (선택)
@@ -88,7 +98,7 @@ def create_full_dataset(
             print("🧠 LSTM 모델 학습 시작...")
 
             train_audio_model(
-                jsonl_path=str(audio_features_path),
+                jsonl_path=str(feature_store_dir),
                 output_dir=str(audio_model_dir),
                 epochs=audio_model_epochs,
                 batch_size=32,
@@ -141,7 +151,8 @@ def create_full_dataset(
     print("=" * 80)
     print()
     print("📁 생성된 파일:")
-    print(f"   1. 음성 특징: {audio_features_path}")
+    print(f"   1. 음성 특징: {feature_store_dir}/ (features.npy, labels.npy, metadata.csv, schema.json)")
+    print(f"      - 추출 기록: {audio_features_path}")
 
     if train_audio_model_flag:
         audio_model_dir = output_path / "audio_model"
@@ -161,7 +172,7 @@ def create_full_dataset(
         print("   ✅ 음성 모델 학습 완료 - 바로 사용 가능!")
     else:
         print("   ➡️  음성 모델 학습:")
-        print(f"      python train_audio_model.py --data {audio_features_path}")
+        print(f"      python train_audio_model.py --data {feature_store_dir}")
 
     if prepare_llm_data:
         print()
@@ -233,6 +244,12 @@ def main():
     parser.add_argument('--no_llm_data', action='store_true',
                         help='LLM 데이터 준비 건너뛰기')
 
+    # 음성 특징 추출 옵션
+    parser.add_argument('--workers', type=int, default=1,
+                        help='음성 특징 추출 프로세스 수 (기본: 1)')
+    parser.add_argument('--cache_dir', type=str, default=None,
+                        help='파일별 음성 특징 캐시 (기본: <output_dir>/feature_cache)')
+
     # 특수 모드
     parser.add_argument('--only_llm_data', action='store_true',
                         help='LLM 데이터만 준비 (음성 처리 건너뛰기)')
@@ -274,7 +291,9 @@ def main():
             train_audio_model_flag=args.train_audio_model and not args.no_train_audio,
             prepare_llm_data=not args.no_llm_data,
             audio_model_epochs=args.audio_epochs,
-            llm_format=args.llm_format
+            llm_format=args.llm_format,
+            workers=args.workers,
+            cache_dir=args.cache_dir
         )
 
 
@@ -7,45 +7,63 @@ import librosa
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List
+from functools import partial
+from typing import Dict, List, Optional, Union
 import json
 
+from audio_analysis import AudioAnalysis, PITCH_METHODS
+from batch_processing import ProgressReporter, default_workers, iter_parallel, read_jsonl_records
+from feature_cache import DEFAULT_MAX_SIZE_MB, FeatureCache, file_sha256
+from filename_index import FilenameIndex, MatchReport
 
-def extract_mfcc_features(audio_path: str, sr: int = 16000, n_mfcc: int = 13) -> Dict:
+# 추출 결과가 달라지는 변경을 하면 올려서 캐시된 특징을 무효화
+FEATURE_VERSION = "1"
+
+
+def extract_mfcc_features(
+    audio_path: Union[str, AudioAnalysis],
+    sr: int = 16000,
+    n_mfcc: int = 13,
+    pitch_method: str = "piptrack",
+    cache: Optional[FeatureCache] = None
+) -> Dict:
     """
     음성 파일에서 MFCC 및 주요 특징 추출
 
     Args:
-        audio_path: WAV 파일 경로
+        audio_path: WAV 파일 경로 (또는 이미 디코딩한 AudioAnalysis)
         sr: 샘플링 레이트
         n_mfcc: MFCC 계수 개수
+        pitch_method: pitch 추정 방법 ("piptrack" 또는 "yin", audio_analysis.PITCH_METHODS)
+        cache: 파일별 특징 캐시 (파일 경로로 호출할 때만 사용)
 
     Returns:
         음성 특징 딕셔너리
     """
 
-    # 오디오 로드
-    y, sr = librosa.load(audio_path, sr=sr)
+    if cache is not None and not isinstance(audio_path, AudioAnalysis):
+        return cache.get_or_compute(
+            audio_path, "extract_mfcc_features", FEATURE_VERSION,
+            {'sr': sr, 'n_mfcc': n_mfcc, 'pitch_method': pitch_method},
+            lambda: extract_mfcc_features(audio_path, sr, n_mfcc, pitch_method)
+        )
+
+    # 오디오 로드 (디코딩 / STFT / mel 스펙트로그램은 한 번만 계산해 공유)
+    analysis = audio_path if isinstance(audio_path, AudioAnalysis) else AudioAnalysis.from_file(audio_path, sr)
+    y, sr = analysis.y, analysis.sr
 
     # 1. MFCC 추출
-    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
+    mfcc = librosa.feature.mfcc(S=analysis.log_mel, n_mfcc=n_mfcc)
     mfcc_mean = np.mean(mfcc, axis=1)
     mfcc_std = np.std(mfcc, axis=1)
 
     # 2. Pitch (F0) 추출
-    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-    pitch_values = []
-    for t in range(pitches.shape[1]):
-        index = magnitudes[:, t].argmax()
-        pitch = pitches[index, t]
-        if pitch > 0:
-            pitch_values.append(pitch)
-
-    pitch_mean = np.mean(pitch_values) if pitch_values else 0
-    pitch_std = np.std(pitch_values) if pitch_values else 0
+    pitch_values = analysis.pitch_values(pitch_method)
+    pitch_mean = np.mean(pitch_values) if len(pitch_values) else 0
+    pitch_std = np.std(pitch_values) if len(pitch_values) else 0
 
     # 3. Energy (RMS)
-    energy = librosa.feature.rms(y=y)[0]
+    energy = analysis.rms
     energy_mean = float(np.mean(energy))
     energy_std = float(np.std(energy))
 
@@ -54,18 +72,18 @@ def extract_mfcc_features(audio_path: str, sr: int = 16000, n_mfcc: int = 13) ->
     zcr_mean = float(np.mean(zcr))
 
     # 5. Spectral Centroid (음색)
-    spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
+    spectral_centroid = librosa.feature.spectral_centroid(S=analysis.magnitude, sr=sr)[0]
     spectral_centroid_mean = float(np.mean(spectral_centroid))
 
     # 6. Tempo (말하기 속도)
-    onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+    onset_env = librosa.onset.onset_strength(S=analysis.log_mel, sr=sr)
     tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr)[0]
 
     # 7. 음성 길이
-    duration = float(librosa.get_duration(y=y, sr=sr))
+    duration = analysis.duration
 
     # 8. 무음 구간 탐지 (휴지)
-    intervals = librosa.effects.split(y, top_db=30)
+    intervals = analysis.nonsilent_intervals(top_db=30)
     num_pauses = len(intervals) - 1
 
     pauses = []
@@ -154,18 +172,66 @@ def create_text_summary(features: Dict) -> str:
     return summary
 
 
+def extractor_settings(sr: int = 16000, n_mfcc: int = 13, pitch_method: str = "piptrack") -> Dict:
+    """특징 추출 설정 (기록이 현재 설정으로 추출한 것인지 비교할 때 사용)"""
+    return {'sr': sr, 'n_mfcc': n_mfcc, 'pitch_method': pitch_method, 'version': FEATURE_VERSION}
+
+
+def _record_settings(record: Dict) -> Dict:
+    """기록의 추출 설정 (설정을 기록하기 전의 기록은 pitch 방법만 있음 - 나머지는 당시 기본값)"""
+    return record.get('extractor_settings') or extractor_settings(pitch_method=record.get('pitch_method', 'piptrack'))
+
+
+def load_partial_results(progress_path: Path, settings: Dict, hashes: Dict[str, str]) -> Dict[str, Dict]:
+    """
+    이전 실행에서 파일별로 기록한 특징 (파일명 → 특징)
+
+    다음 기록은 다시 추출하도록 제외하고 파일에서도 지움
+    - 추출 설정(버전 포함)이 다름
+    - 음성 내용이 바뀜 (hashes: 현재 파일명 → sha256, 같은 이름으로 다시 녹음한 경우)
+    """
+    records = read_jsonl_records(progress_path)
+    kept = [
+        record for record in records
+        if isinstance(record, dict) and 'audio_file' in record and 'features' in record
+        and _record_settings(record) == settings
+        and record.get('audio_sha256') == hashes.get(record['audio_file'])
+    ]
+
+    if len(kept) < len(records):
+        print(f"♻️  추출 설정이 다르거나 음성이 바뀐 기록 {len(records) - len(kept)}개는 다시 추출 ({progress_path})")
+        with open(progress_path, 'w', encoding='utf-8') as f:
+            for record in kept:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    return {record['audio_file']: record['features'] for record in kept}
+
+
 def process_audio_files_to_csv(
     audio_dir: str,
     csv_path: str,
-    output_csv: str = "feedback_with_features.csv"
+    output_csv: str = "feedback_with_features.csv",
+    pitch_method: str = "piptrack",
+    workers: int = 1,
+    chunksize: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    cache_max_size_mb: float = DEFAULT_MAX_SIZE_MB
 ):
     """
     음성 파일들의 특징을 추출하여 CSV에 추가
 
+    파일별 특징은 끝나는 대로 `<output_csv 이름>.partial.jsonl`에 추가 기록하고,
+    다시 실행하면 같은 내용 / 같은 추출 설정으로 기록된 파일은 건너뜀 (중단되어도 처리한 만큼은 유지)
+
     Args:
         audio_dir: WAV 파일 디렉토리
         csv_path: 기존 피드백 CSV
         output_csv: 출력 CSV 파일
+        pitch_method: pitch 추정 방법 ("piptrack" 또는 "yin")
+        workers: 특징 추출 프로세스 수 (1이면 순차 처리)
+        chunksize: 워커에 한 번에 넘길 파일 수 (None이면 자동)
+        cache_dir: 파일별 특징 캐시 디렉토리 (None이면 캐시 사용 안 함)
+        cache_max_size_mb: 캐시 최대 크기 (넘으면 오래 쓰지 않은 항목부터 삭제)
     """
 
     print("=" * 60)
@@ -178,8 +244,50 @@ def process_audio_files_to_csv(
     print(f"📊 기존 CSV 로드: {len(df)}개 행")
 
     # 음성 파일 목록
-    audio_files = list(Path(audio_dir).glob("*.wav"))
+    audio_files = sorted(Path(audio_dir).glob("*.wav"))
     print(f"🎵 WAV 파일: {len(audio_files)}개")
+
+    # 이전 실행 결과 (재개)
+    progress_path = Path(output_csv).with_suffix('.partial.jsonl')
+    settings = extractor_settings(pitch_method=pitch_method)
+    hashes = {audio_file.name: file_sha256(str(audio_file)) for audio_file in audio_files}
+    extracted = load_partial_results(progress_path, settings, hashes)
+    pending = [audio_file for audio_file in audio_files if audio_file.name not in extracted]
+    if extracted:
+        print(f"♻️  이전 실행에서 추출한 파일 {len(audio_files) - len(pending)}개 건너뜀 ({progress_path})")
+    print(f"⚙️  워커 {workers}개로 {len(pending)}개 파일 처리")
+    print()
+
+    # 특징 추출 (끝나는 순서대로 기록)
+    progress = ProgressReporter(total=len(pending), skipped=len(audio_files) - len(pending))
+    cache = FeatureCache(cache_dir, cache_max_size_mb) if cache_dir else None
+    extract = partial(extract_mfcc_features, pitch_method=pitch_method, cache=cache)
+
+    with open(progress_path, 'a', encoding='utf-8') as log:
+        for audio_path, features, error in iter_parallel(extract, map(str, pending), workers, chunksize):
+            name = Path(audio_path).name
+            print(progress.update(name, error))
+
+            if error is not None:
+                print(f"   ❌ 오류: {error}")
+                continue
+
+            extracted[name] = features
+            record = {
+                'audio_file': name,
+                'audio_sha256': hashes[name],
+                'extractor_settings': settings,
+                'features': features
+            }
+            log.write(json.dumps(record, ensure_ascii=False) + '\n')
+            log.flush()
+
+    print()
+    print(f"⏱️  {progress.summary()}")
+    if cache is not None:
+        evicted = cache.evict()
+        if evicted:
+            print(f"🧹 특징 캐시 {evicted}개 항목 삭제 (최대 {cache_max_size_mb:g}MB)")
     print()
 
     # 새 컬럼들 준비
@@ -194,49 +302,39 @@ def process_audio_files_to_csv(
         if col not in df.columns:
             df[col] = None
 
-    # 각 음성 파일 처리
+    # 파일명으로 CSV 매칭 (정규화한 이름 인덱스는 한 번만 생성)
+    index = FilenameIndex.from_dataframe(df)
+    report = MatchReport()
     matched_count = 0
 
-    for i, audio_file in enumerate(audio_files):
-        print(f"[{i+1}/{len(audio_files)}] {audio_file.name}")
-
-        try:
-            # 특징 추출
-            features = extract_mfcc_features(str(audio_file))
-
-            # 텍스트 요약 생성
-            text_summary = create_text_summary(features)
-
-            # 파일명으로 CSV 매칭
-            file_id = audio_file.stem
-            matching_rows = df[df['파일 이름'].str.contains(file_id, na=False)]
-
-            if not matching_rows.empty:
-                idx = matching_rows.index[0]
-
-                # CSV에 특징 추가
-                df.at[idx, 'audio_duration'] = features['duration']
-                df.at[idx, 'pitch_mean'] = features['pitch_mean']
-                df.at[idx, 'pitch_std'] = features['pitch_std']
-                df.at[idx, 'energy_mean'] = features['energy_mean']
-                df.at[idx, 'num_pauses'] = features['num_pauses']
-                df.at[idx, 'pause_mean'] = features['pause_mean']
-                df.at[idx, 'speech_rate'] = features['speech_rate']
-                df.at[idx, 'audio_summary'] = text_summary
-
-                matched_count += 1
-                print(f"   ✅ 매칭됨: {df.at[idx, '파일 이름']}")
-                print(f"   길이: {features['duration']:.1f}초, "
-                      f"Pitch: {features['pitch_mean']:.1f}Hz, "
-                      f"휴지: {features['num_pauses']}회")
-            else:
-                print(f"   ⚠️  CSV에서 매칭 실패: {file_id}")
-
-        except Exception as e:
-            print(f"   ❌ 오류: {e}")
+    for audio_file in audio_files:
+        features = extracted.get(audio_file.name)
+        if features is None:
             continue
 
-        print()
+        # 텍스트 요약 생성
+        text_summary = create_text_summary(features)
+
+        match = index.match(audio_file.stem)
+        report.record(audio_file.name, match, index)
+
+        if match.row is not None:
+            idx = match.row
+
+            # CSV에 특징 추가
+            df.at[idx, 'audio_duration'] = features['duration']
+            df.at[idx, 'pitch_mean'] = features['pitch_mean']
+            df.at[idx, 'pitch_std'] = features['pitch_std']
+            df.at[idx, 'energy_mean'] = features['energy_mean']
+            df.at[idx, 'num_pauses'] = features['num_pauses']
+            df.at[idx, 'pause_mean'] = features['pause_mean']
+            df.at[idx, 'speech_rate'] = features['speech_rate']
+            df.at[idx, 'audio_summary'] = text_summary
+
+            matched_count += 1
+
+    report.print_report()
+    print()
 
     # CSV 저장
     df.to_csv(output_csv, index=False, encoding='utf-8-sig')
@@ -269,6 +367,16 @@ if __name__ == "__main__":
                         help='기존 피드백 CSV')
     parser.add_argument('--output', type=str, default='feedback_with_features.csv',
                         help='출력 CSV 파일')
+    parser.add_argument('--pitch_method', type=str, choices=PITCH_METHODS, default='piptrack',
+                        help='pitch 추정 방법 (yin: 더 빠르고 말소리 대역에서 안정적)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f'특징 추출 프로세스 수 (이 머신의 코어 수: {default_workers()})')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='워커에 한 번에 넘길 파일 수 (기본: 자동)')
+    parser.add_argument('--cache_dir', type=str, default=None,
+                        help='파일별 특징 캐시 디렉토리 (같은 음성 + 같은 설정이면 다시 추출하지 않음)')
+    parser.add_argument('--cache_max_mb', type=float, default=DEFAULT_MAX_SIZE_MB,
+                        help=f'특징 캐시 최대 크기 MB (기본: {DEFAULT_MAX_SIZE_MB})')
 
     args = parser.parse_args()
 
@@ -284,7 +392,12 @@ if __name__ == "__main__":
     output_csv = process_audio_files_to_csv(
         audio_dir=args.audio_dir,
         csv_path=args.csv,
-        output_csv=args.output
+        output_csv=args.output,
+        pitch_method=args.pitch_method,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        cache_dir=args.cache_dir,
+        cache_max_size_mb=args.cache_max_mb
     )
 
     print("\n다음 단계:")
@@ -0,0 +1,115 @@
+"""
+파일별 음성 특징 캐시
+같은 음성 + 같은 추출 설정이면 특징을 다시 계산하지 않음
+
+키: (음성 파일 내용 sha256, 추출기 이름, 추출기 버전, 파라미터 - 샘플링 레이트 포함)
+- 파일 이름이 같아도 내용이 바뀌면 다시 추출
+- n_mfcc, pitch 방법 등 파라미터나 추출 코드 버전이 바뀌면 다시 추출
+- 항목마다 JSON 파일 하나 (쓰기는 임시 파일 + rename이라 여러 프로세스가 동시에 써도 안전)
+- evict(): 전체 크기가 max_size_mb를 넘으면 가장 오래 쓰지 않은 항목부터 삭제
+
+extract_audio_features.py와 unused_lstm/audio_feature_extraction.py가 함께 사용
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+DEFAULT_MAX_SIZE_MB = 512
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """Persistent per-file feature cache with LRU size-based eviction."""
+
+    def __init__(self, cache_dir: str, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, audio_path: str, extractor: str, version: str, params: Dict) -> str:
+        identity = {
+            'audio_sha256': file_sha256(audio_path),
+            'extractor': extractor,
+            'version': version,
+            'params': params,
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                features = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        # 최근 사용 시각 갱신 (evict 순서)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return features
+
+    def put(self, key: str, features: Dict):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(features, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def get_or_compute(
+        self,
+        audio_path: str,
+        extractor: str,
+        version: str,
+        params: Dict,
+        compute: Callable[[], Dict]
+    ) -> Dict:
+        """캐시에 있으면 그대로, 없으면 compute()로 추출해 저장"""
+        key = self.key(audio_path, extractor, version, params)
+        features = self.get(key)
+        if features is None:
+            features = compute()
+            self.put(key, features)
+        return features
+
+    def evict(self) -> int:
+        """전체 크기가 max_size_mb 이하가 될 때까지 오래 쓰지 않은 항목부터 삭제, 삭제한 개수 반환"""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,179 @@
+"""
+컬럼형 음성 특징 저장소 (audio_features.jsonl 대신 학습 / 통계에 사용)
+
+디렉토리 구성:
+    schema.json     컬럼 스키마 (특징 / 레이블 컬럼 이름과 순서, 행 수)
+    features.npy    (행 수, 특징 수) float32 행렬
+    labels.npy      (행 수, 레이블 수) float32 행렬 (숫자가 아닌 점수는 NaN)
+    metadata.csv    파일 이름, 대본, 피드백 등 문자열 컬럼
+
+- np.load(mmap_mode='r')로 열기 때문에 전체를 메모리에 올리거나 JSON을 파싱하지 않음
+- 특징 컬럼 순서는 flatten_features와 같음 (리스트 값은 key_0, key_1, ...)
+  - 학습과 서빙이 같은 순서의 특징 벡터를 사용
+- process_audio_dataset의 JSONL은 중단 후 재개용 기록으로 두고, 끝나면 build_feature_store로 변환
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_VERSION = 1
+
+LABEL_COLUMNS = (
+    "pronunciation_score", "fluency_score", "content_score", "grammar_score", "total_score"
+)
+METADATA_COLUMNS = ("audio_file", "file_id", "transcript", "feedback")
+
+
+def flatten_features(features: Dict) -> Tuple[List[str], List[float]]:
+    """
+    특징 딕셔너리 → (컬럼 이름, 값) - 리스트는 펼치고 숫자가 아닌 값은 제외
+    (기존 학습 / 서빙 코드의 특징 벡터와 같은 순서)
+    """
+    names, values = [], []
+    for key, value in features.items():
+        if isinstance(value, list):
+            names.extend(f"{key}_{i}" for i in range(len(value)))
+            values.extend(value)
+        elif isinstance(value, (int, float)):
+            names.append(key)
+            values.append(value)
+    return names, values
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _iter_jsonl(jsonl_path: Path) -> Iterator[Dict]:
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def build_feature_store(jsonl_path: str, store_dir: str) -> "FeatureStore":
+    """
+    process_audio_dataset의 JSONL → 컬럼형 저장소
+
+    JSONL을 두 번 순차로 읽어(행 수 / 스키마 확인 → 채우기) 한 줄씩 memmap에 기록하므로
+    데이터셋 크기와 관계없이 메모리는 한 행 분량만 사용
+
+    Raises:
+        ValueError: 파일마다 특징 컬럼이 다름 (추출 설정이 섞인 JSONL)
+    """
+    jsonl_path = Path(jsonl_path)
+    store_dir = Path(store_dir)
+
+    # 1차: 행 수와 특징 스키마
+    n_rows = 0
+    feature_columns: Optional[List[str]] = None
+    for record in _iter_jsonl(jsonl_path):
+        names, _ = flatten_features(record['audio_features'])
+        if feature_columns is None:
+            feature_columns = names
+        elif names != feature_columns:
+            raise ValueError(
+                f"Feature columns of {record.get('audio_file')} differ from the first record "
+                f"({len(names)} vs {len(feature_columns)} columns)"
+            )
+        n_rows += 1
+    feature_columns = feature_columns or []
+
+    # 다 쓴 뒤에 교체 (쓰는 중에 실패해도 기존 저장소 유지)
+    tmp_dir = store_dir.with_name(store_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    features = np.lib.format.open_memmap(
+        tmp_dir / "features.npy", mode='w+', dtype=np.float32, shape=(n_rows, len(feature_columns))
+    )
+    labels = np.lib.format.open_memmap(
+        tmp_dir / "labels.npy", mode='w+', dtype=np.float32, shape=(n_rows, len(LABEL_COLUMNS))
+    )
+    metadata = {column: [] for column in METADATA_COLUMNS}
+
+    # 2차: 행 채우기
+    for i, record in enumerate(_iter_jsonl(jsonl_path)):
+        _, values = flatten_features(record['audio_features'])
+        features[i] = values
+
+        ground_truth = record.get('ground_truth', {})
+        labels[i] = [_to_float(ground_truth.get(column)) for column in LABEL_COLUMNS]
+
+        metadata['audio_file'].append(record.get('audio_file', ''))
+        metadata['file_id'].append(record.get('file_id', ''))
+        metadata['transcript'].append(ground_truth.get('transcript', ''))
+        metadata['feedback'].append(ground_truth.get('feedback', ''))
+
+    features.flush()
+    labels.flush()
+    del features, labels
+
+    pd.DataFrame(metadata).to_csv(tmp_dir / "metadata.csv", index=False, encoding='utf-8')
+
+    schema = {
+        'version': SCHEMA_VERSION,
+        'rows': n_rows,
+        'feature_columns': feature_columns,
+        'label_columns': list(LABEL_COLUMNS),
+        'metadata_columns': list(METADATA_COLUMNS),
+        'source': jsonl_path.name,
+    }
+    (tmp_dir / "schema.json").write_text(json.dumps(schema, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    tmp_dir.rename(store_dir)
+    return FeatureStore(store_dir)
+
+
+class FeatureStore:
+    """Read-only, memory-mapped view of a columnar feature store."""
+
+    def __init__(self, store_dir: str):
+        self.store_dir = Path(store_dir)
+        schema_path = self.store_dir / "schema.json"
+        if not schema_path.exists():
+            raise FileNotFoundError(f"Not a feature store (missing schema.json): {self.store_dir}")
+
+        self.schema = json.loads(schema_path.read_text(encoding='utf-8'))
+        if self.schema.get('version') != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported feature store version: {self.schema.get('version')}")
+
+        self.feature_columns: List[str] = self.schema['feature_columns']
+        self.label_columns: List[str] = self.schema['label_columns']
+
+        # 복사 없이 파일을 그대로 매핑
+        self.features: np.ndarray = np.load(self.store_dir / "features.npy", mmap_mode='r')
+        self.labels: np.ndarray = np.load(self.store_dir / "labels.npy", mmap_mode='r')
+        self._metadata: Optional[pd.DataFrame] = None
+
+    @staticmethod
+    def is_store(path: str) -> bool:
+        return (Path(path) / "schema.json").exists()
+
+    def __len__(self) -> int:
+        return self.features.shape[0]
+
+    @property
+    def metadata(self) -> pd.DataFrame:
+        """문자열 컬럼 (처음 접근할 때 읽음)"""
+        if self._metadata is None:
+            # 기록한 그대로 문자열로 읽음 ("001" 같은 file_id가 숫자로 바뀌지 않도록)
+            self._metadata = pd.read_csv(self.store_dir / "metadata.csv", dtype=str, keep_default_na=False)
+        return self._metadata
+
+    def feature(self, name: str) -> np.ndarray:
+        """특징 컬럼 하나 (memmap 뷰)"""
+        return self.features[:, self.feature_columns.index(name)]
+
+    def label(self, name: str) -> np.ndarray:
+        """레이블 컬럼 하나 (memmap 뷰)"""
+        return self.labels[:, self.label_columns.index(name)]
@@ -0,0 +1,125 @@
+"""
+음성 파일 ↔ 피드백 CSV '파일 이름' 매칭 인덱스
+CSV를 한 번만 훑어 정규화한 이름으로 인덱스를 만들고, 파일마다 dict 조회로 매칭
+
+정규화 (normalize_name):
+- 유니코드 NFC (macOS 파일명의 한글은 자모가 분리된 NFD로 저장됨)
+- 대소문자 무시, 확장자 제거
+- 공백 / _ / - / . 연속은 공백 하나로 ("Q2_apply_II_한지은" == "Q2 apply  II 한지은")
+
+매칭 규칙:
+1. 정규화한 이름이 같은 행
+2. 없으면 CSV 이름의 연속된 단어열로 포함되는 행 ("student_1" → "Q1 student_1")
+   - 단어 단위로만 비교하므로 "student_1"이 "student_10"에 매칭되지 않음
+- 후보가 여러 행이면 ambiguous로 보고하고 매칭하지 않음 (잘못된 행에 붙지 않도록)
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a", ".flac", ".ogg", ".webm")
+_SEPARATORS = re.compile(r"[\s_\-.]+")
+
+
+def normalize_name(name: str) -> str:
+    name = unicodedata.normalize("NFC", str(name)).strip().casefold()
+    for extension in AUDIO_EXTENSIONS:
+        if name.endswith(extension):
+            name = name[:-len(extension)]
+            break
+    return _SEPARATORS.sub(" ", name).strip()
+
+
+@dataclass(frozen=True)
+class FileMatch:
+    status: str                 # "matched" | "ambiguous" | "unmatched"
+    rows: Tuple[Hashable, ...]  # 후보 CSV 행 인덱스 (matched면 1개)
+
+    @property
+    def row(self) -> Optional[Hashable]:
+        return self.rows[0] if self.status == "matched" else None
+
+
+class FilenameIndex:
+    """Normalized-name index over the feedback CSV for O(1) file lookups."""
+
+    def __init__(self, names: Iterable[Tuple[Hashable, str]]):
+        """
+        Args:
+            names: (CSV 행 인덱스, '파일 이름' 값) 목록
+        """
+        self.names: Dict[Hashable, str] = {}
+        self._exact: Dict[str, List[Hashable]] = defaultdict(list)
+        self._phrases: Dict[str, List[Hashable]] = defaultdict(list)
+
+        for row, name in names:
+            if name is None or pd.isna(name):
+                continue
+            self.names[row] = str(name)
+            key = normalize_name(name)
+            if not key:
+                continue
+            self._exact[key].append(row)
+
+            # 연속된 단어열 전체 (이름은 단어 몇 개라 행당 항목 수가 작음)
+            words = key.split(" ")
+            for start in range(len(words)):
+                for end in range(start + 1, len(words) + 1):
+                    phrase = " ".join(words[start:end])
+                    rows = self._phrases[phrase]
+                    if not rows or rows[-1] != row:
+                        rows.append(row)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, column: str = "파일 이름") -> "FilenameIndex":
+        return cls(df[column].items())
+
+    def match(self, file_id: str) -> FileMatch:
+        """파일 이름 (또는 stem)에 해당하는 CSV 행"""
+        key = normalize_name(file_id)
+        rows = self._exact.get(key) or self._phrases.get(key) or []
+
+        if len(rows) == 1:
+            return FileMatch("matched", (rows[0],))
+        if rows:
+            return FileMatch("ambiguous", tuple(rows))
+        return FileMatch("unmatched", ())
+
+
+@dataclass
+class MatchReport:
+    """매칭되지 않은 파일 / 후보가 여러 개인 파일 목록"""
+    matched: int = 0
+    unmatched: List[str] = field(default_factory=list)
+    ambiguous: Dict[str, List[str]] = field(default_factory=dict)  # 파일 → 후보 '파일 이름'
+
+    def record(self, file_name: str, match: FileMatch, index: FilenameIndex):
+        if match.status == "matched":
+            self.matched += 1
+        elif match.status == "ambiguous":
+            self.ambiguous[file_name] = [index.names[row] for row in match.rows]
+        else:
+            self.unmatched.append(file_name)
+
+    def print_report(self, limit: int = 20):
+        print(f"🔗 CSV 매칭: {self.matched}개 매칭, "
+              f"{len(self.unmatched)}개 매칭 실패, {len(self.ambiguous)}개 후보 여러 개")
+
+        if self.unmatched:
+            print("   ⚠️  CSV에서 매칭 실패:")
+            for name in self.unmatched[:limit]:
+                print(f"      - {name}")
+            if len(self.unmatched) > limit:
+                print(f"      ... 외 {len(self.unmatched) - limit}개")
+
+        if self.ambiguous:
+            print("   ⚠️  후보가 여러 행이라 건너뜀 (CSV '파일 이름'을 구분되게 수정하세요):")
+            for name, candidates in list(self.ambiguous.items())[:limit]:
+                print(f"      - {name} → {', '.join(candidates)}")
+            if len(self.ambiguous) > limit:
+                print(f"      ... 외 {len(self.ambiguous) - limit}개")
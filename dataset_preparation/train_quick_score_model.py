@@ -0,0 +1,355 @@
+"""
+빠른 채점(/speech/quick-score) 모델 학습
+교사 평가 CSV(toefl_evaluations 형식) + WAV 파일 → 부트스트랩 ridge 회귀 앙상블(JSON)
+
+- 특징: backend/app/utils/speech_features.py (서버와 같은 코드로 계산)
+- 점수: 숫자로 된 루브릭 컬럼(내용, 문법/표현 등)이 있으면 사용하고,
+  교사 텍스트 피드백뿐인 컬럼은 total_score로 대신 학습
+- 앙상블 예측의 표준편차가 서버의 불확실성(QUICK_SCORE_MAX_UNCERTAINTY와 비교)이 됨
+"""
+
+import asyncio
+import io
+import json
+import sys
+import wave
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import librosa
+import numpy as np
+import pandas as pd
+
+# 서버와 같은 특징 추출 코드 사용
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.utils.speech_features import PRONUNCIATION_FEATURES, quick_score_features  # noqa: E402
+from filename_index import FilenameIndex, MatchReport  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+# 모델 출력 → CSV 점수 컬럼
+TARGET_COLUMNS = {
+    "fluency": "fluency",
+    "pronunciation": "발음",
+    "content": "내용",
+    "grammar": "문법/표현",
+}
+TOTAL_COLUMN = "total_score"
+
+# 컬럼 값의 이 비율 이상이 숫자일 때만 점수 컬럼으로 사용
+MIN_NUMERIC_RATIO = 0.8
+
+
+def load_wav_bytes(audio_path: Path) -> bytes:
+    """서버의 변환 결과와 같은 16kHz mono 16-bit PCM WAV로 읽기"""
+    y, _ = librosa.load(str(audio_path), sr=SAMPLE_RATE, mono=True)
+    pcm = (np.clip(y, -1.0, 1.0) * 32767).astype("<i2")
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(SAMPLE_RATE)
+        writer.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def transcribe_with_clova(wav_bytes: bytes) -> Optional[Dict]:
+    """CLOVA 인식 결과 (backend/.env 설정 사용), 실패 시 None"""
+    from app.services.clova_stt import FALLBACK_TEXT, transcribe_with_pronunciation_eval
+
+    stt, pron = asyncio.run(transcribe_with_pronunciation_eval(wav_bytes, language="Eng"))
+    if stt.text == FALLBACK_TEXT:
+        return None
+    return {
+        "text": stt.text,
+        "stt_confidence": stt.confidence,
+        "pron_overall": pron.overall,
+        "pron_fluency": pron.fluency,
+    }
+
+
+def numeric_targets(df: pd.DataFrame) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    """
+    루브릭별 학습 점수
+
+    Returns:
+        (target → 점수 배열, total_score로 대신한 target 목록)
+    """
+    total = pd.to_numeric(df[TOTAL_COLUMN], errors="coerce").to_numpy(dtype=float)
+
+    targets = {}
+    derived = []
+    for target, column in TARGET_COLUMNS.items():
+        values = pd.to_numeric(df[column], errors="coerce") if column in df.columns else None
+        if values is not None and values.notna().mean() >= MIN_NUMERIC_RATIO:
+            targets[target] = values.to_numpy(dtype=float)
+        else:
+            # 교사 텍스트 피드백 컬럼 → total_score로 학습
+            targets[target] = total
+            derived.append(target)
+    return targets, derived
+
+
+def fit_ridge(X: np.ndarray, y: np.ndarray, alpha: float) -> Tuple[np.ndarray, float]:
+    """표준화된 X에 대한 ridge 회귀 (절편은 규제하지 않음)"""
+    y_mean = y.mean()
+    A = X.T @ X + alpha * np.eye(X.shape[1])
+    w = np.linalg.solve(A, X.T @ (y - y_mean))
+    return w, float(y_mean)
+
+
+def fit_bootstrap_ensemble(
+    X: np.ndarray,
+    y: np.ndarray,
+    alpha: float,
+    n_models: int,
+    rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Returns:
+        (weights (n_models, n_features), biases (n_models,), out-of-bag RMSE)
+    """
+    n = len(y)
+    weights = np.zeros((n_models, X.shape[1]))
+    biases = np.zeros(n_models)
+    oob_sum = np.zeros(n)
+    oob_count = np.zeros(n)
+
+    for m in range(n_models):
+        idx = rng.integers(0, n, size=n)
+        weights[m], biases[m] = fit_ridge(X[idx], y[idx], alpha)
+
+        oob = np.setdiff1d(np.arange(n), idx)
+        oob_sum[oob] += X[oob] @ weights[m] + biases[m]
+        oob_count[oob] += 1
+
+    seen = oob_count > 0
+    oob_pred = np.clip(oob_sum[seen] / oob_count[seen], 0.0, 4.0)
+    oob_rmse = float(np.sqrt(np.mean((oob_pred - y[seen]) ** 2))) if seen.any() else float("nan")
+    return weights, biases, oob_rmse
+
+
+def collect_features(
+    df: pd.DataFrame,
+    audio_dir: str,
+    use_clova: bool,
+    clova_cache_path: Optional[Path]
+) -> Tuple[List[Dict[str, float]], List[int]]:
+    """
+    WAV 파일별 특징 계산 (CSV '파일 이름'과 매칭 - filename_index.py)
+
+    Returns:
+        (특징 딕셔너리 목록, 매칭된 CSV 행 인덱스 목록)
+    """
+    clova_cache = {}
+    if clova_cache_path and clova_cache_path.exists():
+        clova_cache = json.loads(clova_cache_path.read_text(encoding="utf-8"))
+
+    audio_files = sorted(Path(audio_dir).glob("*.wav"))
+    print(f"🎵 WAV 파일: {len(audio_files)}개")
+
+    index = FilenameIndex.from_dataframe(df)
+    report = MatchReport()
+
+    rows = []
+    features_list = []
+    for i, audio_file in enumerate(audio_files):
+        print(f"[{i+1}/{len(audio_files)}] {audio_file.name}")
+
+        match = index.match(audio_file.stem)
+        report.record(audio_file.name, match, index)
+        if match.row is None:
+            print(f"   ⚠️  CSV 매칭 {'후보 여러 개' if match.status == 'ambiguous' else '실패'}: {audio_file.stem}")
+            continue
+        idx = match.row
+
+        try:
+            wav_bytes = load_wav_bytes(audio_file)
+
+            if use_clova:
+                recognized = clova_cache.get(audio_file.name)
+                if recognized is None:
+                    recognized = transcribe_with_clova(wav_bytes)
+                    if recognized is None:
+                        print("   ⚠️  CLOVA 인식 실패, 건너뜀")
+                        continue
+                    clova_cache[audio_file.name] = recognized
+                features = quick_score_features(
+                    wav_bytes,
+                    recognized["text"],
+                    stt_confidence=recognized["stt_confidence"],
+                    pron_overall=recognized["pron_overall"],
+                    pron_fluency=recognized["pron_fluency"]
+                )
+            else:
+                text = df.at[idx, '텍스트'] if pd.notna(df.at[idx, '텍스트']) else ""
+                features = quick_score_features(wav_bytes, str(text))
+
+        except Exception as e:
+            print(f"   ❌ 오류: {e}")
+            continue
+
+        rows.append(idx)
+        features_list.append(features)
+
+    if use_clova and clova_cache_path:
+        clova_cache_path.write_text(json.dumps(clova_cache, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    report.print_report()
+    return features_list, rows
+
+
+def train_quick_score_model(
+    csv_path: str,
+    audio_dir: str,
+    output_path: str,
+    use_clova: bool = False,
+    clova_cache: Optional[str] = None,
+    n_models: int = 30,
+    alpha: float = 1.0,
+    seed: int = 42
+):
+    """
+    빠른 채점 모델 학습 후 JSON으로 저장
+
+    Args:
+        csv_path: 교사 평가 CSV (toefl_evaluations 형식)
+        audio_dir: WAV 파일 디렉토리
+        output_path: 출력 모델 JSON (backend/models/quick_score.json)
+        use_clova: CLOVA 인식 텍스트/발음 점수를 특징에 포함 (서버와 같은 조건)
+        clova_cache: CLOVA 결과 캐시 JSON (재실행 시 API 재호출 방지)
+        n_models: 부트스트랩 앙상블 크기
+        alpha: ridge 규제 강도
+        seed: 난수 시드
+    """
+
+    print("=" * 60)
+    print("⚡ 빠른 채점 모델 학습")
+    print("=" * 60)
+    print()
+
+    df = pd.read_csv(csv_path)
+    print(f"📊 CSV 로드: {len(df)}개 행")
+
+    features_list, rows = collect_features(
+        df, audio_dir, use_clova, Path(clova_cache) if clova_cache else None
+    )
+
+    targets, derived = numeric_targets(df.loc[rows]) if rows else ({}, [])
+    total = pd.to_numeric(df.loc[rows, TOTAL_COLUMN], errors="coerce").to_numpy(dtype=float)
+    valid = ~np.isnan(total)
+    for target in TARGET_COLUMNS:
+        if target in targets:
+            valid &= ~np.isnan(targets[target])
+
+    if valid.sum() < 10:
+        print(f"❌ 학습 데이터가 부족합니다: {int(valid.sum())}개 (최소 10개)")
+        exit(1)
+
+    # 특징 행렬 (CLOVA를 쓰지 않으면 발음 특징 없음)
+    feature_names = [name for name in features_list[0] if all(name in f for f in features_list)]
+    if not use_clova:
+        feature_names = [name for name in feature_names if name not in PRONUNCIATION_FEATURES]
+
+    X = np.array([[f[name] for name in feature_names] for f in features_list])[valid]
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    X_std = (X - mean) / scale
+
+    print()
+    print(f"✅ 학습 샘플: {len(X_std)}개, 특징: {len(feature_names)}개")
+    if derived:
+        print(f"ℹ️  숫자 점수 컬럼이 없어 total_score로 학습: {', '.join(derived)}")
+    print()
+
+    rng = np.random.default_rng(seed)
+    model_targets = {}
+    metrics = {}
+    spreads = []
+    for target in TARGET_COLUMNS:
+        y = targets[target][valid]
+        weights, biases, oob_rmse = fit_bootstrap_ensemble(X_std, y, alpha, n_models, rng)
+        model_targets[target] = {"weights": weights.tolist(), "bias": biases.tolist()}
+        metrics[target] = {"oob_rmse": round(oob_rmse, 4)}
+        spreads.append((X_std @ weights.T + biases).std(axis=1))
+        print(f"  {target:14s} OOB RMSE: {oob_rmse:.3f}")
+
+    # 학습 데이터에서의 불확실성 분포 → QUICK_SCORE_MAX_UNCERTAINTY 설정 참고
+    uncertainty = np.max(np.stack(spreads), axis=0)
+    percentiles = {f"p{p}": round(float(np.percentile(uncertainty, p)), 4) for p in (50, 80, 95)}
+    print()
+    print(f"📈 학습 데이터 불확실성: {percentiles}")
+
+    model = {
+        "version": datetime.now().strftime("%Y%m%d%H%M%S"),
+        "feature_names": feature_names,
+        "mean": mean.tolist(),
+        "scale": scale.tolist(),
+        "targets": model_targets,
+        "derived_targets": derived,
+        "training": {
+            "samples": int(len(X_std)),
+            "alpha": alpha,
+            "n_models": n_models,
+            "use_clova": use_clova,
+            "metrics": metrics,
+            "uncertainty": percentiles,
+        },
+    }
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(model, f, ensure_ascii=False)
+
+    print()
+    print("=" * 60)
+    print("✅ 완료!")
+    print("=" * 60)
+    print(f"💾 저장: {output_path}")
+
+    return output_path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='빠른 채점 모델 학습')
+    parser.add_argument('--csv', type=str, required=True,
+                        help='교사 평가 CSV (toefl_evaluations 형식)')
+    parser.add_argument('--audio_dir', type=str, required=True,
+                        help='WAV 파일 디렉토리')
+    parser.add_argument('--output', type=str, default=str(BACKEND_DIR / "models" / "quick_score.json"),
+                        help='출력 모델 JSON')
+    parser.add_argument('--clova', action='store_true',
+                        help='CLOVA 인식 텍스트/발음 점수를 특징에 포함 (backend/.env 필요)')
+    parser.add_argument('--clova_cache', type=str, default='clova_results.json',
+                        help='CLOVA 결과 캐시 JSON')
+    parser.add_argument('--bootstrap', type=int, default=30,
+                        help='앙상블 크기')
+    parser.add_argument('--alpha', type=float, default=1.0,
+                        help='ridge 규제 강도')
+
+    args = parser.parse_args()
+
+    if not Path(args.audio_dir).exists():
+        print(f"❌ 디렉토리를 찾을 수 없습니다: {args.audio_dir}")
+        exit(1)
+
+    if not Path(args.csv).exists():
+        print(f"❌ CSV 파일을 찾을 수 없습니다: {args.csv}")
+        exit(1)
+
+    train_quick_score_model(
+        csv_path=args.csv,
+        audio_dir=args.audio_dir,
+        output_path=args.output,
+        use_clova=args.clova,
+        clova_cache=args.clova_cache,
+        n_models=args.bootstrap,
+        alpha=args.alpha
+    )
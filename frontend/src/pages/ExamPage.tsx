@@ -7,6 +7,17 @@ import { API_BASE_URL } from '../config';
 
 type ExamPhase = 'loading' | 'instructions' | 'reading' | 'listening' | 'preparation' | 'recording' | 'completed';
 
+// Pick the smallest audio variant this browser can play (original file as fallback)
+const getAudioUrl = (question: Question): string => {
+  const sources = question.audioSources;
+  if (!sources || sources.length === 0) {
+    return `${API_BASE_URL}${question.audioFile}`;
+  }
+  const probe = document.createElement('audio');
+  const playable = sources.find(source => probe.canPlayType(source.type) !== '');
+  return `${API_BASE_URL}${(playable ?? sources[sources.length - 1]).src}`;
+};
+
 export default function ExamPage() {
   const { questionId } = useParams<{ questionId: string }>();
   const navigate = useNavigate();
@@ -291,7 +302,7 @@ export default function ExamPage() {
                   ref={audioRef}
                   controls
                   style={{ width: '100%', marginTop: '16px' }}
-                  src={`${API_BASE_URL}${question.audioFile}`}
+                  src={getAudioUrl(question)}
                   onEnded={handleAudioEnded}
                   onError={handleAudioError}
                   crossOrigin="anonymous"
@@ -299,7 +310,7 @@ export default function ExamPage() {
                   Your browser does not support the audio element.
                 </audio>
                 <p style={{ fontSize: '12px', color: theme.text.secondary, marginTop: '8px', fontFamily: 'monospace' }}>
-                  Audio URL: {API_BASE_URL}{question.audioFile}
+                  Audio URL: {getAudioUrl(question)}
                 </p>
                 <p style={{ color: theme.text.secondary, marginTop: '16px', fontSize: '13px', fontStyle: 'italic' }}>
                   Audio will play automatically. Preparation will start when audio ends.
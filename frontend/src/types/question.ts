@@ -18,6 +18,15 @@ export interface Question {
   conversation?: string;
   lecture?: string;
   audioFile?: string;
+  // Playable variants of audioFile, smallest first (original last)
+  audioSources?: AudioSource[];
+}
+
+export interface AudioSource {
+  src: string;
+  type: string;
+  size: number;
+  bitrate?: number;
 }
 
 export interface ExamSession {
@@ -7,28 +7,74 @@ import numpy as np
 import librosa
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import json
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+# 공유 분석 컨텍스트 (디코딩 / STFT 한 번), 일괄 처리 도구
+sys.path.append(str(Path(__file__).resolve().parent.parent / "dataset_preparation"))
+from audio_analysis import AudioAnalysis, PITCH_METHODS  # noqa: E402
+from batch_processing import ProgressReporter, default_workers, iter_parallel, read_jsonl_records  # noqa: E402
+from feature_cache import DEFAULT_MAX_SIZE_MB, FeatureCache, file_sha256  # noqa: E402
+from filename_index import FilenameIndex, MatchReport  # noqa: E402
+from feature_store import FeatureStore, build_feature_store  # noqa: E402
+
+
+AudioInput = Union[str, AudioAnalysis]
+
 
 class AudioFeatureExtractor:
     """음성 파일에서 TOEFL 평가에 필요한 특징 추출"""
 
-    def __init__(self, sample_rate: int = 16000):
+    # 추출 결과가 달라지는 변경을 하면 올려서 캐시된 특징을 무효화
+    VERSION = "1"
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        pitch_method: str = "piptrack",
+        n_mfcc: int = 13,
+        cache: Optional[FeatureCache] = None
+    ):
+        """
+        Args:
+            sample_rate: 샘플링 레이트
+            pitch_method: pitch 추정 방법 ("piptrack" 또는 "yin", audio_analysis.PITCH_METHODS)
+            n_mfcc: extract_all_features의 MFCC 계수 개수
+            cache: 파일별 특징 캐시 (extract_all_features를 파일 경로로 호출할 때 사용)
+        """
         self.sample_rate = sample_rate
+        self.pitch_method = pitch_method
+        self.n_mfcc = n_mfcc
+        self.cache = cache
 
-    def extract_mfcc_features(self, audio_path: str, n_mfcc: int = 13) -> Dict:
+    @property
+    def settings(self) -> Dict:
+        """추출 결과를 결정하는 설정 (결과 기록에 함께 저장, 재개 시 같은 설정인지 확인)"""
+        return {
+            'sample_rate': self.sample_rate,
+            'pitch_method': self.pitch_method,
+            'n_mfcc': self.n_mfcc,
+            'version': self.VERSION,
+        }
+
+    def analyze(self, audio: AudioInput) -> AudioAnalysis:
+        """파일 경로면 디코딩해서 분석 컨텍스트 생성, 이미 컨텍스트면 그대로 사용"""
+        if isinstance(audio, AudioAnalysis):
+            return audio
+        return AudioAnalysis.from_file(audio, self.sample_rate)
+
+    def extract_mfcc_features(self, audio: AudioInput, n_mfcc: int = 13) -> Dict:
         """
         MFCC (Mel-frequency cepstral coefficients) 추출
         발음 특징 분석에 사용
         """
-        # 오디오 로드
-        y, sr = librosa.load(audio_path, sr=self.sample_rate)
+        analysis = self.analyze(audio)
 
         # MFCC 추출
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
+        mfcc = librosa.feature.mfcc(S=analysis.log_mel, n_mfcc=n_mfcc)
         mfcc_delta = librosa.feature.delta(mfcc)
         mfcc_delta2 = librosa.feature.delta(mfcc, order=2)
 
@@ -39,66 +85,61 @@ class AudioFeatureExtractor:
             'mfcc_delta2_mean': np.mean(mfcc_delta2, axis=1).tolist(),
         }
 
-    def extract_prosody_features(self, audio_path: str) -> Dict:
+    def extract_prosody_features(self, audio: AudioInput) -> Dict:
         """
         운율(Prosody) 특징 추출
         유창성, 억양, 리듬 분석에 사용
         """
-        y, sr = librosa.load(audio_path, sr=self.sample_rate)
+        analysis = self.analyze(audio)
+        y, sr = analysis.y, analysis.sr
 
         # Pitch (F0) 추출
-        pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-        pitch_values = []
-        for t in range(pitches.shape[1]):
-            index = magnitudes[:, t].argmax()
-            pitch = pitches[index, t]
-            if pitch > 0:
-                pitch_values.append(pitch)
+        pitch_values = analysis.pitch_values(self.pitch_method)
 
         # Energy (음량)
-        energy = librosa.feature.rms(y=y)[0]
+        energy = analysis.rms
 
         # Zero Crossing Rate (음성/무음 구분)
         zcr = librosa.feature.zero_crossing_rate(y)[0]
 
         # Spectral features (음질)
-        spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-        spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
+        spectral_centroid = librosa.feature.spectral_centroid(S=analysis.magnitude, sr=sr)[0]
+        spectral_rolloff = librosa.feature.spectral_rolloff(S=analysis.magnitude, sr=sr)[0]
 
         # 말하기 속도 (음절 수 추정)
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+        onset_env = librosa.onset.onset_strength(S=analysis.log_mel, sr=sr)
         tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr)[0]
 
         return {
-            'pitch_mean': np.mean(pitch_values) if pitch_values else 0,
-            'pitch_std': np.std(pitch_values) if pitch_values else 0,
-            'pitch_range': np.ptp(pitch_values) if pitch_values else 0,
+            'pitch_mean': float(np.mean(pitch_values)) if len(pitch_values) else 0,
+            'pitch_std': float(np.std(pitch_values)) if len(pitch_values) else 0,
+            'pitch_range': float(np.ptp(pitch_values)) if len(pitch_values) else 0,
             'energy_mean': float(np.mean(energy)),
             'energy_std': float(np.std(energy)),
             'zcr_mean': float(np.mean(zcr)),
             'spectral_centroid_mean': float(np.mean(spectral_centroid)),
             'spectral_rolloff_mean': float(np.mean(spectral_rolloff)),
             'tempo': float(tempo),
-            'duration': float(librosa.get_duration(y=y, sr=sr))
+            'duration': analysis.duration
         }
 
-    def extract_pronunciation_features(self, audio_path: str) -> Dict:
+    def extract_pronunciation_features(self, audio: AudioInput) -> Dict:
         """
         발음 관련 특징 추출
         자음/모음 명확성, 음소 정확도
         """
-        y, sr = librosa.load(audio_path, sr=self.sample_rate)
+        analysis = self.analyze(audio)
+        sr = analysis.sr
 
         # Formants (모음 분석)
         # F1, F2로 모음 구분 가능
-        S = np.abs(librosa.stft(y))
-        freqs = librosa.fft_frequencies(sr=sr)
+        S = analysis.magnitude
 
         # Spectral contrast (자음 명확성)
-        contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
+        contrast = librosa.feature.spectral_contrast(S=S, sr=sr)
 
         # Chroma features (음높이 정확도)
-        chroma = librosa.feature.chroma_stft(y=y, sr=sr)
+        chroma = librosa.feature.chroma_stft(S=analysis.power, sr=sr)
 
         return {
             'spectral_contrast_mean': np.mean(contrast, axis=1).tolist(),
@@ -106,15 +147,16 @@ class AudioFeatureExtractor:
             'spectral_flux': float(np.mean(np.diff(S, axis=1)))
         }
 
-    def extract_fluency_features(self, audio_path: str) -> Dict:
+    def extract_fluency_features(self, audio: AudioInput) -> Dict:
         """
         유창성 관련 특징 추출
         휴지(pause), 말더듬, 속도 변화
         """
-        y, sr = librosa.load(audio_path, sr=self.sample_rate)
+        analysis = self.analyze(audio)
+        y, sr = analysis.y, analysis.sr
 
         # 무음 구간 탐지 (휴지)
-        intervals = librosa.effects.split(y, top_db=30)
+        intervals = analysis.nonsilent_intervals(top_db=30)
 
         # 휴지 시간 계산
         pauses = []
@@ -137,118 +179,204 @@ class AudioFeatureExtractor:
             'articulation_rate': len(intervals) / (np.sum(speech_durations) if speech_durations else 1)
         }
 
-    def extract_all_features(self, audio_path: str) -> Dict:
-        """모든 음성 특징 한번에 추출"""
+    def extract_all_features(self, audio: AudioInput) -> Dict:
+        """모든 음성 특징 한번에 추출 (디코딩 / STFT는 한 번만, 캐시가 있으면 파일별로 재사용)"""
+        if self.cache is not None and not isinstance(audio, AudioAnalysis):
+            return self.cache.get_or_compute(
+                audio, "AudioFeatureExtractor.extract_all_features", self.VERSION,
+                {'sample_rate': self.sample_rate, 'pitch_method': self.pitch_method, 'n_mfcc': self.n_mfcc},
+                lambda: self._extract_all_features(self.analyze(audio))
+            )
+        return self._extract_all_features(self.analyze(audio))
+
+    def _extract_all_features(self, analysis: AudioAnalysis) -> Dict:
         features = {}
 
-        features.update(self.extract_mfcc_features(audio_path))
-        features.update(self.extract_prosody_features(audio_path))
-        features.update(self.extract_pronunciation_features(audio_path))
-        features.update(self.extract_fluency_features(audio_path))
+        features.update(self.extract_mfcc_features(analysis, self.n_mfcc))
+        features.update(self.extract_prosody_features(analysis))
+        features.update(self.extract_pronunciation_features(analysis))
+        features.update(self.extract_fluency_features(analysis))
 
         return features
 
 
+def _record_settings(record: Dict) -> Dict:
+    """결과 기록의 추출 설정 (설정을 기록하기 전 결과는 당시 기본값)"""
+    return record.get('extractor_settings', {
+        'sample_rate': 16000,
+        'pitch_method': 'piptrack',
+        'n_mfcc': 13,
+        'version': AudioFeatureExtractor.VERSION,
+    })
+
+
 def process_audio_dataset(
     audio_dir: str,
     csv_path: str,
-    output_path: str = "audio_features.jsonl"
+    output_path: str = "audio_features.jsonl",
+    pitch_method: str = "piptrack",
+    workers: int = 1,
+    chunksize: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    cache_max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+    resume: bool = True,
+    store_dir: Optional[str] = None
 ):
     """
     전체 데이터셋의 음성 특징 추출
 
+    결과는 파일별로 끝나는 대로 output_path에 이어 쓰고,
+    다시 실행하면 output_path에 같은 내용(sha256) / 같은 추출 설정(pitch 방법, n_mfcc, 버전)으로
+    기록된 파일은 건너뜀 (중단되어도 처리한 만큼은 유지, 설정이 다르거나 음성이 바뀐 기록은 지우고 다시 추출)
+
+    resume=False면 output_path를 새로 쓰고 모든 파일을 다시 처리 - cache_dir와 함께 쓰면
+    내용이 그대로인 파일은 캐시에서 읽으므로 새 파일 / 바뀐 파일만 추출 (증분 재생성)
+
     Args:
         audio_dir: WAV 파일들이 있는 디렉토리
         csv_path: 피드백 CSV 파일
         output_path: 출력 JSONL 파일
+        pitch_method: pitch 추정 방법 ("piptrack" 또는 "yin")
+        workers: 특징 추출 프로세스 수 (1이면 순차 처리)
+        chunksize: 워커에 한 번에 넘길 파일 수 (None이면 자동)
+        cache_dir: 파일별 특징 캐시 디렉토리 (None이면 캐시 사용 안 함)
+        cache_max_size_mb: 캐시 최대 크기 (넘으면 오래 쓰지 않은 항목부터 삭제)
+        resume: 이전 실행 결과를 이어서 처리
+        store_dir: 끝난 뒤 JSONL을 변환할 컬럼형 특징 저장소 (feature_store.py, None이면 만들지 않음)
     """
 
-    extractor = AudioFeatureExtractor()
+    cache = FeatureCache(cache_dir, cache_max_size_mb) if cache_dir else None
+    extractor = AudioFeatureExtractor(pitch_method=pitch_method, cache=cache)
 
     # CSV 로드
     df = pd.read_csv(csv_path)
 
-    results = []
-
     print(f"📂 음성 파일 처리 중: {audio_dir}")
     print(f"📊 CSV 파일: {csv_path}")
     print()
 
-    # 각 WAV 파일 처리
-    audio_files = list(Path(audio_dir).glob("*.wav"))
-
-    for i, audio_file in enumerate(audio_files):
-        print(f"[{i+1}/{len(audio_files)}] 처리 중: {audio_file.name}")
-
-        try:
-            # 음성 특징 추출
-            features = extractor.extract_all_features(str(audio_file))
-
-            # 파일명으로 CSV에서 매칭 (파일명 규칙에 따라 수정 필요)
-            file_id = audio_file.stem  # 확장자 제외한 파일명
-
-            # CSV에서 해당 행 찾기
-            matching_row = df[df['파일 이름'].str.contains(file_id, na=False)]
-
-            if not matching_row.empty:
-                row = matching_row.iloc[0]
-
-                result = {
-                    'audio_file': audio_file.name,
-                    'file_id': file_id,
-                    'audio_features': features,
-                    'ground_truth': {
-                        'transcript': row.get('텍스트', ''),
-                        'pronunciation_score': row.get('발음', ''),
-                        'fluency_score': row.get('fluency', ''),
-                        'content_score': row.get('내용', ''),
-                        'grammar_score': row.get('문법/표현', ''),
-                        'total_score': row.get('total_score', 0),
-                        'feedback': row.get('텍스트 피드백', '')
-                    }
-                }
-
-                results.append(result)
-            else:
-                print(f"  ⚠️  CSV에서 매칭되는 행을 찾을 수 없음: {file_id}")
+    audio_files = sorted(Path(audio_dir).glob("*.wav"))
+    hashes = {audio_file.name: file_sha256(str(audio_file)) for audio_file in audio_files}
 
-        except Exception as e:
-            print(f"  ❌ 오류: {e}")
+    # 이전 실행 결과 (재개) - 지금 파일 내용과 같은 음성을 같은 설정으로 추출한 기록만 사용
+    results = []
+    if resume:
+        records = read_jsonl_records(Path(output_path))
+        results = [
+            record for record in records
+            if _record_settings(record) == extractor.settings
+            and record.get('audio_sha256') == hashes.get(record['audio_file'])
+        ]
+        if len(results) < len(records):
+            print(f"♻️  추출 설정이 다르거나 음성이 바뀐 기록 {len(records) - len(results)}개는 다시 추출 ({output_path})")
+            with open(output_path, 'w', encoding='utf-8') as f:
+                for result in results:
+                    f.write(json.dumps(result, ensure_ascii=False) + '\n')
+    done = {result['audio_file'] for result in results}
+
+    # 각 WAV 파일을 CSV 행과 먼저 매칭 (매칭되지 않는 파일은 추출하지 않음)
+    index = FilenameIndex.from_dataframe(df)
+    report = MatchReport()
+    rows = {}
+
+    for audio_file in audio_files:
+        if audio_file.name in done:
             continue
 
-    # JSONL로 저장
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for result in results:
+        # 파일명(확장자 제외)으로 CSV에서 해당 행 찾기 - 규칙은 filename_index.py 참고
+        match = index.match(audio_file.stem)
+        report.record(audio_file.name, match, index)
+
+        if match.row is not None:
+            rows[str(audio_file)] = df.loc[match.row]
+
+    report.print_report()
+
+    if done:
+        print(f"♻️  이전 실행에서 처리한 파일 {len(done)}개 건너뜀 ({output_path})")
+    print(f"⚙️  워커 {workers}개로 {len(rows)}개 파일 처리")
+
+    # 음성 특징 추출 (끝나는 순서대로 JSONL에 추가)
+    progress = ProgressReporter(total=len(rows), skipped=len(done))
+
+    with open(output_path, 'a' if resume else 'w', encoding='utf-8') as f:
+        for audio_path, features, error in iter_parallel(
+            extractor.extract_all_features, list(rows), workers, chunksize
+        ):
+            audio_file = Path(audio_path)
+            print(progress.update(audio_file.name, error))
+
+            if error is not None:
+                print(f"  ❌ 오류: {error}")
+                continue
+
+            row = rows[audio_path]
+            result = {
+                'audio_file': audio_file.name,
+                'file_id': audio_file.stem,
+                'audio_sha256': hashes[audio_file.name],
+                'extractor_settings': extractor.settings,
+                'audio_features': features,
+                'ground_truth': {
+                    'transcript': row.get('텍스트', ''),
+                    'pronunciation_score': row.get('발음', ''),
+                    'fluency_score': row.get('fluency', ''),
+                    'content_score': row.get('내용', ''),
+                    'grammar_score': row.get('문법/표현', ''),
+                    'total_score': row.get('total_score', 0),
+                    'feedback': row.get('텍스트 피드백', '')
+                }
+            }
+
+            results.append(result)
             f.write(json.dumps(result, ensure_ascii=False) + '\n')
+            f.flush()
 
     print(f"\n✅ 완료! {len(results)}개 파일 처리")
+    print(f"⏱️  {progress.summary()}")
+    if cache is not None:
+        evicted = cache.evict()
+        if evicted:
+            print(f"🧹 특징 캐시 {evicted}개 항목 삭제 (최대 {cache_max_size_mb:g}MB)")
     print(f"💾 저장 위치: {output_path}")
 
+    if store_dir:
+        store = build_feature_store(output_path, store_dir)
+        print(f"🗄️  특징 저장소: {store_dir} ({len(store)}행 x {len(store.feature_columns)}개 특징)")
+
     return results
 
 
-def create_feature_summary(jsonl_path: str):
-    """추출된 특징 요약 통계"""
+def create_feature_summary(path: str):
+    """추출된 특징 요약 통계 (특징 저장소 디렉토리 또는 JSONL)"""
 
-    with open(jsonl_path, 'r', encoding='utf-8') as f:
-        data = [json.loads(line) for line in f]
+    if FeatureStore.is_store(path):
+        # 필요한 컬럼만 memmap에서 읽음
+        store = FeatureStore(path)
+        n_samples = len(store)
+        scores = store.label('total_score')
+        durations = store.feature('duration')
+        tempos = store.feature('tempo')
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = [json.loads(line) for line in f]
+        n_samples = len(data)
+        scores = [d['ground_truth']['total_score'] for d in data]
+        durations = [d['audio_features']['duration'] for d in data]
+        tempos = [d['audio_features']['tempo'] for d in data]
 
     print(f"\n📊 데이터셋 요약")
-    print(f"총 샘플 수: {len(data)}")
+    print(f"총 샘플 수: {n_samples}")
     print()
 
     # 점수 분포
-    scores = [d['ground_truth']['total_score'] for d in data]
     print(f"점수 분포:")
-    print(f"  평균: {np.mean(scores):.2f}")
-    print(f"  표준편차: {np.std(scores):.2f}")
-    print(f"  범위: {np.min(scores):.1f} - {np.max(scores):.1f}")
+    print(f"  평균: {np.nanmean(scores):.2f}")
+    print(f"  표준편차: {np.nanstd(scores):.2f}")
+    print(f"  범위: {np.nanmin(scores):.1f} - {np.nanmax(scores):.1f}")
     print()
 
     # 음성 특징 요약
-    durations = [d['audio_features']['duration'] for d in data]
-    tempos = [d['audio_features']['tempo'] for d in data]
-
     print(f"음성 특징:")
     print(f"  평균 길이: {np.mean(durations):.1f}초")
     print(f"  평균 템포: {np.mean(tempos):.1f} BPM")
@@ -265,18 +393,37 @@ if __name__ == "__main__":
                         help='피드백 CSV 파일')
     parser.add_argument('--output', type=str, default='audio_features.jsonl',
                         help='출력 JSONL 파일')
+    parser.add_argument('--pitch_method', type=str, choices=PITCH_METHODS, default='piptrack',
+                        help='pitch 추정 방법 (yin: 더 빠르고 말소리 대역에서 안정적)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f'특징 추출 프로세스 수 (이 머신의 코어 수: {default_workers()})')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='워커에 한 번에 넘길 파일 수 (기본: 자동)')
+    parser.add_argument('--cache_dir', type=str, default=None,
+                        help='파일별 특징 캐시 디렉토리 (같은 음성 + 같은 설정이면 다시 추출하지 않음)')
+    parser.add_argument('--cache_max_mb', type=float, default=DEFAULT_MAX_SIZE_MB,
+                        help=f'특징 캐시 최대 크기 MB (기본: {DEFAULT_MAX_SIZE_MB})')
+    parser.add_argument('--store_dir', type=str, default=None,
+                        help='컬럼형 특징 저장소 디렉토리 (기본: 출력 JSONL 이름에서 확장자를 뺀 디렉토리)')
 
     args = parser.parse_args()
+    store_dir = args.store_dir or str(Path(args.output).with_suffix(''))
 
     # 예시 실행
     if Path(args.audio_dir).exists() and Path(args.csv).exists():
         results = process_audio_dataset(
             args.audio_dir,
             args.csv,
-            args.output
+            args.output,
+            args.pitch_method,
+            args.workers,
+            args.chunksize,
+            args.cache_dir,
+            args.cache_max_mb,
+            store_dir=store_dir
         )
 
-        create_feature_summary(args.output)
+        create_feature_summary(store_dir)
     else:
         print("❌ 파일 경로를 확인하세요.")
         print(f"예시: python audio_feature_extraction.py --audio_dir ./audio --csv feedback.csv")
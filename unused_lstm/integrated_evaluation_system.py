@@ -12,6 +12,10 @@ from typing import Dict, Optional
 from audio_feature_extraction import AudioFeatureExtractor
 from train_audio_model import predict_audio_scores
 
+# audio_feature_extraction이 dataset_preparation을 import path에 추가함
+from filename_index import FilenameIndex, MatchReport
+from feature_store import flatten_features
+
 # LLM (MLX or OpenAI)
 try:
     from mlx_lm import load, generate
@@ -95,15 +99,9 @@ class IntegratedTOEFLEvaluator:
         # 음성 특징 추출
         audio_features = self.audio_extractor.extract_all_features(audio_path)
 
-        # 특징 벡터 생성
-        feature_vector = []
-        for key, value in audio_features.items():
-            if isinstance(value, list):
-                feature_vector.extend(value)
-            elif isinstance(value, (int, float)):
-                feature_vector.append(value)
-
-        feature_array = np.array(feature_vector)
+        # 특징 벡터 생성 (학습용 특징 저장소와 같은 컬럼 순서)
+        _, feature_vector = flatten_features(audio_features)
+        feature_array = np.array(feature_vector, dtype=np.float32)
 
         # 음성 모델로 점수 예측
         scores = predict_audio_scores(
@@ -268,6 +266,8 @@ class IntegratedTOEFLEvaluator:
 
         df = pd.read_csv(csv_path)
         audio_files = list(Path(audio_dir).glob("*.wav"))
+        index = FilenameIndex.from_dataframe(df)
+        report = MatchReport()
 
         results = []
 
@@ -275,11 +275,11 @@ class IntegratedTOEFLEvaluator:
             print(f"\n[{i+1}/{len(audio_files)}] 평가 중...")
 
             # CSV에서 대본 찾기
-            file_id = audio_file.stem
-            matching_row = df[df['파일 이름'].str.contains(file_id, na=False)]
+            match = index.match(audio_file.stem)
+            report.record(audio_file.name, match, index)
 
-            if not matching_row.empty:
-                transcript = matching_row.iloc[0].get('텍스트', '')
+            if match.row is not None:
+                transcript = df.loc[match.row].get('텍스트', '')
 
                 try:
                     result = self.evaluate_complete(
@@ -291,6 +291,9 @@ class IntegratedTOEFLEvaluator:
                     print(f"❌ 오류: {e}")
                     continue
 
+        print()
+        report.print_report()
+
         # 저장
         with open(output_path, 'w', encoding='utf-8') as f:
             for result in results:
@@ -11,9 +11,14 @@ from torch.utils.data import Dataset, DataLoader
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import pickle
+import sys
 from pathlib import Path
 from typing import Dict, Tuple
 
+# 컬럼형 특징 저장소 (dataset_preparation/feature_store.py)
+sys.path.append(str(Path(__file__).resolve().parent.parent / "dataset_preparation"))
+from feature_store import FeatureStore  # noqa: E402
+
 
 class AudioFeaturesDataset(Dataset):
     """음성 특징 데이터셋"""
@@ -131,6 +136,36 @@ def prepare_dataset_from_jsonl(jsonl_path: str) -> Tuple:
     return features, labels
 
 
+def prepare_dataset_from_store(store_dir: str) -> Tuple:
+    """
+    컬럼형 특징 저장소에서 데이터 로드 (JSON 파싱 없이 memmap 그대로)
+
+    Returns:
+        features: (샘플 수, 특징 수) float32 배열
+        labels: (샘플 수, 2) [pronunciation_score, fluency_score] 배열 (없으면 total_score)
+        feature_columns: 특징 컬럼 이름 (순서 = features 열 순서)
+    """
+
+    store = FeatureStore(store_dir)
+
+    # 레이블: 발음, 유창성 점수 - 숫자 점수가 없는 행은 total_score로 대체
+    total_score = store.label('total_score')
+    pronunciation = np.where(np.isnan(store.label('pronunciation_score')), total_score, store.label('pronunciation_score'))
+    fluency = np.where(np.isnan(store.label('fluency_score')), total_score, store.label('fluency_score'))
+    labels = np.stack([pronunciation, fluency], axis=1)
+
+    # 점수가 없는 행 제외 (모두 유효하면 memmap을 복사 없이 사용)
+    valid = ~np.isnan(labels).any(axis=1)
+    features = store.features if valid.all() else store.features[valid]
+    labels = labels[valid]
+
+    print(f"✅ 데이터 로드 완료 (특징 저장소: {store_dir})")
+    print(f"   특징 차원: {features.shape}")
+    print(f"   레이블 차원: {labels.shape}")
+
+    return features, labels, store.feature_columns
+
+
 def train_audio_model(
     jsonl_path: str,
     output_dir: str = "./audio_model",
@@ -143,7 +178,7 @@ def train_audio_model(
     음성 평가 모델 학습
 
     Args:
-        jsonl_path: 음성 특징 JSONL 파일
+        jsonl_path: 음성 특징 저장소 디렉토리 (feature_store.py) 또는 JSONL 파일
         output_dir: 모델 저장 디렉토리
         epochs: 학습 에포크
         batch_size: 배치 크기
@@ -160,7 +195,11 @@ def train_audio_model(
     print()
 
     # 데이터 로드
-    features, labels = prepare_dataset_from_jsonl(jsonl_path)
+    feature_columns = None
+    if FeatureStore.is_store(jsonl_path):
+        features, labels, feature_columns = prepare_dataset_from_store(jsonl_path)
+    else:
+        features, labels = prepare_dataset_from_jsonl(jsonl_path)
 
     # Train/Test split
     X_train, X_test, y_train, y_test = train_test_split(
@@ -260,6 +299,8 @@ def train_audio_model(
         'num_layers': 2,
         'best_loss': best_loss
     }
+    if feature_columns is not None:
+        metadata['feature_columns'] = feature_columns
 
     with open(f"{output_dir}/metadata.json", 'w') as f:
         json.dump(metadata, f, indent=2)
@@ -324,7 +365,7 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description='음성 평가 모델 학습')
     parser.add_argument('--data', type=str, required=True,
-                        help='음성 특징 JSONL 파일')
+                        help='음성 특징 저장소 디렉토리 또는 JSONL 파일')
     parser.add_argument('--output', type=str, default='./audio_model',
                         help='모델 저장 디렉토리')
     parser.add_argument('--epochs', type=int, default=100,